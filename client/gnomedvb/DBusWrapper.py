@@ -16,9 +16,11 @@
 # You should have received a copy of the GNU General Public License
 # along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
 
+from gi.repository import GLib
 from gi.repository import GObject
 import re
 import sys
+import weakref
 from gi.repository import Gio
 
 __all__ = [
@@ -71,12 +73,96 @@ def get_dvb_devices():
 
     return deviceslist
 
-def _get_proxy(object_path, iface_name):
-    return Gio.DBusProxy.new_for_bus_sync(Gio.BusType.SESSION,
-        Gio.DBusProxyFlags.NONE, None,
-        SERVICE,
-        object_path,
-        iface_name, None)
+class _SharedProxy:
+    """
+    Holds a Gio.DBusProxy that is shared by all wrappers of the same
+    D-Bus object and dispatches the proxy's signals to them.
+
+    Wrappers are only referenced weakly, therefore a wrapper does not
+    keep itself alive by listening to signals.
+    """
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self._listeners = []
+        self._handler_id = 0
+
+    def subscribe(self, callback):
+        """
+        Forward g-signal of the proxy to the bound method C{callback}
+        """
+        if self._handler_id == 0:
+            self._handler_id = self.proxy.connect("g-signal",
+                _dispatch_g_signal, weakref.ref(self))
+        self._listeners.append(weakref.WeakMethod(callback))
+
+    def dispatch(self, proxy, sender_name, signal_name, params):
+        listeners = []
+        for ref in self._listeners:
+            callback = ref()
+            if callback != None:
+                listeners.append(ref)
+                callback(proxy, sender_name, signal_name, params)
+        self._listeners = listeners
+
+    def __del__(self):
+        if self._handler_id != 0:
+            self.proxy.disconnect(self._handler_id)
+
+def _dispatch_g_signal(proxy, sender_name, signal_name, params, shared_ref):
+    shared = shared_ref()
+    if shared != None:
+        shared.dispatch(proxy, sender_name, signal_name, params)
+
+# Maps (object path, interface) to _SharedProxy. Entries are evicted
+# as soon as the last wrapper using the proxy is gone.
+_shared_proxies = weakref.WeakValueDictionary()
+
+def _register_shared_proxy(proxy):
+    """
+    Add C{proxy} to the pool unless a proxy for the same object
+    has been registered in the meantime
+    """
+    key = (proxy.get_object_path(), proxy.get_interface_name())
+    shared = _shared_proxies.get(key)
+    if shared == None:
+        shared = _SharedProxy(proxy)
+        _shared_proxies[key] = shared
+    return shared
+
+def _get_shared_proxy(object_path, iface_name):
+    shared = _shared_proxies.get((object_path, iface_name))
+    if shared == None:
+        proxy = Gio.DBusProxy.new_for_bus_sync(Gio.BusType.SESSION,
+            Gio.DBusProxyFlags.NONE, None,
+            SERVICE,
+            object_path,
+            iface_name, None)
+        shared = _register_shared_proxy(proxy)
+    return shared
+
+class _SignalCoalescer:
+    """
+    Collects items and passes all of them at once to C{callback}
+    in the next main loop iteration
+    """
+
+    def __init__(self, callback):
+        self._callback = callback
+        self._items = []
+        self._source = None
+
+    def add(self, *items):
+        self._items.extend(items)
+        if self._source == None:
+            self._source = GLib.idle_add(self._flush)
+
+    def _flush(self):
+        items = self._items
+        self._items = []
+        self._source = None
+        self._callback(items)
+        return False
 
 class DVBManagerClient(GObject.GObject):
 
@@ -88,8 +174,9 @@ class DVBManagerClient(GObject.GObject):
     def __init__(self):
         GObject.GObject.__init__(self)
 
-        self.manager = _get_proxy(MANAGER_PATH, MANAGER_IFACE)
-        self.manager.connect("g-signal", self.on_g_signal)
+        self._shared = _get_shared_proxy(MANAGER_PATH, MANAGER_IFACE)
+        self._shared.subscribe(self.on_g_signal)
+        self.manager = self._shared.proxy
 
     def get_scanner_for_device(self, adapter, frontend, type):
         objpath, scanner_iface, success = self.manager.GetScannerForDevice ('(uui)', adapter, frontend, type)
@@ -144,6 +231,9 @@ class DVBManagerClient(GObject.GObject):
     def get_adapter_info(self, adapter, frontend, **kwargs):
         return self.manager.GetAdapterInfo('(uu)', adapter, frontend, **kwargs)
 
+    def get_all_adapter_infos(self, **kwargs):
+        return self.manager.GetAllAdapterInfos(**kwargs)
+
     def on_g_signal(self, proxy, sender_name, signal_name, params):
         params = params.unpack()
         if signal_name == "GroupAdded":
@@ -156,6 +246,8 @@ class DVBDeviceGroupClient(GObject.GObject):
     __gsignals__ = {
         "device-added":  (GObject.SIGNAL_RUN_LAST, GObject.TYPE_NONE, [int, int]),
         "device-removed":  (GObject.SIGNAL_RUN_LAST, GObject.TYPE_NONE, [int, int]),
+        # List of (adapter, frontend, added) tuples
+        "devices-changed":  (GObject.SIGNAL_RUN_LAST, GObject.TYPE_NONE, [GObject.TYPE_PYOBJECT]),
     }
 
     def __init__(self, objpath):
@@ -164,9 +256,12 @@ class DVBDeviceGroupClient(GObject.GObject):
         elements = objpath.split("/")
 
         self._id = int(elements[5])
+        self._devices_changed = _SignalCoalescer(
+            lambda changes: self.emit("devices-changed", changes))
 
-        self.devgroup = _get_proxy(objpath, DEVICE_GROUP_IFACE)
-        self.devgroup.connect("g-signal", self.on_g_signal)
+        self._shared = _get_shared_proxy(objpath, DEVICE_GROUP_IFACE)
+        self._shared.subscribe(self.on_g_signal)
+        self.devgroup = self._shared.proxy
 
     def get_id(self):
         return self._id
@@ -204,6 +299,9 @@ class DVBDeviceGroupClient(GObject.GObject):
         else:
             return None
 
+    def get_informations_bulk(self, channel_sids, **kwargs):
+        return self.devgroup.GetInformationsBulk('(au)', channel_sids, **kwargs)
+
     def get_recordings_directory (self, **kwargs):
         return self.devgroup.GetRecordingsDirectory(**kwargs)
 
@@ -214,8 +312,10 @@ class DVBDeviceGroupClient(GObject.GObject):
         params = params.unpack()
         if signal_name == "DeviceAdded":
             self.emit("device-added", *params)
+            self._devices_changed.add((params[0], params[1], True))
         elif signal_name == "DeviceRemoved":
             self.emit("device-removed", *params)
+            self._devices_changed.add((params[0], params[1], False))
 
 class DVBScannerClient(GObject.GObject):
 
@@ -230,8 +330,9 @@ class DVBScannerClient(GObject.GObject):
     def __init__(self, objpath, scanner_iface):
         GObject.GObject.__init__(self)
 
-        self.scanner = _get_proxy(objpath, scanner_iface)
-        self.scanner.connect("g-signal", self.on_g_signal)
+        self._shared = _get_shared_proxy(objpath, scanner_iface)
+        self._shared.subscribe(self.on_g_signal)
+        self.scanner = self._shared.proxy
 
     def add_scanning_data(self, data, **kwargs):
         return self.scanner.AddScanningData ('(a{sv})', data, **kwargs)
@@ -268,13 +369,18 @@ class DVBRecordingsStoreClient(GObject.GObject):
 
     __gsignals__ = {
         "changed": (GObject.SIGNAL_RUN_LAST, GObject.TYPE_NONE, [int, int]),
+        # List of (rec_id, type) tuples
+        "changed-bulk": (GObject.SIGNAL_RUN_LAST, GObject.TYPE_NONE, [GObject.TYPE_PYOBJECT]),
     }
 
     def __init__(self):
         GObject.GObject.__init__(self)
 
-        self.recstore = _get_proxy(RECSTORE_PATH, RECSTORE_IFACE)
-        self.recstore.connect("g-signal", self.on_g_signal)
+        self._changed_bulk = _SignalCoalescer(
+            lambda changes: self.emit("changed-bulk", changes))
+        self._shared = _get_shared_proxy(RECSTORE_PATH, RECSTORE_IFACE)
+        self._shared.subscribe(self.on_g_signal)
+        self.recstore = self._shared.proxy
 
     def get_recordings(self, **kwargs):
         return self.recstore.GetRecordings(**kwargs)
@@ -306,10 +412,16 @@ class DVBRecordingsStoreClient(GObject.GObject):
     def get_all_informations(self, rid, **kwargs):
         return self.recstore.GetAllInformations('(u)', rid, **kwargs)
 
+    def get_all_recording_infos(self, **kwargs):
+        return self.recstore.GetAllRecordingInfos(**kwargs)
+
     def on_g_signal(self, proxy, sender_name, signal_name, params):
         params = params.unpack()
         if signal_name == "Changed":
             self.emit("changed", *params)
+        elif signal_name == "ChangedBulk":
+            rec_ids, types = params
+            self._changed_bulk.add(*zip(rec_ids, types))
 
 class DVBRecorderClient(GObject.GObject):
 
@@ -322,8 +434,9 @@ class DVBRecorderClient(GObject.GObject):
     def __init__(self, object_path):
         GObject.GObject.__init__(self)
 
-        self.recorder = _get_proxy(object_path, RECORDER_IFACE)
-        self.recorder.connect("g-signal", self.on_g_signal)
+        self._shared = _get_shared_proxy(object_path, RECORDER_IFACE)
+        self._shared.subscribe(self.on_g_signal)
+        self.recorder = self._shared.proxy
         self.object_path = object_path
 
     def get_path(self):
@@ -380,6 +493,15 @@ class DVBRecorderClient(GObject.GObject):
     def has_timer_for_event(self, event_id, channel_sid, **kwargs):
         return self.recorder.HasTimerForEvent('(uu)', event_id, channel_sid, **kwargs)
 
+    def has_timers_for_events(self, channel_sid, event_ids, **kwargs):
+        return self.recorder.HasTimersForEvents('(uau)', channel_sid, event_ids, **kwargs)
+
+    def get_timer_plan(self, **kwargs):
+        return self.recorder.GetTimerPlan(**kwargs)
+
+    def get_conflicting_timers(self, **kwargs):
+        return self.recorder.GetConflictingTimers(**kwargs)
+
     def on_g_signal(self, proxy, sender_name, signal_name, params):
         params = params.unpack()
         if signal_name == "Changed":
@@ -392,7 +514,8 @@ class DVBRecorderClient(GObject.GObject):
 class DVBChannelListClient:
 
     def __init__(self, object_path):
-        self.channels = _get_proxy(object_path, CHANNEL_LIST_IFACE)
+        self._shared = _get_shared_proxy(object_path, CHANNEL_LIST_IFACE)
+        self.channels = self._shared.proxy
         self.object_path = object_path
 
     def get_path(self):
@@ -442,7 +565,8 @@ class DVBScheduleClient(GObject.GObject):
         self._group = int(elements[5])
         self._sid = int(elements[7])
 
-        self.schedule = _get_proxy(object_path, SCHEDULE_IFACE)
+        self._shared = _get_shared_proxy(object_path, SCHEDULE_IFACE)
+        self.schedule = self._shared.proxy
 
     def get_group_id(self):
         return self._group
@@ -456,9 +580,18 @@ class DVBScheduleClient(GObject.GObject):
     def get_all_event_infos(self, **kwargs):
         return self.schedule.GetAllEventInfos(**kwargs)
 
+    def get_all_timed_event_infos(self, **kwargs):
+        return self.schedule.GetAllTimedEventInfos(**kwargs)
+
     def get_informations(self, eid, **kwargs):
         return self.schedule.GetInformations('(u)', eid, **kwargs)
 
+    def get_local_start_timestamps(self, **kwargs):
+        return self.schedule.GetLocalStartTimestamps(**kwargs)
+
+    def get_events_in_range(self, start, end, **kwargs):
+        return self.schedule.GetEventsInRange('(xx)', start, end, **kwargs)
+
     def now_playing(self, **kwargs):
         return self.schedule.NowPlaying(**kwargs)
 
@@ -474,6 +607,9 @@ class DVBScheduleClient(GObject.GObject):
     def get_extended_description(self, eid, **kwargs):
         return self.schedule.GetExtendedDescription('(u)', eid, **kwargs)
 
+    def get_extended_descriptions(self, eids, **kwargs):
+        return self.schedule.GetExtendedDescriptions('(au)', eids, **kwargs)
+
     def get_duration(self, eid, **kwargs):
         return self.schedule.GetDuration('(u)', eid, **kwargs)
 
@@ -17,13 +17,13 @@
 # along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
 
 import gnomedvb
+from gnomedvb import aio
 from gnomedvb import GROUP_UNKNOWN
 from gnomedvb import GROUP_TERRESTRIAL
 from gnomedvb import GROUP_SATELLITE
 from gnomedvb import GROUP_CABLE
 import re
 from gnomedvb.Device import Device
-import copy
 
 class DVBModel (gnomedvb.DVBManagerClient):
 
@@ -39,12 +39,11 @@ class DVBModel (gnomedvb.DVBManagerClient):
 
     def get_registered_device_groups(self, result_handler,
             error_handler=gnomedvb.global_error_handler):
-        def groups_handler(proxy, paths, user_data):
-            result_handler([DeviceGroup(path) for path in paths])
+        def inventory_handler(devgroups, adapter_infos):
+            result_handler(devgroups)
 
         if result_handler:
-            self.manager.GetRegisteredDeviceGroups(result_handler=groups_handler,
-                error_handler=error_handler)
+            self._get_inventory(inventory_handler, error_handler)
         else:
             return [DeviceGroup(path) for path in self.manager.GetRegisteredDeviceGroups()]
 
@@ -65,50 +64,90 @@ class DVBModel (gnomedvb.DVBManagerClient):
         """
         @returns: set of Device
         """
-        def devices_handler(devices):
-            unregistered = set()
-            for dev in devices:
-                if dev not in registered:
-                    success, info = gnomedvb.get_adapter_info(dev.adapter,
-                        dev.frontend)
-                    if success:
-                        if info["type_t"]:
-                            dev_t = copy.copy(dev)
-                            dev_t.name = info["name"]
-                            dev_t.type = GROUP_TERRESTRIAL
-                            unregistered.add(dev_t)
-                        if info["type_s"]:
-                            dev_s = copy.copy(dev)
-                            dev_s.name = info["name"]
-                            dev_s.type = GROUP_SATELLITE
-                            unregistered.add(dev_s)
-                        if info["type_c"]:
-                            dev_c = copy.copy(dev)
-                            dev_c.name = info["name"]
-                            dev_c.type = GROUP_CABLE
-                            unregistered.add(dev_c)
+        def inventory_handler(registered, unregistered):
             result_handler(unregistered)
 
-        def registered_handler(devgroups):
+        self.get_device_inventory(inventory_handler, error_handler)
+
+    def get_device_inventory(self, result_handler,
+            error_handler=gnomedvb.global_error_handler):
+        """
+        Retrieve registered and unregistered devices at once.
+        C{result_handler} is called with the set of registered
+        devices and the set of unregistered devices. Devices
+        supporting multiple delivery systems are contained once
+        for each type.
+        """
+        def inventory_handler(devgroups, adapter_infos):
+            registered = set()
             for group in devgroups:
                 for dev in group["devices"]:
                     registered.add(dev)
-            self.get_all_devices(result_handler=devices_handler,
-                error_handler=error_handler)
 
-        registered = set()
-        self.get_registered_device_groups(result_handler=registered_handler,
-            error_handler=error_handler)
+            unregistered = set()
+            for adapter, frontend, name, type_t, type_s, type_c in adapter_infos:
+                for supported, devtype in ((type_t, GROUP_TERRESTRIAL),
+                        (type_s, GROUP_SATELLITE), (type_c, GROUP_CABLE)):
+                    if supported:
+                        dev = Device (0, name, adapter, frontend, devtype)
+                        if dev not in registered:
+                            unregistered.add(dev)
+            result_handler(registered, unregistered)
+
+        self._get_inventory(inventory_handler, error_handler)
+
+    def _get_inventory(self, result_handler, error_handler):
+        def on_done(task):
+            if task.exception() != None:
+                error_handler(self.manager, task.exception(), None)
+            else:
+                result_handler(*task.result())
+
+        aio.ensure_future(self._get_inventory_async()).add_done_callback(on_done)
+
+    async def _get_inventory_async(self):
+        """
+        Retrieve all informations about device groups and
+        adapters concurrently
+
+        @returns: list of DeviceGroup and list of adapter infos
+        """
+        manager = aio.ManagerClient(self)
+        groups, adapter_infos = await aio.gather(
+            manager.get_registered_device_groups(),
+            manager.get_all_adapter_infos())
+        group_infos = await aio.gather(*[aio.gather(group.get_name(),
+            group.get_type(), group.get_members()) for group in groups])
+
+        device_names = {}
+        for info in adapter_infos:
+            device_names[(info[0], info[1])] = info[2]
+
+        devgroups = []
+        for group, (name, devtype, members) in zip(groups, group_infos):
+            devgroups.append(DeviceGroup(group.devgroup.get_object_path(),
+                (name, devtype, members, device_names)))
+        return (devgroups, adapter_infos)
 
 class DeviceGroup(gnomedvb.DVBDeviceGroupClient):
 
-    def __init__(self, objpath):
+    def __init__(self, objpath, infos=None):
+        """
+        @param infos: Tuple of name, type, paths of members and a
+        dict mapping adapter and frontend to the device's name. The
+        informations are retrieved from the daemon if omitted.
+        """
         gnomedvb.DVBDeviceGroupClient.__init__(self, objpath)
 
         self._adapter_pattern = re.compile("adapter(\d+?)/frontend(\d+?)")
-        self._name = self.get_name()
-        self._type = self.get_type()
-        self._members = self.get_members()
+        if infos == None:
+            self._name = self.get_name()
+            self._type = self.get_type()
+            self._members = self.get_members()
+        else:
+            self._name, self._type, device_paths, device_names = infos
+            self._members = self._create_devices(device_paths,
+                lambda adapter, frontend: device_names.get((adapter, frontend), ""))
 
     def __getitem__(self, key):
         if key == "id":
@@ -123,14 +162,22 @@ class DeviceGroup(gnomedvb.DVBDeviceGroupClient):
             raise KeyError("Unknown key "+str(key))
 
     def get_members(self):
-        devices = []
         manager = gnomedvb.DVBManagerClient()
-        for device_path in gnomedvb.DVBDeviceGroupClient.get_members(self):
+
+        def get_device_name(adapter, frontend):
+            return manager.get_name_of_registered_device(adapter, frontend)[0]
+
+        return self._create_devices(
+            gnomedvb.DVBDeviceGroupClient.get_members(self), get_device_name)
+
+    def _create_devices(self, device_paths, get_device_name):
+        devices = []
+        for device_path in device_paths:
             match = self._adapter_pattern.search(device_path)
             if match != None:
                 adapter = int(match.group(1))
                 frontend = int(match.group(2))
-                devname, success = manager.get_name_of_registered_device(adapter, frontend)
+                devname = get_device_name(adapter, frontend)
                 dev = Device (self._id, devname, adapter, frontend, self._type)
                 dev.group_name = self._name
                 devices.append(dev)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2008,2009 Sebastian Pölsterl
+#
+# This file is part of GNOME DVB Daemon.
+#
+# GNOME DVB Daemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GNOME DVB Daemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+import gnomedvb
+
+__all__ = ["DescriptionCache", "get_description_cache"]
+
+class DescriptionCache:
+    """
+    Least recently used cache of the extended descriptions of events.
+
+    Descriptions are keyed by group id, channel sid, event id and
+    version. The daemon doesn't keep the EIT version of events,
+    hence the local start timestamp of the event is used as version,
+    which changes whenever the broadcaster reschedules the event.
+    """
+
+    MAX_SIZE = 500
+
+    def __init__(self, max_size=MAX_SIZE):
+        self._max_size = max_size
+        self._descriptions = OrderedDict()
+        # key -> list of callbacks waiting for the description
+        self._pending = {}
+
+    def _get_key(self, schedule, event_id, version):
+        return (schedule.get_group_id(), schedule.get_channel_sid(),
+            event_id, version)
+
+    def lookup(self, schedule, event_id, version):
+        """
+        @returns: The cached description or C{None}
+        """
+        key = self._get_key(schedule, event_id, version)
+        desc = self._descriptions.get(key)
+        if desc != None:
+            self._descriptions.move_to_end(key)
+        return desc
+
+    def get(self, schedule, event_id, version, callback=None, *args):
+        """
+        Call C{callback(description, *args)} as soon as the
+        description is available. If it is already cached
+        C{callback} is called immediately. Otherwise, the
+        description is retrieved asynchronously. An empty string
+        is passed if the event doesn't exist.
+        """
+        key = self._get_key(schedule, event_id, version)
+        desc = self.lookup(schedule, event_id, version)
+        if desc != None:
+            if callback != None:
+                callback(desc, *args)
+            return
+
+        callbacks = self._pending.get(key)
+        if callbacks == None:
+            callbacks = []
+            self._pending[key] = callbacks
+            schedule.get_extended_description(event_id,
+                result_handler=self._on_description, user_data=key,
+                error_handler=self._on_error)
+        if callback != None:
+            callbacks.append((callback, args))
+
+    def prefetch(self, schedule, events):
+        """
+        Retrieve the descriptions of the given events in the
+        background with a single call to the daemon
+
+        @param events: List of (event id, version) tuples
+        """
+        keys = []
+        for event_id, version in events:
+            key = self._get_key(schedule, event_id, version)
+            if key in self._descriptions or key in self._pending:
+                continue
+            self._pending[key] = []
+            keys.append(key)
+        if len(keys) == 0:
+            return
+
+        schedule.get_extended_descriptions([key[2] for key in keys],
+            result_handler=self._on_descriptions, user_data=keys,
+            error_handler=self._on_prefetch_error)
+
+    def clear(self):
+        self._descriptions.clear()
+
+    def _on_description(self, proxy, result, key):
+        desc, success = result
+        if not success:
+            desc = ""
+        self._add(key, desc)
+
+    def _on_descriptions(self, proxy, descriptions, keys):
+        for key, desc in zip(keys, descriptions):
+            self._add(key, desc)
+
+    def _add(self, key, desc):
+        self._descriptions[key] = desc
+        while len(self._descriptions) > self._max_size:
+            self._descriptions.popitem(last=False)
+
+        for callback, args in self._pending.pop(key, []):
+            callback(desc, *args)
+
+    def _on_error(self, proxy, error, key):
+        # Waiting callbacks are dropped, the next request tries again
+        self._pending.pop(key, None)
+        gnomedvb.global_error_handler(proxy, error, key)
+
+    def _on_prefetch_error(self, proxy, error, keys):
+        for key in keys:
+            self._pending.pop(key, None)
+        gnomedvb.global_error_handler(proxy, error, keys)
+
+_cache = None
+
+def get_description_cache():
+    """
+    @returns: The cache shared by all widgets
+    """
+    global _cache
+    if _cache == None:
+        _cache = DescriptionCache()
+    return _cache
@@ -0,0 +1,731 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2008,2009 Sebastian Pölsterl
+#
+# This file is part of GNOME DVB Daemon.
+#
+# GNOME DVB Daemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GNOME DVB Daemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Asynchronous counterpart of the wrappers in L{gnomedvb.DBusWrapper}.
+
+Every method returns an awaitable that is resolved from the GLib main
+context, therefore the main loop never blocks while waiting for the
+daemon. Coroutines are driven by L{Task}, e.g.::
+
+    async def show_groups():
+        manager = await aio.get_manager_client()
+        for group in await manager.get_registered_device_groups():
+            print(await group.get_name())
+
+    aio.ensure_future(show_groups())
+
+Scripts without a running main loop can use L{run_until_complete}
+and asyncio based code can use L{wrap_future}.
+"""
+
+import logging
+import re
+from gi.repository import GLib
+from gi.repository import Gio
+from gnomedvb import DBusWrapper
+
+__all__ = [
+    "Future",
+    "Task",
+    "ensure_future",
+    "gather",
+    "run_until_complete",
+    "wrap_future",
+    "get_adapter_info",
+    "get_dvb_devices",
+    "get_manager_client",
+    "get_device_group_client",
+    "get_scanner_client",
+    "get_recordings_store_client",
+    "get_recorder_client",
+    "get_channel_list_client",
+    "get_schedule_client",
+]
+
+_log = logging.getLogger(__name__)
+
+class Future:
+    """
+    Result of an asynchronous operation that can be awaited
+    """
+
+    def __init__(self):
+        self._done = False
+        self._result = None
+        self._exception = None
+        self._callbacks = []
+        # Whether the exception has been set but not retrieved yet
+        self._log_exception = False
+
+    def __del__(self):
+        if self._log_exception:
+            _log.error("Exception of %r was never retrieved", self,
+                exc_info=(type(self._exception), self._exception,
+                    self._exception.__traceback__))
+
+    def done(self):
+        return self._done
+
+    def result(self):
+        if not self._done:
+            raise RuntimeError("Result is not ready")
+        self._log_exception = False
+        if self._exception != None:
+            raise self._exception
+        return self._result
+
+    def exception(self):
+        if not self._done:
+            raise RuntimeError("Result is not ready")
+        self._log_exception = False
+        return self._exception
+
+    def add_done_callback(self, callback):
+        if self._done:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def set_result(self, result):
+        self._result = result
+        self._finish()
+
+    def set_exception(self, exception):
+        self._exception = exception
+        # Reset if a callback retrieves the exception
+        self._log_exception = True
+        self._finish()
+
+    def _finish(self):
+        if self._done:
+            raise RuntimeError("Result has already been set")
+        self._done = True
+        callbacks = self._callbacks
+        self._callbacks = []
+        for callback in callbacks:
+            callback(self)
+
+    def __await__(self):
+        if not self._done:
+            yield self
+        return self.result()
+
+    __iter__ = __await__
+
+class Task(Future):
+    """
+    Drives a coroutine from the GLib main loop. The coroutine
+    may only await instances of L{Future}.
+    """
+
+    def __init__(self, coro):
+        Future.__init__(self)
+        self._coro = coro
+        GLib.idle_add(self._step, None, None)
+
+    def _step(self, value, exception):
+        try:
+            if exception != None:
+                future = self._coro.throw(exception)
+            else:
+                future = self._coro.send(value)
+        except StopIteration as e:
+            self.set_result(e.value)
+        except Exception as e:
+            self.set_exception(e)
+        else:
+            if isinstance(future, Future):
+                future.add_done_callback(self._wakeup)
+            else:
+                self._step(None, TypeError("Cannot await %r" % future))
+        return False
+
+    def _wakeup(self, future):
+        exception = future.exception()
+        if exception != None:
+            self._step(None, exception)
+        else:
+            self._step(future.result(), None)
+
+def ensure_future(awaitable):
+    """
+    Schedule C{awaitable} if it is a coroutine
+
+    @returns: L{Future}
+    """
+    if isinstance(awaitable, Future):
+        return awaitable
+    return Task(awaitable)
+
+def gather(*awaitables):
+    """
+    Run all awaitables concurrently
+
+    @returns: L{Future} resolving to the list of results in the same
+    order as C{awaitables}
+    """
+    gathered = Future()
+    futures = [ensure_future(aw) for aw in awaitables]
+    pending = [len(futures)]
+
+    def on_done(future):
+        # Retrieve the exception even if another awaitable failed before
+        exception = future.exception()
+        if gathered.done():
+            return
+        if exception != None:
+            gathered.set_exception(exception)
+            return
+        pending[0] -= 1
+        if pending[0] == 0:
+            gathered.set_result([f.result() for f in futures])
+
+    if len(futures) == 0:
+        gathered.set_result([])
+    for future in futures:
+        future.add_done_callback(on_done)
+    return gathered
+
+def run_until_complete(awaitable):
+    """
+    Run a GLib main loop until C{awaitable} is finished
+
+    @returns: The result of C{awaitable}
+    """
+    future = ensure_future(awaitable)
+    if not future.done():
+        loop = GLib.MainLoop()
+        future.add_done_callback(lambda f: loop.quit())
+        loop.run()
+    # Raises the exception of awaitable
+    return future.result()
+
+def wrap_future(future, loop=None):
+    """
+    Wrap L{Future} in an asyncio future of C{loop}.
+
+    The GLib main context must be iterated, either by a GLib main
+    loop running in another thread or by an asyncio event loop
+    integrating GLib.
+    """
+    import asyncio
+    if loop == None:
+        loop = asyncio.get_event_loop()
+    afuture = loop.create_future()
+
+    def copy_state(afuture, future):
+        if afuture.cancelled():
+            return
+        if future.exception() != None:
+            afuture.set_exception(future.exception())
+        else:
+            afuture.set_result(future.result())
+
+    ensure_future(future).add_done_callback(
+        lambda f: loop.call_soon_threadsafe(copy_state, afuture, f))
+    return afuture
+
+def _unpack(result):
+    # Same convention as calling methods of Gio.DBusProxy directly
+    values = result.unpack()
+    if len(values) == 0:
+        return None
+    elif len(values) == 1:
+        return values[0]
+    return values
+
+def _call(proxy, method, signature=None, *args):
+    future = Future()
+
+    def on_finished(proxy, res, user_data):
+        try:
+            result = proxy.call_finish(res)
+        except GLib.Error as e:
+            future.set_exception(e)
+        else:
+            future.set_result(_unpack(result))
+
+    if signature == None:
+        params = None
+    else:
+        params = GLib.Variant(signature, args)
+    proxy.call(method, params, Gio.DBusCallFlags.NONE, -1, None,
+        on_finished, None)
+    return future
+
+# Maps (object path, interface) to the Future of a proxy that
+# is currently being created
+_pending_proxies = {}
+
+def _get_shared_proxy(object_path, iface_name):
+    """
+    Asynchronous version of L{DBusWrapper._get_shared_proxy}
+    """
+    key = (object_path, iface_name)
+    future = _pending_proxies.get(key)
+    if future != None:
+        return future
+
+    future = Future()
+    shared = DBusWrapper._shared_proxies.get(key)
+    if shared != None:
+        future.set_result(shared)
+        return future
+
+    def on_ready(source, res, user_data):
+        del _pending_proxies[key]
+        try:
+            proxy = Gio.DBusProxy.new_for_bus_finish(res)
+        except GLib.Error as e:
+            future.set_exception(e)
+        else:
+            future.set_result(DBusWrapper._register_shared_proxy(proxy))
+
+    _pending_proxies[key] = future
+    Gio.DBusProxy.new_for_bus(Gio.BusType.SESSION,
+        Gio.DBusProxyFlags.NONE, None,
+        DBusWrapper.SERVICE,
+        object_path,
+        iface_name, None, on_ready, None)
+    return future
+
+async def get_adapter_info(adapter, frontend):
+    manager = await get_manager_client()
+    info_t, success = await manager.get_adapter_info(adapter, frontend)
+    info = {"name": info_t[0], "type_t": info_t[1], "type_s": info_t[2], "type_c": info_t[3]}
+    return (success, info)
+
+async def get_dvb_devices():
+    manager = await get_manager_client()
+    devices = await manager.get_devices()
+
+    deviceslist = []
+    for dev in devices:
+        match = re.search("adapter(\d+?)/frontend(\d+?)", dev["device_file"])
+        if match != None:
+            info = {}
+            info["adapter"] = int(match.group(1))
+            info["frontend"] = int(match.group(2))
+            deviceslist.append(info)
+
+    return deviceslist
+
+# The synchronous wrappers pick up the proxy from the pool, the local
+# reference to it just keeps it alive until the wrapper is created.
+
+async def get_manager_client():
+    shared = await _get_shared_proxy(DBusWrapper.MANAGER_PATH,
+        DBusWrapper.MANAGER_IFACE)
+    return ManagerClient(DBusWrapper.DVBManagerClient())
+
+async def get_device_group_client(objpath):
+    shared = await _get_shared_proxy(objpath, DBusWrapper.DEVICE_GROUP_IFACE)
+    return DeviceGroupClient(DBusWrapper.DVBDeviceGroupClient(objpath))
+
+async def get_scanner_client(objpath, scanner_iface):
+    shared = await _get_shared_proxy(objpath, scanner_iface)
+    return ScannerClient(DBusWrapper.DVBScannerClient(objpath, scanner_iface))
+
+async def get_recordings_store_client():
+    shared = await _get_shared_proxy(DBusWrapper.RECSTORE_PATH,
+        DBusWrapper.RECSTORE_IFACE)
+    return RecordingsStoreClient(DBusWrapper.DVBRecordingsStoreClient())
+
+async def get_recorder_client(object_path):
+    shared = await _get_shared_proxy(object_path, DBusWrapper.RECORDER_IFACE)
+    return RecorderClient(DBusWrapper.DVBRecorderClient(object_path))
+
+async def get_channel_list_client(object_path):
+    shared = await _get_shared_proxy(object_path,
+        DBusWrapper.CHANNEL_LIST_IFACE)
+    return ChannelListClient(DBusWrapper.DVBChannelListClient(object_path))
+
+async def get_schedule_client(object_path):
+    shared = await _get_shared_proxy(object_path, DBusWrapper.SCHEDULE_IFACE)
+    return ScheduleClient(DBusWrapper.DVBScheduleClient(object_path))
+
+class _Client:
+    """
+    Base class of all asynchronous clients. Signals are emitted
+    by the synchronous wrapper C{client}.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def connect(self, signal_name, handler, *args):
+        return self.client.connect(signal_name, handler, *args)
+
+    def disconnect(self, handler_id):
+        self.client.disconnect(handler_id)
+
+class ManagerClient(_Client):
+
+    def __init__(self, client):
+        _Client.__init__(self, client)
+        self.manager = client.manager
+
+    async def get_scanner_for_device(self, adapter, frontend, type):
+        objpath, scanner_iface, success = await _call(self.manager,
+            "GetScannerForDevice", '(uui)', adapter, frontend, type)
+        if success:
+            return await get_scanner_client(objpath, scanner_iface)
+        else:
+            return None
+
+    async def get_device_group(self, group_id):
+        path, success = await _call(self.manager, "GetDeviceGroup",
+            '(u)', group_id)
+        if success:
+            return await get_device_group_client(path)
+        else:
+            return None
+
+    async def get_registered_device_groups(self):
+        paths = await _call(self.manager, "GetRegisteredDeviceGroups")
+        return await gather(*[get_device_group_client(path) for path in paths])
+
+    def add_device_to_new_group (self, adapter, frontend, type, channels_file, recordings_dir, name):
+        return _call(self.manager, "AddDeviceToNewGroup", '(uuisss)',
+            adapter, frontend, type, channels_file, recordings_dir, name)
+
+    def get_name_of_registered_device(self, adapter, frontend):
+        return _call(self.manager, "GetNameOfRegisteredDevice", '(uu)',
+            adapter, frontend)
+
+    def get_device_group_size(self):
+        return _call(self.manager, "GetDeviceGroupSize")
+
+    def get_channel_groups(self):
+        return _call(self.manager, "GetChannelGroups")
+
+    def add_channel_group(self, name):
+        return _call(self.manager, "AddChannelGroup", '(s)', name)
+
+    def remove_channel_group(self, group_id):
+        return _call(self.manager, "RemoveChannelGroup", '(i)', group_id)
+
+    def get_devices(self):
+        return _call(self.manager, "GetDevices")
+
+    def get_adapter_info(self, adapter, frontend):
+        return _call(self.manager, "GetAdapterInfo", '(uu)', adapter, frontend)
+
+    def get_all_adapter_infos(self):
+        return _call(self.manager, "GetAllAdapterInfos")
+
+class DeviceGroupClient(_Client):
+
+    def __init__(self, client):
+        _Client.__init__(self, client)
+        self.devgroup = client.devgroup
+
+    def get_id(self):
+        return self.client.get_id()
+
+    async def get_recorder(self):
+        path = await _call(self.devgroup, "GetRecorder")
+        return await get_recorder_client(path)
+
+    def add_device (self, adapter, frontend):
+        return _call(self.devgroup, "AddDevice", '(uu)', adapter, frontend)
+
+    def remove_device(self, adapter, frontend):
+        return _call(self.devgroup, "RemoveDevice", '(uu)', adapter, frontend)
+
+    async def get_channel_list(self):
+        path = await _call(self.devgroup, "GetChannelList")
+        return await get_channel_list_client(path)
+
+    def get_members(self):
+        return _call(self.devgroup, "GetMembers")
+
+    def get_name(self):
+        return _call(self.devgroup, "GetName")
+
+    def set_name(self, name):
+        return _call(self.devgroup, "SetName", '(s)', name)
+
+    def get_type(self):
+        return _call(self.devgroup, "GetType")
+
+    async def get_schedule(self, channel_sid):
+        path, success = await _call(self.devgroup, "GetSchedule", '(u)',
+            channel_sid)
+        if success:
+            return await get_schedule_client(path)
+        else:
+            return None
+
+    def get_informations_bulk(self, channel_sids):
+        return _call(self.devgroup, "GetInformationsBulk", '(au)',
+            channel_sids)
+
+    def get_recordings_directory (self):
+        return _call(self.devgroup, "GetRecordingsDirectory")
+
+    def set_recordings_directory (self, location):
+        return _call(self.devgroup, "SetRecordingsDirectory", '(s)', location)
+
+class ScannerClient(_Client):
+
+    def __init__(self, client):
+        _Client.__init__(self, client)
+        self.scanner = client.scanner
+
+    def add_scanning_data(self, data):
+        return _call(self.scanner, "AddScanningData", '(a{sv})', data)
+
+    def add_scanning_data_from_file(self, path):
+        return _call(self.scanner, "AddScanningDataFromFile", '(s)', path)
+
+    def run(self):
+        return _call(self.scanner, "Run")
+
+    def destroy(self):
+        return _call(self.scanner, "Destroy")
+
+    def write_channels_to_file(self, channel_sids, channelfile):
+        return _call(self.scanner, "WriteChannelsToFile", '(aus)',
+            channel_sids, channelfile)
+
+    def write_all_channels_to_file(self, channelfile):
+        return _call(self.scanner, "WriteAllChannelsToFile", '(s)',
+            channelfile)
+
+class RecordingsStoreClient(_Client):
+
+    def __init__(self, client):
+        _Client.__init__(self, client)
+        self.recstore = client.recstore
+
+    def get_recordings(self):
+        return _call(self.recstore, "GetRecordings")
+
+    def get_location(self, rid):
+        return _call(self.recstore, "GetLocation", '(u)', rid)
+
+    def get_name(self, rid):
+        return _call(self.recstore, "GetName", '(u)', rid)
+
+    def get_description(self, rid):
+        return _call(self.recstore, "GetDescription", '(u)', rid)
+
+    def get_length(self, rid):
+        return _call(self.recstore, "GetLength", '(u)', rid)
+
+    def get_start_time(self, rid):
+        return _call(self.recstore, "GetStartTime", '(u)', rid)
+
+    def get_start_timestamp(self, rid):
+        return _call(self.recstore, "GetStartTimestamp", '(u)', rid)
+
+    def delete(self, rid):
+        return _call(self.recstore, "Delete", '(u)', rid)
+
+    def get_channel_name(self, rid):
+        return _call(self.recstore, "GetChannelName", '(u)', rid)
+
+    def get_all_informations(self, rid):
+        return _call(self.recstore, "GetAllInformations", '(u)', rid)
+
+    def get_all_recording_infos(self):
+        return _call(self.recstore, "GetAllRecordingInfos")
+
+class RecorderClient(_Client):
+
+    def __init__(self, client):
+        _Client.__init__(self, client)
+        self.recorder = client.recorder
+
+    def get_path(self):
+        return self.client.get_path()
+
+    def add_timer (self, channel, year, month, day, hour, minute, duration):
+        return _call(self.recorder, "AddTimer", '(uiiiiiu)', channel, year,
+            month, day, hour, minute, duration)
+
+    def add_timer_with_margin (self, channel, year, month, day, hour, minute, duration):
+        return _call(self.recorder, "AddTimerWithMargin", '(uiiiiiu)',
+            channel, year, month, day, hour, minute, duration)
+
+    def add_timer_for_epg_event(self, event_id, channel_sid):
+        return _call(self.recorder, "AddTimerForEPGEvent", '(uu)',
+            event_id, channel_sid)
+
+    def delete_timer(self, tid):
+        return _call(self.recorder, "DeleteTimer", '(u)', tid)
+
+    def get_timers(self):
+        return _call(self.recorder, "GetTimers")
+
+    def get_start_time(self, tid):
+        return _call(self.recorder, "GetStartTime", '(u)', tid)
+
+    def set_start_time(self, tid, year, month, day, hour, minute):
+        return _call(self.recorder, "SetStartTime", '(uiiiii)', tid, year,
+            month, day, hour, minute)
+
+    def get_end_time(self, tid):
+        return _call(self.recorder, "GetEndTime", '(u)', tid)
+
+    def get_duration(self, tid):
+        return _call(self.recorder, "GetDuration", '(u)', tid)
+
+    def set_duration(self, tid, duration):
+        return _call(self.recorder, "SetDuration", '(uu)', tid, duration)
+
+    def get_channel_name(self, tid):
+        return _call(self.recorder, "GetChannelName", '(u)', tid)
+
+    def get_title(self, tid):
+        return _call(self.recorder, "GetTitle", '(u)', tid)
+
+    def get_all_informations(self, tid):
+        return _call(self.recorder, "GetAllInformations", '(u)', tid)
+
+    def get_active_timers(self):
+        return _call(self.recorder, "GetActiveTimers")
+
+    def is_timer_active(self, tid):
+        return _call(self.recorder, "IsTimerActive", '(u)', tid)
+
+    def has_timer(self, year, month, day, hour, minute, duration):
+        return _call(self.recorder, "HasTimer", '(uuuuuu)', year, month,
+            day, hour, minute, duration)
+
+    def has_timer_for_event(self, event_id, channel_sid):
+        return _call(self.recorder, "HasTimerForEvent", '(uu)', event_id,
+            channel_sid)
+
+    def has_timers_for_events(self, channel_sid, event_ids):
+        return _call(self.recorder, "HasTimersForEvents", '(uau)',
+            channel_sid, event_ids)
+
+    def get_timer_plan(self):
+        return _call(self.recorder, "GetTimerPlan")
+
+    def get_conflicting_timers(self):
+        return _call(self.recorder, "GetConflictingTimers")
+
+class ChannelListClient(_Client):
+
+    def __init__(self, client):
+        _Client.__init__(self, client)
+        self.channels = client.channels
+
+    def get_path(self):
+        return self.client.get_path()
+
+    def get_channels(self):
+        return _call(self.channels, "GetChannels")
+
+    def get_radio_channels(self):
+        return _call(self.channels, "GetRadioChannels")
+
+    def get_tv_channels(self):
+        return _call(self.channels, "GetTVChannels")
+
+    def get_channel_name(self, cid):
+        return _call(self.channels, "GetChannelName", '(u)', cid)
+
+    def get_channel_network(self, cid):
+        return _call(self.channels, "GetChannelNetwork", '(u)', cid)
+
+    def is_radio_channel(self, cid):
+        return _call(self.channels, "IsRadioChannel", '(u)', cid)
+
+    def get_channel_url(self, cid):
+        return _call(self.channels, "GetChannelURL", '(u)', cid)
+
+    def get_channel_infos(self):
+        return _call(self.channels, "GetChannelInfos")
+
+    def get_channels_of_group(self, group_id):
+        return _call(self.channels, "GetChannelsOfGroup", '(i)', group_id)
+
+    def add_channel_to_group(self, cid, group_id):
+        return _call(self.channels, "AddChannelToGroup", '(ui)', cid, group_id)
+
+    def remove_channel_from_group(self, cid, group_id):
+        return _call(self.channels, "RemoveChannelFromGroup", '(ui)', cid,
+            group_id)
+
+class ScheduleClient(_Client):
+
+    def __init__(self, client):
+        _Client.__init__(self, client)
+        self.schedule = client.schedule
+
+    def get_group_id(self):
+        return self.client.get_group_id()
+
+    def get_channel_sid(self):
+        return self.client.get_channel_sid()
+
+    def get_all_events(self):
+        return _call(self.schedule, "GetAllEvents")
+
+    def get_all_event_infos(self):
+        return _call(self.schedule, "GetAllEventInfos")
+
+    def get_all_timed_event_infos(self):
+        return _call(self.schedule, "GetAllTimedEventInfos")
+
+    def get_informations(self, eid):
+        return _call(self.schedule, "GetInformations", '(u)', eid)
+
+    def get_local_start_timestamps(self):
+        return _call(self.schedule, "GetLocalStartTimestamps")
+
+    def get_events_in_range(self, start, end):
+        return _call(self.schedule, "GetEventsInRange", '(xx)', start, end)
+
+    def now_playing(self):
+        return _call(self.schedule, "NowPlaying")
+
+    def next(self, eid):
+        return _call(self.schedule, "Next", '(u)', eid)
+
+    def get_name(self, eid):
+        return _call(self.schedule, "GetName", '(u)', eid)
+
+    def get_short_description(self, eid):
+        return _call(self.schedule, "GetShortDescription", '(u)', eid)
+
+    def get_extended_description(self, eid):
+        return _call(self.schedule, "GetExtendedDescription", '(u)', eid)
+
+    def get_extended_descriptions(self, eids):
+        return _call(self.schedule, "GetExtendedDescriptions", '(au)', eids)
+
+    def get_duration(self, eid):
+        return _call(self.schedule, "GetDuration", '(u)', eid)
+
+    def get_local_start_time(self, eid):
+        return _call(self.schedule, "GetLocalStartTime", '(u)', eid)
+
+    def get_local_start_timestamp(self, eid):
+        return _call(self.schedule, "GetLocalStartTimestamp", '(u)', eid)
+
+    def is_running(self, eid):
+        return _call(self.schedule, "IsRunning", '(u)', eid)
+
+    def is_scrambled(self, eid):
+        return _call(self.schedule, "IsScrambled", '(u)', eid)
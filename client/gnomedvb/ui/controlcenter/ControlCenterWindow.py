@@ -426,11 +426,12 @@ class ControlCenterWindow(Gtk.Window):
         if aiter != None:
             sid = model[aiter][model.COL_SID]
             group = self._get_selected_group()
+            # The model is attached when all events have been loaded
+            self.scheduleview.set_model(None)
             self.schedulestore = ScheduleStore(group, sid)
             self.schedulestore.connect("loading-finished",
                 self._on_schedule_loading_finished)
 
-            self.scheduleview.set_model(self.schedulestore)
             # Display schedule if it isn't already displayed
             if child != self.schedulepaned:
                 self.hpaned.remove(child)
@@ -444,8 +445,13 @@ class ControlCenterWindow(Gtk.Window):
                 self._display_running_next()
 
     def _on_schedule_loading_finished(self, schedulestore):
+        if schedulestore != self.schedulestore:
+            # Another channel has been selected in the meantime
+            return
         if len(self.schedulestore) == 0:
             self._display_help_message(self.no_events_text)
+        else:
+            self.scheduleview.set_model(self.schedulestore)
 
     def _display_help_message(self, text):
         child = self.hpaned.get_child2()
@@ -533,6 +539,7 @@ class ControlCenterWindow(Gtk.Window):
         self._reset_schedule_view()
 
     def _on_refresh_clicked(self, button, user_data=None):
+        self.scheduleview.set_model(None)
         self.schedulestore.reload_all()
 
     def _on_button_prev_day_clicked(self, button, user_data=None):
@@ -21,15 +21,23 @@ from gi.repository import GObject
 from gnomedvb import _
 from gnomedvb.ui.wizard import DVB_TYPE_TO_DESC
 from gnomedvb.Device import Device
+from gnomedvb.ui.widgets.IndexedStore import IndexedStore
 
 __all__ = ["UnassignedDevicesStore", "DeviceGroupsStore", "DeviceGroupsView"]
 
-class UnassignedDevicesStore (Gtk.ListStore):
+class UnassignedDevicesStore (IndexedStore, Gtk.ListStore):
 
     (COL_DEVICE,) = list(range(1))
 
     def __init__(self):
         Gtk.ListStore.__init__(self, GObject.TYPE_PYOBJECT)
+        IndexedStore.__init__(self, self.COL_DEVICE)
+
+    def get_row_id(self, aiter):
+        device = self[aiter][self.COL_DEVICE]
+        if device == None:
+            return None
+        return (device.adapter, device.frontend)
 
 
 class DeviceGroupsStore (Gtk.TreeStore):
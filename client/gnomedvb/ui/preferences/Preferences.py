@@ -170,8 +170,7 @@ class Preferences(Gtk.Window):
         self._model.get_registered_device_groups(result_handler=append_registered)
 
     def _append_group(self, group, remove_unassigned=False):
-        group.connect("device-added", self._on_group_device_added)
-        group.connect("device-removed", self._on_group_device_removed)
+        group.connect("devices-changed", self._on_group_devices_changed)
 
         group_iter = self.devicegroups.append(None)
         self.devicegroups[group_iter][self.devicegroups.COL_GROUP] = group
@@ -337,6 +336,13 @@ class Preferences(Gtk.Window):
                 return
             aiter = self.devicegroups.iter_next(aiter)
 
+    def _on_group_devices_changed(self, group, changes):
+        for adapter, frontend, added in changes:
+            if added:
+                self._on_group_device_added(group, adapter, frontend)
+            else:
+                self._on_group_device_removed(group, adapter, frontend)
+
     def _on_group_device_added(self, group, adapter, frontend):
         self._remove_unassigned_device(adapter, frontend)
         # Iterate over groups
@@ -367,8 +373,5 @@ class Preferences(Gtk.Window):
 
     def _remove_unassigned_device(self, adapter, frontend):
         # Remove device from unassigned
-        for row in self.unassigned_devices:
-            dev = row[self.unassigned_devices.COL_DEVICE]
-            if dev.adapter == adapter and dev.frontend == frontend:
-                self.unassigned_devices.remove(row.iter)
+        self.unassigned_devices.remove_id((adapter, frontend))
 
@@ -25,6 +25,7 @@ from gnomedvb import global_error_handler
 from gnomedvb.ui.timers.MessageDialogs import TimerFailureDialog
 from gnomedvb.ui.timers.TimerDialog import TimerDialog
 from gnomedvb.ui.widgets.CellRendererDatetime import CellRendererDatetime
+from gnomedvb.ui.widgets.IndexedStore import IndexedListStore
 
 class EditTimersDialog(Gtk.Dialog):
 
@@ -63,7 +64,8 @@ class EditTimersDialog(Gtk.Dialog):
         self.main_box.show()
         self.get_content_area().pack_start(self.main_box, True, True, 0)
 
-        self.timerslist = Gtk.ListStore(int, str, str, GObject.TYPE_PYOBJECT, int, bool)
+        self.timerslist = IndexedListStore(self.COL_ID, int, str, str,
+            GObject.TYPE_PYOBJECT, int, bool)
         self.timerslist.set_sort_func(self.COL_START,
             self._datetime_sort_func)
 
@@ -153,9 +155,7 @@ class EditTimersDialog(Gtk.Dialog):
             self.timerslist.append([int(timer_id), channel, title, starttime, duration, bool(active)])
 
     def _remove_timer(self, timer_id):
-        for row in self.timerslist:
-            if row[self.COL_ID] == timer_id:
-                self.timerslist.remove(row.iter)
+        self.timerslist.remove_id(timer_id)
 
     def _on_button_delete_clicked(self, button):
         def delete_timer_callback(proxy, success, user_data):
@@ -257,9 +257,9 @@ class EditTimersDialog(Gtk.Dialog):
             self.button_edit.set_sensitive(True)
 
     def _set_recording_state(self, recorder, timer_id, state):
-        for row in self.timerslist:
-            if row[self.COL_ID] == timer_id:
-                self.timerslist[row.iter][self.COL_ACTIVE] = bool(state)
+        aiter = self.timerslist.get_iter_for_id(timer_id)
+        if aiter != None:
+            self.timerslist[aiter][self.COL_ACTIVE] = bool(state)
 
     def _get_recording_icon_for_cell(self, column, cell, model, aiter, user_data):
         if model[aiter][self.COL_ACTIVE]:
@@ -21,6 +21,7 @@ from gi.repository import GObject
 import gnomedvb
 from gnomedvb import global_error_handler
 from gnomedvb.Callback import Callback
+from gnomedvb.ui.widgets.IndexedStore import IndexedStore
 from cgi import escape
 from gnomedvb import _
 
@@ -58,7 +59,7 @@ class ChannelsStore(Gtk.ListStore):
             error_handler=global_error_handler)
 
 
-class ChannelsTreeStore(Gtk.TreeStore):
+class ChannelsTreeStore(IndexedStore, Gtk.TreeStore):
 
     (COL_GROUP_ID,
      COL_NAME,
@@ -71,6 +72,7 @@ class ChannelsTreeStore(Gtk.TreeStore):
 
     def __init__(self, use_channel_groups=False):
         Gtk.TreeStore.__init__(self, int, str, int, GObject.GObject)
+        IndexedStore.__init__(self, self.COL_GROUP_ID)
 
         self.set_sort_order(Gtk.SortType.ASCENDING)
 
@@ -160,11 +162,14 @@ class ChannelsTreeStore(Gtk.TreeStore):
         if group != None:
             self._append_group(group)
 
+    def get_row_id(self, aiter):
+        # Only index rows of device groups
+        if self.iter_parent(aiter) != None:
+            return None
+        return self[aiter][self.COL_GROUP_ID]
+
     def _on_manager_group_removed(self, manager, group_id):
-        for row in self:
-            if row[self.COL_GROUP_ID] == group_id:
-                self.remove(row.iter)
-                break
+        self.remove_id(group_id)
 
     def set_sort_order(self, order):
         self.set_sort_column_id(self.COL_NAME, order)
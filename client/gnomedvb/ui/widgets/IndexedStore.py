@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2008,2009 Sebastian Pölsterl
+#
+# This file is part of GNOME DVB Daemon.
+#
+# GNOME DVB Daemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GNOME DVB Daemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gtk
+
+__all__ = ["IndexedStore", "IndexedListStore"]
+
+class IndexedStore:
+    """
+    Mixin for Gtk.ListStore and Gtk.TreeStore that keeps
+    an index of rows by their id.
+
+    Rows are indexed when they are inserted or changed. The index
+    stores Gtk.TreeRowReference objects, hence it stays valid when
+    rows are removed or the store is sorted. GTK+ updates every
+    reference whenever a row is inserted or removed, therefore
+    L{remove_ids} rebuilds a list store when many rows are removed.
+    By default, the id is the value of C{id_column}. Subclasses
+    can override L{get_row_id} to use something else.
+    """
+
+    # Minimum number of rows removed at once that causes
+    # a list store to be rebuilt
+    REBUILD_THRESHOLD = 100
+
+    def __init__(self, id_column=None):
+        self._id_column = id_column
+        self._index = {}
+        self._handler_ids = [
+            self.connect("row-inserted", self._on_row_inserted_or_changed),
+            self.connect("row-changed", self._on_row_inserted_or_changed),
+        ]
+
+    def get_row_id(self, aiter):
+        """
+        @returns: The id of the row C{aiter} points to or
+        C{None} if the row shouldn't be indexed
+        """
+        return self.get_value(aiter, self._id_column)
+
+    def get_iter_for_id(self, row_id):
+        """
+        @returns: Iter pointing to the row with the
+        given id or C{None}
+        """
+        ref = self._index.get(row_id)
+        if ref == None:
+            return None
+        if not ref.valid():
+            del self._index[row_id]
+            return None
+        return self.get_iter(ref.get_path())
+
+    def remove_id(self, row_id):
+        """
+        Remove the row with the given id
+
+        @returns: Whether a row has been removed
+        """
+        aiter = self.get_iter_for_id(row_id)
+        if aiter == None:
+            return False
+        del self._index[row_id]
+        self.remove(aiter)
+        return True
+
+    def remove_ids(self, row_ids):
+        """
+        Remove the rows with the given ids
+
+        If at least C{REBUILD_THRESHOLD} rows are removed from a
+        list store, the remaining rows are inserted into the emptied
+        store and indexed at once afterwards. Removing them one by one
+        would update each reference of the index for every row.
+
+        @returns: Number of removed rows
+        """
+        row_ids = set(row_ids)
+        if len(row_ids) < self.REBUILD_THRESHOLD \
+                or not isinstance(self, Gtk.ListStore):
+            removed = 0
+            for row_id in row_ids:
+                if self.remove_id(row_id):
+                    removed += 1
+            return removed
+
+        n_columns = self.get_n_columns()
+        kept = []
+        for row in self:
+            if self.get_row_id(row.iter) not in row_ids:
+                kept.append([row[i] for i in range(n_columns)])
+        removed = len(self) - len(kept)
+        if removed == 0:
+            return 0
+
+        # References must be gone before the rows are removed
+        self._index.clear()
+        for handler_id in self._handler_ids:
+            self.handler_block(handler_id)
+        try:
+            super().clear()
+            for values in kept:
+                self.append(values)
+        finally:
+            for handler_id in self._handler_ids:
+                self.handler_unblock(handler_id)
+        self._reindex()
+        return removed
+
+    def clear(self):
+        self._index.clear()
+        super().clear()
+
+    def _reindex(self):
+        def add_row(model, path, aiter, user_data):
+            row_id = self.get_row_id(aiter)
+            if row_id != None:
+                self._index[row_id] = Gtk.TreeRowReference.new(self, path)
+            return False
+
+        self._index.clear()
+        self.foreach(add_row, None)
+
+    def _on_row_inserted_or_changed(self, model, path, aiter):
+        row_id = self.get_row_id(aiter)
+        if row_id == None:
+            return
+        ref = self._index.get(row_id)
+        if ref == None or not ref.valid() or ref.get_path() != path:
+            self._index[row_id] = Gtk.TreeRowReference.new(self, path)
+
+
+class IndexedListStore(IndexedStore, Gtk.ListStore):
+
+    def __init__(self, id_column, *column_types):
+        Gtk.ListStore.__init__(self, *column_types)
+        IndexedStore.__init__(self, id_column)
+
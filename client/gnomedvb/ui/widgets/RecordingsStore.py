@@ -17,12 +17,15 @@
 # along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
 
 import datetime
+from collections import OrderedDict
+from gi.repository import GLib
 from gi.repository import GObject
 from gi.repository import Gtk
 from gnomedvb import DVBRecordingsStoreClient, global_error_handler
+from gnomedvb.ui.widgets.IndexedStore import IndexedStore
 from cgi import escape
 
-class RecordingsStore(Gtk.ListStore):
+class RecordingsStore(IndexedStore, Gtk.ListStore):
 
     (COL_START,
     COL_CHANNEL,
@@ -31,11 +34,15 @@ class RecordingsStore(Gtk.ListStore):
     COL_LOCATION,
     COL_ID,) = list(range(6))
 
+    # Number of recordings appended per main loop iteration
+    FILL_CHUNK_SIZE = 250
+
     def __init__(self):
         Gtk.ListStore.__init__(self, GObject.TYPE_PYOBJECT, str, str, int, str, int)
+        IndexedStore.__init__(self, self.COL_ID)
 
         self._recstore = DVBRecordingsStoreClient()
-        self._recstore.connect("changed", self._on_changed)
+        self._recstore.connect("changed-bulk", self._on_changed_bulk)
 
         self._fill()
 
@@ -43,34 +50,57 @@ class RecordingsStore(Gtk.ListStore):
         return self._recstore
 
     def _append_recording(self, rec_id):
-        info, success = self._recstore.get_all_informations (rec_id)
+        def append(proxy, result, user_data):
+            info, success = result
+            if success and self.get_iter_for_id(rec_id) == None:
+                self.append(self._create_row(info))
+
+        self._recstore.get_all_informations(rec_id, result_handler=append,
+            error_handler=global_error_handler)
 
-        if success:
-            channame = info[5]
-            name = escape(info[1])
-            start = datetime.datetime.fromtimestamp(info[4])
-            duration = info[3]
-            location = info[6]
+    def _create_row(self, info):
+        rec_id = info[0]
+        channame = info[5]
+        name = escape(info[1])
+        start = datetime.datetime.fromtimestamp(info[4])
+        duration = info[3]
+        location = info[6]
 
-            self.append([start, channame, name, duration, location, rec_id])
+        return [start, channame, name, duration, location, rec_id]
 
     def _fill(self):
-        def append_rec(proxy, rids, user_data):
-            for rid in rids:
-                self._append_recording(rid)
-
-        self._recstore.get_recordings(result_handler=append_rec, error_handler=global_error_handler)
-
-    def _on_changed(self, recstore, rec_id, change_type):
-        if change_type == 0:
-            # Added
-            self._append_recording(rec_id)
-        elif change_type == 1:
-            # Deleted
-            for row in self:
-                if row[self.COL_ID] == rec_id:
-                    self.remove(row.iter)
-                    return
-        elif change_type == 2:
-            # Updated
-            pass
+        def append_chunk(infos):
+            # Append a limited number of rows per main loop
+            # iteration to keep the UI responsive
+            chunk = infos[:self.FILL_CHUNK_SIZE]
+            del infos[:self.FILL_CHUNK_SIZE]
+            for info in chunk:
+                # Might have been added by a change signal already
+                if self.get_iter_for_id(info[0]) == None:
+                    self.append(self._create_row(info))
+            return len(infos) > 0
+
+        def append_recs(proxy, infos, user_data):
+            GLib.idle_add(append_chunk, list(infos))
+
+        self._recstore.get_all_recording_infos(result_handler=append_recs, error_handler=global_error_handler)
+
+    def _on_changed_bulk(self, recstore, changes):
+        # Only the last change of each recording matters
+        last_changes = OrderedDict()
+        for rec_id, change_type in changes:
+            last_changes[rec_id] = change_type
+
+        deleted = []
+        for rec_id, change_type in last_changes.items():
+            if change_type == 0:
+                # Added
+                self._append_recording(rec_id)
+            elif change_type == 1:
+                # Deleted
+                deleted.append(rec_id)
+            elif change_type == 2:
+                # Updated
+                pass
+        # Remove all at once, a burst can delete thousands of recordings
+        self.remove_ids(deleted)
@@ -46,25 +46,33 @@ class RunningNextStore(Gtk.ListStore):
     def _fill(self):
         channellist = self._group.get_channel_list()
 
+        def add_events(proxy, infos, rows):
+            for (sid, running_id, running_name, running_start,
+                    next_id, next_name, next_start) in infos:
+                aiter = rows.get(sid)
+                if aiter == None or running_id == 0:
+                    continue
+
+                self.set_value(aiter, self.COL_RUNNING_START, running_start)
+                self.set_value(aiter, self.COL_RUNNING, escape(running_name))
+                self.set_value(aiter, self.COL_RUNNING_EVENT, running_id)
+                if next_id != 0:
+                    self.set_value(aiter, self.COL_NEXT_START, next_start)
+                    self.set_value(aiter, self.COL_NEXT, escape(next_name))
+                    self.set_value(aiter, self.COL_NEXT_EVENT, next_id)
+
         def add_channels(proxy, channels, user_data):
+            rows = {}
             for sid, name, is_radio, url in channels:
                 aiter = self.append()
                 self.set_value(aiter, self.COL_CHANNEL, name)
                 self.set_value(aiter, self.COL_SID, sid)
+                rows[sid] = aiter
 
-                sched = self._group.get_schedule(sid)
-                now = sched.now_playing()
-                if now != 0:
-                    next_id, name, duration, short_desc = sched.get_informations(now)[0][1:]
-
-                    self.set_value(aiter, self.COL_RUNNING_START, sched.get_local_start_timestamp(now)[0])
-                    self.set_value(aiter, self.COL_RUNNING, escape(name))
-                    self.set_value(aiter, self.COL_RUNNING_EVENT, now)
-                    if next_id != 0:
-                        name, duration, short_desc = sched.get_informations(next_id)[0][2:]
-                        self.set_value(aiter, self.COL_NEXT_START, sched.get_local_start_timestamp(next_id)[0])
-                        self.set_value(aiter, self.COL_NEXT, escape(name))
-                        self.set_value(aiter, self.COL_NEXT_EVENT, next_id)
+            # Retrieve running and next event of all channels at once
+            self._group.get_informations_bulk(list(rows.keys()),
+                result_handler=add_events, user_data=rows,
+                error_handler=global_error_handler)
 
         channellist.get_channel_infos(result_handler=add_channels,
             error_handler=global_error_handler)
@@ -22,6 +22,7 @@ from gi.repository import Gdk
 from gi.repository import Gtk
 from gnomedvb import _
 from gnomedvb import global_error_handler
+from gnomedvb.DescriptionCache import get_description_cache
 from gnomedvb.ui.widgets.RunningNextStore import RunningNextStore
 from gnomedvb.ui.widgets.DetailsDialog import DetailsDialog
 from gnomedvb.ui.timers.MessageDialogs import TimerFailureDialog, TimerSuccessDialog
@@ -83,27 +84,29 @@ class RunningNextView(Gtk.TreeView):
                 return
             event_id, next_id, name, duration, desc = data
 
-            ext_desc, success = schedule.get_extended_description(event_id)
-            if success:
-                if len(desc) == 0:
-                    desc = ext_desc
-                else:
-                    desc += "\n%s" % ext_desc
-
             dialog = DetailsDialog(self.get_toplevel())
             dialog.set_description(desc)
             dialog.set_title(name)
             dialog.set_duration(duration)
             dialog.set_channel(model[aiter][RunningNextStore.COL_CHANNEL])
-            start, success = schedule.get_local_start_timestamp(event_id)
-            if success:
-                dialog.set_date(start)
+            dialog.set_date(start)
+            get_description_cache().get(schedule, event_id, start,
+                show_extended_description, dialog, desc)
             dialog.get_record_button().connect("clicked",
                 self._on_record_clicked,
                 (devgroup.get_recorder(), event_id, sid,))
             dialog.show()
             dialog.connect("response", lambda d, resp: d.destroy())
 
+        def show_extended_description(ext_desc, dialog, desc):
+            if len(ext_desc) == 0:
+                return
+            if len(desc) == 0:
+                desc = ext_desc
+            else:
+                desc += "\n%s" % ext_desc
+            dialog.set_description(desc)
+
         if event.type == getattr(Gdk.EventType, "2BUTTON_PRESS"):
             model, aiter = treeview.get_selection().get_selected()
             if aiter != None:
@@ -112,8 +115,10 @@ class RunningNextView(Gtk.TreeView):
                     col = pos[1]
                     if col.index == RunningNextStore.COL_RUNNING:
                         event_id = model[aiter][RunningNextStore.COL_RUNNING_EVENT]
+                        start = model[aiter][RunningNextStore.COL_RUNNING_START]
                     elif col.index == RunningNextStore.COL_NEXT:
                         event_id = model[aiter][RunningNextStore.COL_NEXT_EVENT]
+                        start = model[aiter][RunningNextStore.COL_NEXT_START]
                     else:
                         return
 
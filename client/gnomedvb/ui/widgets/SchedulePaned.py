@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU General Public License
 # along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
 
+from gi.repository import GLib
 from gi.repository import GObject
 from gi.repository import Gtk
 from gnomedvb.ui.widgets.ScheduleStore import ScheduleStore
@@ -23,8 +24,13 @@ from gnomedvb.ui.widgets.ScheduleView import ScheduleView
 
 class SchedulePaned (Gtk.Paned):
 
+    # Milliseconds to wait after scrolling before the extended
+    # descriptions of the visible events are retrieved
+    PREFETCH_DELAY = 250
+
     def __init__(self):
         GObject.GObject.__init__(self, orientation=Gtk.Orientation.VERTICAL)
+        self._prefetch_source = 0
 
         self.scheduleview = ScheduleView()
         self.scheduleview.show()
@@ -36,6 +42,9 @@ class SchedulePaned (Gtk.Paned):
         self.scrolledschedule.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         self.scrolledschedule.set_shadow_type(Gtk.ShadowType.IN)
         self.scrolledschedule.show()
+        self.scrolledschedule.get_vadjustment().connect("value-changed",
+            self._on_schedule_scrolled)
+        self.connect("destroy", self._on_destroy)
 
         self.pack1(self.scrolledschedule, True)
 
@@ -70,16 +79,46 @@ class SchedulePaned (Gtk.Paned):
                 if description != None and len(description) > 0:
                     description += "\n\n"
 
-                # Check if row is the selected row
-                ext_desc = model[aiter][ScheduleStore.COL_EXTENDED_DESC]
-                if ext_desc == None:
-                    ext_desc = model.get_extended_description(aiter)
-                    model[aiter][ScheduleStore.COL_EXTENDED_DESC] = ext_desc
-                description += ext_desc
-
                 textbuffer = self.textview.get_buffer()
                 textbuffer.set_text(description)
+                # Don't wait for the extended description
+                model.get_extended_description(aiter,
+                    self._on_extended_description, model, event_id,
+                    description)
+                model.prefetch_extended_descriptions(aiter)
                 self.scrolledtextview.show()
         else:
             self.scrolledtextview.hide()
 
+    def _on_schedule_scrolled(self, adjustment):
+        # Wait until scrolling stopped and rows have been retrieved
+        if self._prefetch_source != 0:
+            GLib.source_remove(self._prefetch_source)
+        self._prefetch_source = GLib.timeout_add(self.PREFETCH_DELAY,
+            self._prefetch_visible)
+
+    def _prefetch_visible(self):
+        self._prefetch_source = 0
+        model = self.scheduleview.get_model()
+        visible_range = self.scheduleview.get_visible_range()
+        if model != None and visible_range != None:
+            first, last = visible_range
+            model.prefetch_rows(first.get_indices()[0],
+                last.get_indices()[0])
+        return False
+
+    def _on_destroy(self, widget):
+        if self._prefetch_source != 0:
+            GLib.source_remove(self._prefetch_source)
+            self._prefetch_source = 0
+
+    def _on_extended_description(self, ext_desc, model, event_id, description):
+        # Check if row is still the selected row
+        selected_model, aiter = self.scheduleview.get_selection().get_selected()
+        if selected_model != model or aiter == None \
+                or model[aiter][ScheduleStore.COL_EVENT_ID] != event_id:
+            return
+
+        textbuffer = self.textview.get_buffer()
+        textbuffer.set_text(description + ext_desc)
+
@@ -18,11 +18,23 @@
 
 from gi.repository import Gtk
 from gi.repository import GObject
+import bisect
 import datetime
+from collections import OrderedDict
 from cgi import escape
 from gnomedvb import global_error_handler
+from gnomedvb.DescriptionCache import get_description_cache
 
-class ScheduleStore(Gtk.ListStore):
+class ScheduleStore(GObject.GObject, Gtk.TreeModel):
+    """
+    Read-only list model of a channel's schedule.
+
+    Only the start times of all events are retrieved when the
+    schedule is loaded. They are used to build an index of the
+    rows that mark a new day. The details of events are retrieved
+    in pages as soon as rows become visible and only the
+    C{MAX_PAGES} most recently used pages are kept in memory.
+    """
 
     (COL_DATETIME,
      COL_FORMAT,
@@ -35,45 +47,79 @@ class ScheduleStore(Gtk.ListStore):
 
     NEW_DAY = -1
 
+    # Number of events retrieved at once
+    PAGE_SIZE = 50
+    # Maximum number of pages kept in memory
+    MAX_PAGES = 20
+    # Number of events before and after the selected one
+    # whose extended description is retrieved in advance
+    PREFETCH_EVENTS = 5
+
+    COLUMN_TYPES = (GObject.TYPE_PYOBJECT, GObject.TYPE_STRING,
+        GObject.TYPE_INT, GObject.TYPE_STRING, GObject.TYPE_STRING,
+        GObject.TYPE_STRING, GObject.TYPE_INT, GObject.TYPE_INT)
+
     __gsignals__ = {
         "loading-finished":  (GObject.SIGNAL_RUN_LAST, GObject.TYPE_NONE, []),
     }
 
     def __init__(self, dev_group, sid):
-        Gtk.ListStore.__init__(self, GObject.TYPE_PYOBJECT, str, int, str, str, str, int, int)
+        GObject.GObject.__init__(self)
+        self._stamp = 0
+        # Local start timestamp of each event
+        self._starts = []
+        # Index of the first event of each day
+        self._day_events = []
+        # Row of the bogus entry marking the start of each day
+        self._day_rows = []
+        # Page number -> list of rows, least recently used first
+        self._pages = OrderedDict()
+        self._pending_pages = set()
+        self._descriptions = get_description_cache()
         self._client = dev_group.get_schedule(sid)
         if self._client != None:
-            self._recorder = dev_group.get_recorder()
             self._fill_all()
 
     def reload_all(self):
-        self.clear()
+        self._clear()
         self._fill_all()
 
-    def _fill_from_now(self):
-        current = self._client.now_playing()
-
-        while current != 0:
-            self._append_event(current)
-            current = self._client.next(current)
+    def _clear(self):
+        # Remove rows from the end, the remaining rows have to
+        # stay valid while views handle each deletion
+        for row in reversed(range(self.do_iter_n_children(None))):
+            if self._day_rows[-1] == row:
+                self._day_rows.pop()
+                self._day_events.pop()
+            else:
+                self._starts.pop()
+            self.row_deleted(Gtk.TreePath(row))
+        # Iters and pending pages of the old schedule become invalid
+        self._stamp += 1
+        self._pages.clear()
+        self._pending_pages.clear()
 
     def _fill_all(self):
-        def append_event(proxy, events, user_data):
-            prev_date = (0,0,0,)
-            for event in events:
-                new_iter = self._append_event(event)
-                new_date = self.get_date(new_iter)
+        def set_start_timestamps(proxy, starts, user_data):
+            if user_data != self._stamp:
+                return
+            self._starts = list(starts)
+            prev_date = None
+            for i, start in enumerate(self._starts):
+                new_date = datetime.date.fromtimestamp(start)
                 # Insert bogus entry to mark that a new day starts
-                if prev_date < new_date:
-                    date_iter = self.insert_before(new_iter, None)
-                    self.set_value(date_iter, self.COL_DATETIME, datetime.datetime(*new_date))
-                    # We don't want to display any datetime
-                    self.set_value(date_iter, self.COL_FORMAT, "")
-                    self.set_value(date_iter, self.COL_EVENT_ID, self.NEW_DAY)
+                if new_date != prev_date:
+                    self._day_rows.append(i + len(self._day_events))
+                    self._day_events.append(i)
                 prev_date = new_date
+
+            for row in range(self.do_iter_n_children(None)):
+                path = Gtk.TreePath(row)
+                self.row_inserted(path, self._create_iter(row))
             self.emit("loading-finished")
 
-        self._client.get_all_event_infos(result_handler=append_event, error_handler=global_error_handler)
+        self._client.get_local_start_timestamps(result_handler=set_start_timestamps,
+            user_data=self._stamp, error_handler=global_error_handler)
 
     def get_date(self, aiter):
         dt = self[aiter][self.COL_DATETIME]
@@ -83,27 +129,143 @@ class ScheduleStore(Gtk.ListStore):
         dt = self[aiter][self.COL_DATETIME]
         return (dt.hour, dt.minute,)
 
-    def _append_event(self, event):
-        event_id, next_id, name, duration, short_desc = event
+    def _create_row(self, event):
+        event_id, next_id, name, duration, short_desc, start, rec = event
         name = escape(name)
         short_desc = escape(short_desc)
 
-        start_arr = self._client.get_local_start_time(event_id)[0]
-
-        rec = self._recorder.has_timer_for_event(event_id,
-            self._client.get_channel_sid())
-
         # %X -> display locale's time representation
-        return self.append([datetime.datetime(*start_arr), "%X",
+        return [datetime.datetime.fromtimestamp(start), "%X",
             duration, name, short_desc, None,
-            rec, event_id])
+            rec, event_id]
+
+    def _create_iter(self, row):
+        aiter = Gtk.TreeIter()
+        aiter.stamp = self._stamp
+        # 0 can't be used because it would be a NULL pointer
+        aiter.user_data = row + 1
+        return aiter
+
+    def _get_row(self, aiter):
+        return aiter.user_data - 1
+
+    def _get_day(self, row):
+        """Get the index of the day the given row belongs to"""
+        return bisect.bisect_right(self._day_rows, row) - 1
+
+    def _get_event_index(self, row):
+        """
+        Get the index of the event the given row displays
+        or C{None} if the row marks a new day
+        """
+        day = self._get_day(row)
+        if self._day_rows[day] == row:
+            return None
+        return row - day - 1
+
+    def _get_event_row(self, index):
+        """Get the row that displays the event with the given index"""
+        day = bisect.bisect_right(self._day_events, index) - 1
+        return index + day + 1
+
+    def _get_event_data(self, index):
+        """
+        Get the cached data of the event with the given index or
+        C{None} if its page has to be retrieved first
+        """
+        page = index // self.PAGE_SIZE
+        rows = self._pages.get(page)
+        if rows == None:
+            self._request_page(page)
+            return None
+        self._pages.move_to_end(page)
+        return rows[index % self.PAGE_SIZE]
+
+    def _request_page(self, page):
+        if page in self._pending_pages:
+            return
+        self._pending_pages.add(page)
+
+        first = page * self.PAGE_SIZE
+        last = min(first + self.PAGE_SIZE, len(self._starts)) - 1
+
+        def on_events(proxy, events, stamp):
+            if stamp != self._stamp:
+                return
+            self._pending_pages.discard(page)
+            rows = [None] * (last - first + 1)
+            for event in events:
+                # The first event might have started before the
+                # requested range and events can start at the same time
+                index = bisect.bisect_left(self._starts, event[5],
+                    first, last + 1)
+                while index <= last and rows[index - first] != None:
+                    index += 1
+                if index <= last and self._starts[index] == event[5]:
+                    rows[index - first] = self._create_row(event)
+
+            self._pages[page] = rows
+            while len(self._pages) > self.MAX_PAGES:
+                self._pages.popitem(last=False)
+
+            for index in range(first, last + 1):
+                row = self._get_event_row(index)
+                self.row_changed(Gtk.TreePath(row), self._create_iter(row))
+
+        def on_error(proxy, error, stamp):
+            if stamp == self._stamp:
+                self._pending_pages.discard(page)
+            global_error_handler(proxy, error, stamp)
+
+        self._client.get_events_in_range(self._starts[first],
+            self._starts[last] + 1, result_handler=on_events,
+            error_handler=on_error, user_data=self._stamp)
 
-    def get_extended_description(self, aiter):
-        if aiter != None:
-            event_id = self[aiter][self.COL_EVENT_ID]
-            ext_desc = self._client.get_extended_description(event_id)[0]
-            self[aiter][self.COL_EXTENDED_DESC] = ext_desc
-        return ext_desc
+    def get_extended_description(self, aiter, callback, *args):
+        """
+        Call C{callback(description, *args)} as soon as the extended
+        description of the event C{aiter} points to is available.
+        Nothing happens if the event hasn't been retrieved yet.
+        """
+        index = self._get_event_index(self._get_row(aiter))
+        if index == None:
+            return
+        data = self._get_event_data(index)
+        if data != None:
+            self._descriptions.get(self._client, data[self.COL_EVENT_ID],
+                self._starts[index], callback, *args)
+
+    def prefetch_extended_descriptions(self, aiter):
+        """
+        Retrieve the extended descriptions of the events
+        surrounding the row C{aiter} points to in the background
+        """
+        row = self._get_row(aiter)
+        index = row - self._get_day(row) - 1
+        self._prefetch_events(index - self.PREFETCH_EVENTS,
+            index + self.PREFETCH_EVENTS)
+
+    def prefetch_rows(self, first_row, last_row):
+        """
+        Retrieve the extended descriptions of the events displayed
+        in the rows C{first_row} to C{last_row} in the background
+        """
+        self._prefetch_events(first_row - self._get_day(first_row) - 1,
+            last_row - self._get_day(last_row) - 1)
+
+    def _prefetch_events(self, first, last):
+        first = max(0, first)
+        last = min(len(self._starts) - 1, last)
+        events = []
+        for i in range(first, last + 1):
+            # Don't retrieve pages just for prefetching
+            rows = self._pages.get(i // self.PAGE_SIZE)
+            if rows == None:
+                continue
+            data = rows[i % self.PAGE_SIZE]
+            if data != None:
+                events.append((data[self.COL_EVENT_ID], self._starts[i]))
+        self._descriptions.prefetch(self._client, events)
 
     def get_next_day_iter(self, aiter):
         """
@@ -113,20 +275,19 @@ class ScheduleStore(Gtk.ListStore):
         as reference. C{None} is returned if there's
         no next day.
         """
+        if len(self._day_rows) == 0:
+            return None
         if aiter == None:
-            aiter = self.get_iter_first ()
+            row = 0
+        else:
+            row = self._get_row(aiter)
 
         # If the selected row marks a new day
         # we still want the following day
-        aiter = self.iter_next (aiter)
-
-        while (aiter != None):
-            row = self[aiter]
-            if row[self.COL_EVENT_ID] == self.NEW_DAY:
-                return row.iter
-            aiter = self.iter_next (aiter)
-
-        return None
+        day = self._get_day(row) + 1
+        if day == len(self._day_rows):
+            return None
+        return self._create_iter(self._day_rows[day])
 
     def get_previous_day_iter(self, aiter):
         """
@@ -138,22 +299,81 @@ class ScheduleStore(Gtk.ListStore):
         if aiter == None:
             return None
 
-        path0 = self.get_path(aiter)
+        day = self._get_day(self._get_row(aiter)) - 1
+        if day < 0:
+            return None
+        return self._create_iter(self._day_rows[day])
+
+    def do_get_flags(self):
+        return Gtk.TreeModelFlags.LIST_ONLY
 
-        # If the selected row marks a new day
-        # we still want the previous day
-        # therefore we have to come across 2 new days
-        day_seen = 0
-
-        root = Gtk.TreePath("0")
-        while path0 != root:
-            aiter = self.get_iter(path0)
-            row = self[aiter]
-            if row[self.COL_EVENT_ID] == self.NEW_DAY:
-                day_seen += 1
-                if day_seen == 2:
-                    return row.iter
-            path0.prev()
-
-        return None
+    def do_get_n_columns(self):
+        return len(self.COLUMN_TYPES)
+
+    def do_get_column_type(self, index):
+        return self.COLUMN_TYPES[index]
+
+    def do_get_iter(self, path):
+        row = path.get_indices()[0]
+        if row < self.do_iter_n_children(None):
+            return (True, self._create_iter(row))
+        return (False, None)
+
+    def do_get_path(self, aiter):
+        return Gtk.TreePath(self._get_row(aiter))
+
+    def do_get_value(self, aiter, column):
+        row = self._get_row(aiter)
+        index = self._get_event_index(row)
+        if index == None:
+            start = datetime.date.fromtimestamp(
+                self._starts[self._day_events[self._get_day(row)]])
+            # We don't want to display any datetime
+            data = [datetime.datetime(start.year, start.month, start.day),
+                "", 0, None, None, None, 0, self.NEW_DAY]
+        else:
+            data = self._get_event_data(index)
+            if data == None:
+                # Placeholder until the page has been retrieved
+                data = [datetime.datetime.fromtimestamp(self._starts[index]),
+                    "%X", 0, "", "", None, 0, 0]
+            elif column == self.COL_EXTENDED_DESC:
+                return self._descriptions.lookup(self._client,
+                    data[self.COL_EVENT_ID], self._starts[index])
+        return data[column]
+
+    def do_iter_next(self, aiter):
+        row = self._get_row(aiter) + 1
+        if row < self.do_iter_n_children(None):
+            aiter.user_data = row + 1
+            return True
+        return False
+
+    def do_iter_previous(self, aiter):
+        row = self._get_row(aiter) - 1
+        if row >= 0:
+            aiter.user_data = row + 1
+            return True
+        return False
+
+    def do_iter_children(self, parent):
+        if parent == None and self.do_iter_n_children(None) > 0:
+            return (True, self._create_iter(0))
+        return (False, None)
+
+    def do_iter_has_child(self, aiter):
+        return False
+
+    def do_iter_n_children(self, aiter):
+        if aiter == None:
+            return len(self._starts) + len(self._day_rows)
+        return 0
+
+    def do_iter_nth_child(self, parent, n):
+        if parent == None and n < self.do_iter_n_children(None):
+            return (True, self._create_iter(n))
+        return (False, None)
+
+    def do_iter_parent(self, child):
+        return (False, None)
 
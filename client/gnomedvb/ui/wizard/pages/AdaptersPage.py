@@ -21,14 +21,9 @@ from gi.repository import GObject
 import gnomedvb
 from gi.repository import Gtk
 from gnomedvb import _
-from gnomedvb.Device import Device
-from gnomedvb import GROUP_TERRESTRIAL
-from gnomedvb import GROUP_SATELLITE
-from gnomedvb import GROUP_CABLE
 from gnomedvb.ui.wizard import DVB_TYPE_TO_DESC
 from gnomedvb.ui.wizard.pages.BasePage import BasePage
 from gnomedvb.ui.widgets.Frame import BaseFrame
-import copy
 
 class AdaptersPage(BasePage):
 
@@ -167,53 +162,16 @@ class AdaptersPage(BasePage):
         Retrieves registered and unregistered devices
         and sets the contents of the page
         """
-        def registered_handler(devgroups):
-            for group in devgroups:
-                for dev in group["devices"]:
+        def inventory_handler(registered, unregistered):
+            for dev in registered:
+                dev.type_name = DVB_TYPE_TO_DESC[dev.type]
+                dev.registered = True
+            for dev in unregistered:
+                if dev.type in DVB_TYPE_TO_DESC:
                     dev.type_name = DVB_TYPE_TO_DESC[dev.type]
-                    dev.registered = True
-                    registered.add(dev)
-            self.__model.get_all_devices(result_handler=devices_handler)
-
-        def devices_handler(devices):
-            error = None
-            for dev in devices:
-                if dev not in registered:
-                    success, info = gnomedvb.get_adapter_info(dev.adapter,
-                        dev.frontend)
-                    if success:
-                        if info["type_t"]:
-                            dev_t = copy.copy(dev)
-                            dev_t.name = info["name"]
-                            dev_t.type = GROUP_TERRESTRIAL
-                            if dev_t.type in DVB_TYPE_TO_DESC:
-                                dev_t.type_name = DVB_TYPE_TO_DESC[dev_t.type]
-                            else:
-                                dev_t.type_name = "Unknown"
-                            dev_t.registered = False
-                            unregistered.add(dev_t)
-                        if info["type_s"]:
-                            dev_s = copy.copy(dev)
-                            dev_s.name = info["name"]
-                            dev_s.type = GROUP_SATELLITE
-                            if dev_s.type in DVB_TYPE_TO_DESC:
-                                dev_s.type_name = DVB_TYPE_TO_DESC[dev_s.type]
-                            else:
-                                dev_s.type_name = "Unknown"
-                            dev_s.registered = False
-                            unregistered.add(dev_s)
-                        if info["type_c"]:
-                            dev_c = copy.copy(dev)
-                            dev_c.name = info["name"]
-                            dev_c.type = GROUP_CABLE
-                            if dev_c.type in DVB_TYPE_TO_DESC:
-                                dev_c.type_name = DVB_TYPE_TO_DESC[dev_c.type]
-                            else:
-                                dev_c.type_name = "Unknown"
-                            dev_c.registered = False
-                            unregistered.add(dev_c)
-                    else:
-                        error = info
+                else:
+                    dev.type_name = "Unknown"
+                dev.registered = False
 
             all_devs = registered | unregistered
             has_device = len(all_devs) > 0
@@ -229,9 +187,7 @@ class AdaptersPage(BasePage):
 
             self.destroy_progressbar()
 
-            if error != None:
-                self.show_error(error)
-            elif len(devs) == 0:
+            if len(devs) == 0:
                 if not has_device:
                     self.show_no_devices()
                 else:
@@ -239,12 +195,15 @@ class AdaptersPage(BasePage):
             else:
                 self.show_devices()
 
-        registered = set()
-        unregistered = set()
+        def error_handler(proxy, error, user_data):
+            self.destroy_progressbar()
+            self.show_error(error)
+
         self.__adapter_info = None
         self.show_progressbar()
 
-        self.__model.get_registered_device_groups(result_handler=registered_handler)
+        self.__model.get_device_inventory(result_handler=inventory_handler,
+            error_handler=error_handler)
 
     def on_device_selection_changed(self, treeselection):
         model, aiter = treeselection.get_selected()
@@ -30,7 +30,7 @@ namespace DVB {
                 this.sid = value;
                 if (this.has_schedule) {
                     this.schedule = new DVB.Schedule (this);
-                    this.schedule.restore.begin ();
+                    DVB.Schedule.restore_in_background (this.schedule);
                 }
             }
         }
@@ -554,7 +554,8 @@ namespace DVB {
          * Watch @channel and use @sink_element as sink element
          */
         public PlayerThread? watch_channel (Channel channel, owned Gst.Element sink_element,
-                bool force=false, ForcedStopNotify? notify_func = null) {
+                bool force=false, ForcedStopNotify? notify_func = null,
+                DVB.Device? preferred_device = null) {
             log.debug ("Watching channel %s (%u)", channel.Name, channel.Sid);
 
             bool create_new = true;
@@ -574,10 +575,20 @@ namespace DVB {
 
             log.debug ("Creating new PlayerThread: %s", create_new.to_string ());
             if (create_new) {
-                // Stop epgscanner before starting recording
-                this.device_group.stop_epg_scanner ();
-
-                free_device = this.device_group.get_next_free_device ();
+                if (preferred_device != null && !preferred_device.is_busy ())
+                    free_device = preferred_device;
+                else
+                    free_device = this.device_group.get_next_free_device ();
+                // Take a device away from the EPG scanner,
+                // preferably the requested one
+                if (free_device == null && preferred_device != null
+                        && this.device_group.release_epg_device (preferred_device)
+                        && !preferred_device.is_busy ())
+                    free_device = preferred_device;
+                while (free_device == null
+                        && this.device_group.release_epg_device ()) {
+                    free_device = this.device_group.get_next_free_device ();
+                }
                 if (free_device == null && force) {
                     // Stop first player
                     lock (this.active_players) {
@@ -627,12 +638,10 @@ namespace DVB {
                     }
                 }
 
-                if (success && player.active_channels.size == 0)
+                if (success && player.active_channels.size == 0) {
                     this.active_players.remove (player);
-
-                if (this.active_players.size == 0) {
-                    // Start EPG scanner again
-                    this.device_group.start_epg_scanner ();
+                    // Give device back to EPG scanner
+                    this.device_group.resume_epg_scanner ();
                 }
             }
 
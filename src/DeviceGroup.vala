@@ -115,6 +115,26 @@ namespace DVB {
                 this._epgscanner.stop ();
         }
 
+        /**
+         * Let the EPG scanner use devices that became free again
+         */
+        public void resume_epg_scanner () {
+            if (this._epgscanner != null)
+                this._epgscanner.resume ();
+        }
+
+        /**
+         * @device: The device to release or NULL to release any of them
+         * @returns: TRUE if the EPG scanner released a device
+         *
+         * Make the EPG scanner release one of its devices
+         */
+        public bool release_epg_device (Device? device = null) {
+            if (this._epgscanner != null)
+                return this._epgscanner.release_device (device);
+            return false;
+        }
+
         /**
          * Add device to group. The device's settings will be overridden
          * with those of the reference device.
@@ -182,6 +202,21 @@ namespace DVB {
             return result;
         }
 
+        /**
+         * @returns: All devices that aren't busy
+         */
+        public Gee.List<Device> get_free_devices () {
+            var result = new ArrayList<Device> ();
+            lock (this.devices) {
+                foreach (Device dev in this.devices) {
+                    if (!dev.is_busy ())
+                        result.add (dev);
+                }
+            }
+
+            return result;
+        }
+
         /**
          * @returns: Name of adapter type the group holds
          * or an empty string when group with given id doesn't exist.
@@ -252,7 +287,7 @@ namespace DVB {
             Recorder recorder = this.recorder;
 
             string path = Constants.DBUS_RECORDER_PATH.printf (this.Id);
-            Utils.dbus_register_object<IDBusRecorder> (Main.conn,
+            Utils.dbus_register_object<IDBusRecorder> (Manager.conn,
                 path, recorder);
 
             return true;
@@ -339,7 +374,7 @@ namespace DVB {
             ChannelList channels = this.Channels;
 
             string path = Constants.DBUS_CHANNEL_LIST_PATH.printf (this.Id);
-            Utils.dbus_register_object<IDBusChannelList> (Main.conn,
+            Utils.dbus_register_object<IDBusChannelList> (Manager.conn,
                 path, channels);
 
             return true;
@@ -376,7 +411,7 @@ namespace DVB {
                     Schedule schedule = this.Channels.get_channel (
                         channel_sid).Schedule;
 
-                    Utils.dbus_register_object<IDBusSchedule> (Main.conn,
+                    Utils.dbus_register_object<IDBusSchedule> (Manager.conn,
                         path, schedule);
 
                     this.schedules.add (path);
@@ -390,6 +425,29 @@ namespace DVB {
             return false;
         }
 
+        /**
+         * @channel_sids: IDs of channels
+         * @returns: The currently running and the next event of each
+         * given channel. The ID of the event is 0 if there's none.
+         */
+        public RunningNextInfo[] GetInformationsBulk (uint32[] channel_sids)
+                throws DBusError
+        {
+            RunningNextInfo[] infos = new RunningNextInfo[channel_sids.length];
+            for (int i=0; i<channel_sids.length; i++) {
+                Channel? channel = this.Channels.get_channel (channel_sids[i]);
+                if (channel == null || channel.Schedule == null) {
+                    infos[i] = RunningNextInfo ();
+                    infos[i].channel_sid = channel_sids[i];
+                    infos[i].running_name = "";
+                    infos[i].next_name = "";
+                } else {
+                    infos[i] = channel.Schedule.get_running_next_info ();
+                }
+            }
+            return infos;
+        }
+
         /**
          * @returns: Location of the recordings directory
          */
@@ -0,0 +1,286 @@
+/*
+ * Copyright (C) 2011 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+using GstMpegts;
+
+namespace DVB {
+
+    /**
+     * Keeps track of the sections of EIT subtables received while
+     * tuned to a transponder.
+     *
+     * A subtable is identified by table_id, service_id,
+     * transport_stream_id and original_network_id. It is complete if
+     * all sections of all segments up to last_section_number have been
+     * received. The versions of complete subtables are remembered once
+     * their events have been stored, so sections of unchanged subtables
+     * don't have to be decoded again.
+     */
+    public class EITSectionTracker : GLib.Object {
+
+        private const uint8 TABLE_ID_PRESENT_FOLLOWING_ACTUAL = 0x4E;
+        private const uint8 TABLE_ID_SCHEDULE_ACTUAL_FIRST = 0x50;
+        private const uint8 TABLE_ID_SCHEDULE_ACTUAL_LAST = 0x5F;
+        private const uint SECTIONS_PER_SEGMENT = 8;
+
+        /**
+         * Versions of subtables whose events have been stored,
+         * may be shared by several trackers
+         */
+        public class Versions : GLib.Object {
+            private HashMap<string, uint> versions;
+
+            construct {
+                this.versions = new HashMap<string, uint> ();
+            }
+
+            public bool contains (string key, uint version) {
+                lock (this.versions) {
+                    return (this.versions.has_key (key)
+                        && this.versions.get (key) == version);
+                }
+            }
+
+            public void set (string key, uint version) {
+                lock (this.versions) {
+                    this.versions.set (key, version);
+                }
+            }
+        }
+
+        private class SubTable {
+            public uint8 version;
+            public uint last_section_number;
+            // last section number of each segment, -1 if unknown
+            public int[] segment_last_section_number;
+            public bool[] received;
+
+            public SubTable (uint8 version, uint last_section_number) {
+                this.version = version;
+                this.last_section_number = last_section_number;
+                uint segments = last_section_number / SECTIONS_PER_SEGMENT + 1;
+                this.segment_last_section_number = new int[segments];
+                for (uint i = 0; i < segments; i++)
+                    this.segment_last_section_number[i] = -1;
+                this.received = new bool[last_section_number + 1];
+            }
+
+            public void add (uint section_number, uint segment_last) {
+                if (section_number > this.last_section_number)
+                    return;
+                uint segment = section_number / SECTIONS_PER_SEGMENT;
+                uint first = segment * SECTIONS_PER_SEGMENT;
+                // Guard against bogus values
+                segment_last = uint.max (segment_last, section_number);
+                segment_last = uint.min (segment_last,
+                    uint.min (first + SECTIONS_PER_SEGMENT - 1,
+                        this.last_section_number));
+
+                this.segment_last_section_number[segment] = (int)segment_last;
+                this.received[section_number] = true;
+            }
+
+            public bool is_complete () {
+                for (uint segment = 0;
+                        segment < this.segment_last_section_number.length;
+                        segment++) {
+                    int segment_last = this.segment_last_section_number[segment];
+                    if (segment_last < 0)
+                        return false;
+                    for (uint i = segment * SECTIONS_PER_SEGMENT;
+                            i <= segment_last; i++) {
+                        if (!this.received[i])
+                            return false;
+                    }
+                }
+                return true;
+            }
+        }
+
+        private class Service {
+            public string stream_key;
+            // last table_id of EIT schedule actual, 0 if unknown
+            public uint last_table_id;
+            public bool has_present_following;
+        }
+
+        // versions of subtables whose events have been stored
+        private Versions committed;
+        // subtables with sections that have to be decoded
+        private HashMap<string, SubTable> current;
+        // subtables seen since begin ()
+        private HashSet<string> seen;
+        // services of the current transponder by service id
+        private HashMap<uint, Service> services;
+        private HashSet<uint> expected_sids;
+
+        construct {
+            this.current = new HashMap<string, SubTable> ();
+            this.seen = new HashSet<string> ();
+            this.services = new HashMap<uint, Service> ();
+            this.expected_sids = new HashSet<uint> ();
+        }
+
+        /**
+         * @committed: Versions of stored subtables, if it should be
+         * shared with other trackers
+         */
+        public EITSectionTracker (Versions? committed = null) {
+            this.committed = (committed == null) ? new Versions () : committed;
+        }
+
+        /**
+         * @sids: Service ids of channels on the transponder
+         *
+         * Start tracking sections of a new transponder
+         */
+        public void begin (Gee.Collection<uint> sids) {
+            this.current.clear ();
+            this.seen.clear ();
+            this.services.clear ();
+            this.expected_sids.clear ();
+            this.expected_sids.add_all (sids);
+        }
+
+        /**
+         * @returns: FALSE if the section belongs to a subtable that
+         * has already been stored with the same version
+         */
+        public bool add_section (Section section, EIT eit) {
+            uint sid = section.subtable_extension;
+            uint8 table_id = section.table_id;
+            string stream_key = "%u:%u".printf (eit.transport_stream_id,
+                eit.original_network_id);
+            string key = get_key (table_id, sid, stream_key);
+
+            this.seen.add (key);
+            if (is_actual (table_id)) {
+                Service? service = this.services.get (sid);
+                if (service == null) {
+                    service = new Service ();
+                    service.stream_key = stream_key;
+                    this.services.set (sid, service);
+                }
+                if (table_id == TABLE_ID_PRESENT_FOLLOWING_ACTUAL) {
+                    service.has_present_following = true;
+                } else {
+                    service.last_table_id = uint.min (eit.last_table_id,
+                        TABLE_ID_SCHEDULE_ACTUAL_LAST);
+                }
+            }
+
+            if (this.committed.contains (key, section.version_number)) {
+                return false;
+            }
+
+            SubTable? table = this.current.get (key);
+            if (table == null || table.version != section.version_number
+                    || table.last_section_number != section.last_section_number) {
+                table = new SubTable (section.version_number,
+                    section.last_section_number);
+                this.current.set (key, table);
+            }
+            table.add (section.section_number, eit.segment_last_section_number);
+            return true;
+        }
+
+        /**
+         * @all_services: Whether EIT of all channels of the
+         * transponder must have been received
+         * @returns: TRUE if all EIT actual subtables have been
+         * received completely
+         */
+        public bool is_complete (bool all_services) {
+            foreach (uint sid in this.expected_sids) {
+                Service? service = this.services.get (sid);
+                if (service == null) {
+                    if (all_services) return false;
+                    continue;
+                }
+
+                if (service.has_present_following
+                        && !this.is_table_complete (get_key (
+                            TABLE_ID_PRESENT_FOLLOWING_ACTUAL, sid,
+                            service.stream_key))) {
+                    return false;
+                }
+                if (service.last_table_id != 0) {
+                    for (uint table_id = TABLE_ID_SCHEDULE_ACTUAL_FIRST;
+                            table_id <= service.last_table_id; table_id++) {
+                        if (!this.is_table_complete (get_key (table_id, sid,
+                                service.stream_key))) {
+                            return false;
+                        }
+                    }
+                }
+            }
+            return true;
+        }
+
+        /**
+         * Remember the versions of all complete subtables.
+         * Must be called after their events have been stored.
+         * Incomplete subtables are kept, so sections received
+         * later can complete them.
+         */
+        public void commit () {
+            MapIterator<string, SubTable> iter = this.current.map_iterator ();
+            while (iter.next ()) {
+                SubTable table = iter.get_value ();
+                if (table.is_complete ()) {
+                    this.committed.set (iter.get_key (), table.version);
+                    iter.unset ();
+                }
+            }
+        }
+
+        /**
+         * Forget all sections received since the last commit
+         */
+        public void abort () {
+            this.current.clear ();
+            this.seen.clear ();
+            this.services.clear ();
+        }
+
+        private bool is_table_complete (string key) {
+            if (!this.seen.contains (key))
+                return false;
+            SubTable? table = this.current.get (key);
+            // Not decoded because it didn't change
+            if (table == null)
+                return true;
+            return table.is_complete ();
+        }
+
+        private static bool is_actual (uint8 table_id) {
+            return (table_id == TABLE_ID_PRESENT_FOLLOWING_ACTUAL
+                || (table_id >= TABLE_ID_SCHEDULE_ACTUAL_FIRST
+                    && table_id <= TABLE_ID_SCHEDULE_ACTUAL_LAST));
+        }
+
+        private static string get_key (uint table_id, uint sid,
+                string stream_key) {
+            return "%u:%u:%s".printf (table_id, sid, stream_key);
+        }
+    }
+
+}
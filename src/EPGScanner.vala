@@ -31,30 +31,221 @@ namespace DVB {
         // how long to wait after all channels have been scanned
         // before the next iteration is started
         private static int CHECK_EIT_INTERVAL = -1;
-        // how long to wait for EIT data for each channel in seconds
+        // minimum time to wait for EIT data of channels on a transponder
+        // before channels that didn't send any EIT are skipped in seconds
         private const int WAIT_FOR_EIT_DURATION = 10;
+        // maximum time to wait for EIT data on a transponder in seconds
+        private static int MAX_WAIT_FOR_EIT_DURATION = -1;
+        // how often to check whether all EIT data has been received
+        private const int CHECK_EIT_COMPLETE_INTERVAL = 1;
         // pids: 0=pat, 16=nit, 17=sdt, 18=eit
         private const string PIPELINE_TEMPLATE =
         "dvbsrc name=dvbsrc adapter=%u frontend=%u pids=0:16:17:18 stats-reporting-interval=0 ! tsparse ! fakesink silent=true";
 
+        /**
+         * Collects EIT data with a single device
+         */
+        private class Tuner : GLib.Object {
+            public unowned EPGScanner scanner;
+            // null if EIT is forwarded by somebody else
+            public DVB.Device? device;
+            // the channels of the transponder currently tuned to,
+            // protected by the lock of pipeline
+            private Gee.List<Channel>? transponder;
+            // monotonic time when the transponder has been tuned
+            public int64 tuned_time;
+            private Gst.Element? pipeline;
+            private uint bus_watch_id;
+            private EITSectionTracker eit_tracker;
+            private HashMap<uint, EventRecordList> channel_events;
+
+            public Tuner (EPGScanner scanner, DVB.Device? device,
+                    EITSectionTracker.Versions eit_versions) {
+                this.scanner = scanner;
+                this.device = device;
+                this.tuned_time = 0;
+                this.bus_watch_id = 0;
+                this.eit_tracker = new EITSectionTracker (eit_versions);
+                this.channel_events = new HashMap<uint, EventRecordList> ();
+            }
+
+            public bool setup_pipeline (MainContext context) {
+                lock (this.pipeline) {
+                    try {
+                        this.pipeline = Gst.parse_launch (PIPELINE_TEMPLATE.printf (
+                            this.device.Adapter, this.device.Frontend));
+                    } catch (Error e) {
+                        log.error ("Could not create pipeline: %s", e.message);
+                        return false;
+                    }
+
+                    Gst.Bus bus = this.pipeline.get_bus ();
+                    this.bus_watch_id = cUtils.gst_bus_add_watch_context (bus,
+                        this.bus_watch_func, context);
+                }
+                return true;
+            }
+
+            public void reset_pipeline (MainContext context) {
+                lock (this.pipeline) {
+                    if (this.pipeline != null) {
+                        Source bus_watch_source = context.find_source_by_id (
+                            this.bus_watch_id);
+                        if (bus_watch_source != null) {
+                            bus_watch_source.destroy ();
+                            this.bus_watch_id = 0;
+                        }
+                        this.pipeline.set_state (Gst.State.NULL);
+                        this.pipeline.get_state (null, null, -1);
+                        this.pipeline = null;
+                    }
+                }
+            }
+
+            /**
+             * Tune to the transponder of the channels in @transponder
+             *
+             * @returns: FALSE if the device has been released
+             */
+            public bool tune (Gee.List<Channel> transponder) {
+                var sids = new ArrayList<uint> ();
+                foreach (Channel c in transponder) {
+                    sids.add (c.Sid);
+                }
+                lock (this.channel_events) {
+                    this.eit_tracker.begin (sids);
+                }
+
+                lock (this.pipeline) {
+                    if (this.pipeline == null)
+                        return false;
+                    this.transponder = transponder;
+                    this.pipeline.set_state (Gst.State.READY);
+                    Gst.Element dvbsrc = ((Gst.Bin)this.pipeline).get_by_name ("dvbsrc");
+                    transponder.get (0).setup_dvb_source (dvbsrc);
+
+                    this.pipeline.set_state (Gst.State.PLAYING);
+                }
+                this.tuned_time = get_monotonic_time ();
+                return true;
+            }
+
+            /**
+             * Stop receiving data and close the device until tuned again
+             */
+            public void pause () {
+                lock (this.pipeline) {
+                    this.transponder = null;
+                    if (this.pipeline != null)
+                        this.pipeline.set_state (Gst.State.NULL);
+                }
+            }
+
+            public bool is_tuned () {
+                lock (this.pipeline) {
+                    return this.transponder != null;
+                }
+            }
+
+            /**
+             * Only one caller gets the transponder, either the one
+             * that finished scanning it or the one releasing the device
+             *
+             * @returns: The transponder tuned to or NULL
+             */
+            public Gee.List<Channel>? take_transponder () {
+                lock (this.pipeline) {
+                    Gee.List<Channel>? transponder = this.transponder;
+                    this.transponder = null;
+                    return transponder;
+                }
+            }
+
+            public bool is_complete (bool all_services) {
+                lock (this.channel_events) {
+                    return this.eit_tracker.is_complete (all_services);
+                }
+            }
+
+            public void add_section (Section section, EIT eit) {
+                lock (this.channel_events) {
+                    // Skip subtables that didn't change since they were stored
+                    if (!this.eit_tracker.add_section (section, eit))
+                        return;
+
+                    uint sid = section.subtable_extension;
+
+                    if (!this.channel_events.has_key (sid)) {
+                        this.channel_events.set (sid, new EventRecordList ());
+                    }
+                    decode_events (eit, this.channel_events.get (sid));
+                }
+            }
+
+            /**
+             * Add the collected events to the schedules of the channels
+             */
+            public void store_events (ChannelList? clist) {
+                lock (this.channel_events) {
+                    if (clist != null) {
+                        foreach (uint sid in this.channel_events.keys) {
+                            Channel channel = clist.get_channel (sid);
+                            if (channel == null) {
+                                warning ("Could not find channel %u for this device", sid);
+                                continue;
+                            }
+                            EventRecordList list = this.channel_events.get (sid);
+
+                            log.debug ("Adding %d events of channel %s (%u)",
+                                list.size, channel.Name, sid);
+                            channel.Schedule.add_all (list);
+                        }
+                    }
+                    this.channel_events.clear ();
+                    // Events have been stored, don't decode them again
+                    this.eit_tracker.commit ();
+                }
+            }
+
+            /**
+             * Discard collected events
+             */
+            public void clear () {
+                lock (this.channel_events) {
+                    this.channel_events.clear ();
+                    this.eit_tracker.abort ();
+                }
+            }
+
+            private bool bus_watch_func (Gst.Bus bus, Gst.Message message) {
+                return this.scanner.on_bus_message (this, message);
+            }
+        }
+
         private DVB.DeviceGroup DeviceGroup;
 
-        private Gst.Element? pipeline;
-        private GLib.Queue<Channel> channels;
+        // channels grouped by the transponder they are broadcast on
+        private GLib.Queue<Gee.List<Channel>> transponders;
+        // one for each device used to collect EIT
+        private ArrayList<Tuner> tuners;
+        // collects EIT forwarded by PlayerThread
+        private Tuner forwarded;
+        // versions of EIT subtables that have been stored
+        private EITSectionTracker.Versions eit_versions;
         private Source scan_source;
         private Source queue_source;
         private int stop_counter;
         private MainContext context;
         private MainLoop loop;
         private Thread<void*> worker_thread;
-        private uint bus_watch_id;
-        private HashMap<uint, HashSet<Event>> channel_events;
 
         construct {
-            this.channels = new GLib.Queue<Channel> ();
+            this.transponders = new GLib.Queue<Gee.List<Channel>> ();
+            this.tuners = new ArrayList<Tuner> ();
+            this.eit_versions = new EITSectionTracker.Versions ();
+            this.forwarded = new Tuner (this, null, this.eit_versions);
             this.stop_counter = 0;
             this.context = new MainContext ();
-            this.channel_events = new HashMap<uint, HashSet<Event>> ();
         }
 
         /**
@@ -66,6 +257,8 @@ namespace DVB {
             if (CHECK_EIT_INTERVAL == -1) {
                 Settings settings = new Factory().get_settings ();
                 CHECK_EIT_INTERVAL = settings.get_epg_scan_interval ();
+                MAX_WAIT_FOR_EIT_DURATION = int.max (WAIT_FOR_EIT_DURATION,
+                    settings.get_epg_max_dwell_time ());
             }
         }
 
@@ -82,6 +275,61 @@ namespace DVB {
             this.stop_counter += 1;
         }
 
+        /**
+         * @device: The device to release or NULL to release any of them
+         * @returns: TRUE if a device has been released
+         *
+         * Stop collecting EPG data with one of the devices, so it can be
+         * used for something else. Collecting EPG data continues with the
+         * remaining devices.
+         */
+        public bool release_device (DVB.Device? device = null) {
+            Tuner? tuner = null;
+            lock (this.tuners) {
+                foreach (Tuner t in this.tuners) {
+                    if (device == null || t.device == device) {
+                        tuner = t;
+                        break;
+                    }
+                }
+                if (tuner != null)
+                    this.tuners.remove (tuner);
+            }
+            if (tuner == null) return false;
+
+            log.debug ("Releasing adapter %u, frontend %u of group %u",
+                tuner.device.Adapter, tuner.device.Frontend,
+                this.DeviceGroup.Id);
+
+            // The tuner can't be tuned to another transponder afterwards
+            tuner.reset_pipeline (this.context);
+            // Keep what has been collected so far and scan the
+            // transponder again later, unless it has been finished
+            Gee.List<Channel>? transponder = tuner.take_transponder ();
+            if (transponder != null) {
+                lock (this.transponders) {
+                    this.transponders.push_head (transponder);
+                }
+            }
+            // Don't block the caller while the events are stored
+            var store_source = new IdleSource ();
+            store_source.set_callback (() => {
+                tuner.store_events (this.DeviceGroup.Channels);
+                return false;
+            });
+            store_source.attach (this.context);
+            return true;
+        }
+
+        /**
+         * Collect EPG data with devices that became free again
+         * if a scan is in progress
+         */
+        public void resume () {
+            if (this.stop_counter == 0 && this.scan_source != null)
+                this.setup_tuners ();
+        }
+
         private void remove_timeouts () {
             if (this.scan_source != null) {
                 this.scan_source.destroy ();
@@ -107,52 +355,57 @@ namespace DVB {
             return null;
         }
 
-        private bool setup_pipeline () {
-            DVB.Device? device = this.DeviceGroup.get_next_free_device ();
-            if (device == null) return false;
+        /**
+         * Create a tuner for each free device
+         *
+         * @returns: The number of tuners added
+         */
+        private int setup_tuners () {
+            int added = 0;
+            foreach (DVB.Device device in this.DeviceGroup.get_free_devices ()) {
+                if (this.get_tuner (device) != null) continue;
 
-            lock (this.pipeline) {
-                try {
-                    this.pipeline = Gst.parse_launch (PIPELINE_TEMPLATE.printf (
-                        device.Adapter, device.Frontend));
-                } catch (Error e) {
-                    log.error ("Could not create pipeline: %s", e.message);
-                    return false;
-                }
+                Tuner tuner = new Tuner (this, device, this.eit_versions);
+                if (!tuner.setup_pipeline (this.context)) continue;
 
-                Gst.Bus bus = this.pipeline.get_bus ();
-                this.bus_watch_id = cUtils.gst_bus_add_watch_context (bus,
-                    this.bus_watch_func, this.context);
+                lock (this.tuners) {
+                    this.tuners.add (tuner);
+                }
+                added++;
             }
-            return true;
+            log.debug ("Collecting EPG data of group %u with %d additional devices",
+                this.DeviceGroup.Id, added);
+            return added;
         }
 
-        private void reset_pipeline() {
-            lock (this.pipeline) {
-                if (this.pipeline != null) {
-                    Source bus_watch_source = this.context.find_source_by_id (
-                        this.bus_watch_id);
-                    if (bus_watch_source != null) {
-                        bus_watch_source.destroy ();
-                        this.bus_watch_id = 0;
-                    }
-                    this.pipeline.set_state (Gst.State.NULL);
-                    this.pipeline.get_state (null, null, -1);
-                    this.pipeline = null;
+        private Tuner? get_tuner (DVB.Device device) {
+            lock (this.tuners) {
+                foreach (Tuner tuner in this.tuners) {
+                    if (tuner.device == device)
+                        return tuner;
                 }
             }
+            return null;
         }
 
         private void reset () {
-            reset_pipeline ();
+            lock (this.tuners) {
+                foreach (Tuner tuner in this.tuners) {
+                    tuner.reset_pipeline (this.context);
+                    tuner.clear ();
+                }
+                this.tuners.clear ();
+            }
 
-            // clear doesn't unref for us so we do this instead
-            Channel c;
-            while ((c = this.channels.pop_head ()) != null) {
-            // Vala unref's Channel instances for us
+            lock (this.transponders) {
+                // clear doesn't unref for us so we do this instead
+                Gee.List<Channel> t;
+                while ((t = this.transponders.pop_head ()) != null) {
+                // Vala unref's list instances for us
+                }
+                this.transponders.clear ();
             }
-            this.channels.clear ();
-            this.channel_events.clear ();
+            this.forwarded.clear ();
         }
 
         /**
@@ -175,72 +428,165 @@ namespace DVB {
             if (this.stop_counter > 0) return false;
             this.stop_counter = 0;
 
-            foreach (Channel c in this.DeviceGroup.Channels) {
-                this.channels.push_tail (c);
+            if (this.scan_source != null) {
+                // Already scanning, use devices that became free again
+                this.setup_tuners ();
+                return false;
+            }
+
+            // EIT data of all services of a transponder is transmitted
+            // on the same PID, hence it's sufficient to tune to each
+            // transponder once
+            lock (this.transponders) {
+                foreach (Gee.List<Channel> transponder in
+                        group_by_transponder (this.DeviceGroup.Channels)) {
+                    this.transponders.push_tail (transponder);
+                }
             }
 
-            if (!setup_pipeline ()) return false;
+            if (this.setup_tuners () == 0) {
+                log.info ("All devices are busy, not collecting EPG data");
+                this.reset ();
+                return false;
+            }
 
-            this.scan_source = new TimeoutSource.seconds (WAIT_FOR_EIT_DURATION);
-            this.scan_source.set_callback (this.scan_new_frequency);
+            if (this.queue_source != null) {
+                this.queue_source.destroy ();
+                this.queue_source = null;
+            }
+            this.scan_source = new TimeoutSource.seconds (
+                CHECK_EIT_COMPLETE_INTERVAL);
+            this.scan_source.set_callback (this.check_eit_complete);
             this.scan_source.attach (this.context);
 
             return false;
         }
 
         /**
-         * Scan the next frequency for EPG data
+         * Scan the next transponder with each tuner that received
+         * all EIT data of the current one or reached the maximum time
          */
-        private bool scan_new_frequency () {
-            ChannelList clist = this.DeviceGroup.Channels;
-            if (clist == null)
-                return false;
+        private bool check_eit_complete () {
+            // Events forwarded by PlayerThread
+            this.forwarded.store_events (this.DeviceGroup.Channels);
+
+            var active_tuners = new ArrayList<Tuner> ();
+            lock (this.tuners) {
+                active_tuners.add_all (this.tuners);
+            }
 
-            lock (this.channel_events) {
-                foreach (uint sid in this.channel_events.keys) {
-                    Channel channel = clist.get_channel (sid);
-                    if (channel == null) {
-                        warning ("Could not find channel %u for this device", sid);
+            bool scanning = false;
+            foreach (Tuner tuner in active_tuners) {
+                if (tuner.is_tuned ()) {
+                    int64 duration = (get_monotonic_time () - tuner.tuned_time)
+                        / 1000000;
+                    bool complete = tuner.is_complete (
+                        duration < WAIT_FOR_EIT_DURATION);
+                    if (!complete && duration < MAX_WAIT_FOR_EIT_DURATION) {
+                        scanning = true;
                         continue;
                     }
-                    HashSet<Event> list = this.channel_events.get (sid);
 
-                    log.debug ("Adding %d events of channel %s (%u)",
-                        list.size, channel.Name, sid);
-                    channel.Schedule.add_all (list);
+                    log.debug ("%s EIT data on adapter %u, frontend %u after %d seconds",
+                        (complete) ? "Received all" : "Stopped waiting for",
+                        tuner.device.Adapter, tuner.device.Frontend,
+                        (int)duration);
                 }
-                this.channel_events.clear ();
+                if (this.scan_new_frequency (tuner))
+                    scanning = true;
             }
 
-            if (this.channels.is_empty ()) {
+            bool finished;
+            lock (this.transponders) {
+                finished = !scanning && this.transponders.is_empty ();
+            }
+            if (!scanning && !finished) {
+                // Transponders of released devices are left, but
+                // all tuners are done, use devices that are free
+                this.setup_tuners ();
+            }
+            if (finished) {
                 log.debug ("Finished EPG scan for group %u", this.DeviceGroup.Id);
 
                 this.reset ();
+                this.scan_source = null;
                 // Time the next iteration
                 this.queue_source = new TimeoutSource.seconds (CHECK_EIT_INTERVAL);
                 this.queue_source.set_callback (this.start);
                 this.queue_source.attach (this.context);
                 return false;
             }
+            return true;
+        }
 
-            Channel channel = this.channels.pop_head ();
-            channel.Schedule.remove_expired_events ();
-/*
-            log.debug ("Scanning channel %s (%u left)",
-                channel.Name, this.channels.get_length ());
-*/
-            lock (this.pipeline) {
-                this.pipeline.set_state (Gst.State.READY);
-                Gst.Element dvbsrc = ((Gst.Bin)this.pipeline).get_by_name ("dvbsrc");
-                channel.setup_dvb_source (dvbsrc);
+        /**
+         * Tune @tuner to the next transponder
+         *
+         * @returns: FALSE if there are no transponders left
+         */
+        private bool scan_new_frequency (Tuner tuner) {
+            lock (this.tuners) {
+                // The device has been released in the meantime
+                if (!this.tuners.contains (tuner))
+                    return false;
+            }
+            // The transponder is finished, the device must not
+            // put it back into the queue when it's released
+            tuner.take_transponder ();
+            tuner.store_events (this.DeviceGroup.Channels);
+
+            Gee.List<Channel>? transponder;
+            lock (this.transponders) {
+                transponder = this.transponders.pop_head ();
+            }
+            if (transponder == null) {
+                // Nothing left to do for this device, free it
+                lock (this.tuners) {
+                    this.tuners.remove (tuner);
+                }
+                tuner.reset_pipeline (this.context);
+                return false;
+            }
 
-                this.pipeline.set_state (Gst.State.PLAYING);
+            if (!tuner.tune (transponder)) {
+                // Device has been released in the meantime
+                lock (this.transponders) {
+                    this.transponders.push_head (transponder);
+                }
+                return false;
+            }
+            foreach (Channel c in transponder) {
+                c.Schedule.remove_expired_events ();
             }
 
             return true;
         }
 
-        private bool bus_watch_func (Gst.Bus bus, Gst.Message message) {
+        /**
+         * @returns: Lists of channels that share the same
+         * tuning parameters
+         */
+        private static Gee.List<Gee.List<Channel>> group_by_transponder (
+                ChannelList channels) {
+            var transponders = new ArrayList<Gee.List<Channel>> ();
+            foreach (Channel c in channels) {
+                Gee.List<Channel>? transponder = null;
+                foreach (Gee.List<Channel> t in transponders) {
+                    if (t.get (0).Param.equal (c.Param)) {
+                        transponder = t;
+                        break;
+                    }
+                }
+                if (transponder == null) {
+                    transponder = new ArrayList<Channel> ();
+                    transponders.add (transponder);
+                }
+                transponder.add (c);
+            }
+            return transponders;
+        }
+
+        private bool on_bus_message (Tuner tuner, Gst.Message message) {
             switch (message.type) {
                 case Gst.MessageType.ELEMENT:
                     Section section = message_parse_mpegts_section (message);
@@ -251,7 +597,9 @@ namespace DVB {
                             log.warning ("Could not read from DVB device");
                         }
                     } else if (section.section_type == SectionType.EIT) {
-                        this.on_eit_structure (section);
+                        unowned EIT eit = section.get_eit ();
+                        if (eit != null)
+                            tuner.add_section (section, eit);
                     }
                     break;
                 case Gst.MessageType.ERROR:
@@ -259,11 +607,15 @@ namespace DVB {
                     string debug;
                     message.parse_error (out gerror, out debug);
                     log.error ("%s %s", gerror.message, debug);
-                    reset_pipeline();
-                    if (setup_pipeline()) {
+                    tuner.reset_pipeline (this.context);
+                    if (tuner.setup_pipeline (this.context)) {
+                        // Continue with the next transponder
+                        tuner.pause ();
                         return true;
                     } else {
-                        reset();
+                        lock (this.tuners) {
+                            this.tuners.remove (tuner);
+                        }
                         return false;
                     }
 
@@ -273,248 +625,94 @@ namespace DVB {
             return true;
         }
 
+        /**
+         * Add EIT data received by somebody else
+         */
         public void on_eit_structure (Section section) {
             unowned EIT eit = section.get_eit();
             if (eit == null)
                 return;
 
-            lock (this.channel_events) {
-                uint sid = section.subtable_extension;
-
-                if (!this.channel_events.has_key (sid)) {
-                    this.channel_events.set (sid,
-                        new HashSet<Event> (Event.hash, Event.equal));
-                }
-                HashSet<Event> list = this.channel_events.get (sid);
-
-                EITEvent event;
-                uint len = eit.events.length;
-                for (uint i = 0; i < len; i++) {
-                    event = eit.events.@get(i);
-                    var event_class = new Event ();
-
-                    event_class.id = event.event_id;
-                    event_class.year = event.start_time.get_year ();
-                    event_class.month = event.start_time.get_month ();
-                    event_class.day = event.start_time.get_day ();
-                    event_class.hour = event.start_time.get_hour ();
-                    event_class.minute = event.start_time.get_minute ();
-                    event_class.second = event.start_time.get_second ();
-                    event_class.duration = event.duration;
-
-                    if (event_class.has_expired ())
-                        continue;
-
-                    event_class.running_status = event.running_status;
-                    event_class.free_ca_mode = event.free_CA_mode;
-
-                    Descriptor desc;
-                    for (uint j = 0 ;j < event.descriptors.length; j++) {
-                         desc = event.descriptors.@get (j);
-
-                         switch (desc.tag) {
-                            case DVBDescriptorType.SHORT_EVENT:
-                                string lang;
-                                desc.parse_dvb_short_event ( out lang,
-                                out event_class.name,
-                                out event_class.description);
-                                break;
-                            case DVBDescriptorType.EXTENDED_EVENT:
-                                ExtendedEventDescriptor ex_desc;
-
-                                if (!desc.parse_dvb_extended_event (out ex_desc))
-                                    log.debug ("Failed parse extended Event");
-
-                                var builder = new StringBuilder ();
-                                if (event_class.extended_description != null)
-                                    builder.append (event_class.extended_description);
-                                builder.append (ex_desc.text);
-                                event_class.extended_description = builder.str;
-
-                                break;
-                            case DVBDescriptorType.COMPONENT:
-                                ComponentDescriptor comp;
-
-                                desc.parse_dvb_component(out comp);
-
-                                decode_component (comp, event_class);
-                                break;
-                            case DVBDescriptorType.CONTENT:
-                                GenericArray<Content?> conts;
-
-                                desc.parse_dvb_content(out conts);
-                                if (conts.length != 0) {
-                                    for (uint k = 0; k < conts.length; k++) {
-                                        Content cont = conts.@get(k);
-                                        log.debug ("0x%01x, 0x%01x, 0x%02x",
-                                            cont.content_nibble_1,
-                                            cont.content_nibble_2,
-                                            cont.user_byte);
-                                    }
-                                }
-                                break;
-                            default:
-                                log.debug ("Unkown descriptor: 0x%02x",
-                                    desc.tag);
-                                break;
-                        }
-
-                    }
-
-                    log.debug ("Adding new event: %s", event_class.to_string ());
-                    list.add (event_class);
-
-                }
-            }
+            this.forwarded.add_section (section, eit);
         }
 
-        private static void decode_component (ComponentDescriptor comp, Event event_class)
-        {
-
-            switch (comp.stream_content) {
-                case 0x01:
-                case 0x05:
-                    var video = new Event.VideoComponent ();
-
-                    /* hd flag */
-                    switch (comp.component_type) {
-                        case 0x09:
-                        case 0x0a:
-                        case 0x0b:
-                        case 0x0c:
-                        case 0x0d:
-                        case 0x0e:
-                        case 0x0f:
-                        case 0x10:
-                        case 0x80:
-                        case 0x81:
-                        case 0x82:
-                        case 0x83:
-                        case 0x84:
-                            video.has_hd = true;
-                            break;
-                        default:
-                            video.has_hd = false;
+        private static void decode_events (EIT eit, EventRecordList list) {
+            EITEvent event;
+            uint len = eit.events.length;
+            for (uint i = 0; i < len; i++) {
+                event = eit.events.@get(i);
+                if (list.contains (event.event_id))
+                    continue;
+
+                Time utc_time = Utils.create_utc_time (
+                    event.start_time.get_year (),
+                    event.start_time.get_month (),
+                    event.start_time.get_day (),
+                    event.start_time.get_hour (),
+                    event.start_time.get_minute (),
+                    event.start_time.get_second ());
+                int64 starttime = (int64)cUtils.timegm (utc_time);
+
+                if (starttime + event.duration < (int64)time_t ())
+                    continue;
+
+                string? name = null;
+                string? description = null;
+                StringBuilder? extended_description = null;
+
+                Descriptor desc;
+                for (uint j = 0 ;j < event.descriptors.length; j++) {
+                     desc = event.descriptors.@get (j);
+
+                     switch (desc.tag) {
+                        case DVBDescriptorType.SHORT_EVENT:
+                            string lang;
+                            desc.parse_dvb_short_event (out lang,
+                                out name, out description);
                             break;
-                    }
+                        case DVBDescriptorType.EXTENDED_EVENT:
+                            ExtendedEventDescriptor ex_desc;
 
-                    /* 3d flag */
-                    switch (comp.component_type) {
-                        case 0x80:
-                        case 0x81:
-                        case 0x82:
-                        case 0x83:
-                        case 0x84:
-                            video.has_3d = true;
-                            break;
-                        default:
-                            video.has_3d = false;
-                            break;
-                    }
+                            if (!desc.parse_dvb_extended_event (out ex_desc))
+                                log.debug ("Failed parse extended Event");
+
+                            if (extended_description == null)
+                                extended_description = new StringBuilder ();
+                            extended_description.append (ex_desc.text);
 
-                    /* aspect radio
-                       passible value are
-                       4:3, 16:9, 2.21:1
-                    */
-                    switch (comp.component_type) {
-                        case 0x01:
-                        case 0x05:
-                        case 0x09:
-                        case 0x0d:
-                            video.aspect_ratio = "4:3";
-                            break;
-                        case 0x02:
-                        case 0x06:
-                        case 0x0a:
-                        case 0x0e:
-                            video.aspect_ratio = "16:9 with pan";
                             break;
-                        case 0x03:
-                        case 0x07:
-                        case 0x0b:
-                        case 0x0f:
-                        case 0x80:
-                        case 0x81:
-                        case 0x82:
-                        case 0x83:
-                        case 0x84:
-                            video.aspect_ratio = "16:9";
+                        case DVBDescriptorType.CONTENT:
+                            GenericArray<Content?> conts;
+
+                            desc.parse_dvb_content(out conts);
+                            if (conts.length != 0) {
+                                for (uint k = 0; k < conts.length; k++) {
+                                    Content cont = conts.@get(k);
+                                    log.debug ("0x%01x, 0x%01x, 0x%02x",
+                                        cont.content_nibble_1,
+                                        cont.content_nibble_2,
+                                        cont.user_byte);
+                                }
+                            }
                             break;
-                        case 0x04:
-                        case 0x08:
-                        case 0x0c:
-                        case 0x10:
-                            video.aspect_ratio = "2.21:1";
+                        case DVBDescriptorType.COMPONENT:
+                            // Components are not stored
                             break;
                         default:
-                            video.aspect_ratio = "unknown";
+                            log.debug ("Unkown descriptor: 0x%02x",
+                                desc.tag);
                             break;
-                        }
+                    }
 
-                        switch (comp.component_type) {
-                            case 0x05:
-                            case 0x06:
-                            case 0x07:
-                            case 0x08:
-                            case 0x0d:
-                            case 0x0e:
-                            case 0x0f:
-                            case 0x10:
-                            case 0x82:
-                            case 0x83:
-                                video.frequency = 30;
-                                break;
-                            default:
-                                video.frequency = 25;
-                                break;
-                        }
-                        if (comp.stream_content == 0x01)
-                            video.content = "MPEG-2";
-                        else
-                            video.content = "AVC/MVC";
-                        video.type = comp.component_type.to_string("0x%02x");
-                        video.tag = comp.component_tag;
-                        video.text = comp.text;
-                        event_class.video_component =  video;
-                        break;
-                    case 0x02:
-                    case 0x04:
-                    case 0x06:
-                    case 0x07:
-                        var audio = new Event.AudioComponent ();
-
-                        switch (comp.stream_content) {
-                            case 0x02:
-                                audio.content = "MPEG-1 Layer 2";
-                                break;
-                            case 0x04:
-                                audio.content = "AC-3";
-                                break;
-                            case 0x06:
-                                audio.content = "HE-AAC/HE-AACv2";
-                                break;
-                            case 0x07:
-                                audio.content = "DTS";
-                                break;
-                        }
+                }
 
-                        audio.type = comp.component_type.to_string("0x%02x");
-                        audio.tag = comp.component_tag;
-                        audio.text = comp.text;
-                        audio.language = comp.language_code;
-                        event_class.audio_components.append (audio);
-                        break;
-                    case 0x03:
-                        var teletext = new Event.TeletextComponent ();
+                log.debug ("Adding new event %u: %s", event.event_id, name);
+                list.add (event.event_id, starttime, event.duration,
+                    event.running_status, event.free_CA_mode, name,
+                    description, (extended_description == null)
+                        ? null : extended_description.str);
 
-                        teletext.type = comp.component_type.to_string("0x%02x");
-                        teletext.tag = comp.component_tag;
-                        teletext.text = comp.text;
-                        event_class.teletext_components.append (teletext);
-                        break;
-                    default:
-                        break;
-              }
+            }
         }
 
     }
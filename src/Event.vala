@@ -140,6 +140,19 @@ namespace DVB {
             return utc_time;
         }
 
+        /**
+         * Set the start time from the UNIX timestamp @start
+         */
+        public void set_start_time (int64 start) {
+            Time utc_time = Time.gm ((time_t)start);
+            this.year = utc_time.year + 1900;
+            this.month = utc_time.month + 1;
+            this.day = utc_time.day;
+            this.hour = utc_time.hour;
+            this.minute = utc_time.minute;
+            this.second = utc_time.second;
+        }
+
         public time_t get_start_timestamp () {
             Time utc_time = this.get_utc_start_time ();
             return utc_time.mktime ();
@@ -0,0 +1,206 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+using DVB.Logging;
+
+namespace DVB {
+
+    /**
+     * Keeps recently used events of all schedules in memory,
+     * so they don't have to be read from the EPG store again.
+     *
+     * Only compact copies of the events are stored: the extended
+     * description and components are omitted and have to be
+     * retrieved from the EPG store if needed. The estimated memory
+     * used by all events is kept below the size set in the settings
+     * by evicting the least recently used events.
+     */
+    public class EventCache : GLib.Object {
+
+        private static Logger log = LogManager.getLogManager().getDefaultLogger();
+
+        // estimated memory used by an entry without its strings
+        private const size_t ENTRY_OVERHEAD = 160;
+
+        private static EventCache instance;
+        private static RecMutex instance_mutex = RecMutex ();
+
+        private class Entry {
+            public string key;
+            public Event event;
+            public size_t size;
+            // double linked list ordered by last access
+            public Entry? next;
+            public unowned Entry? prev;
+        }
+
+        private HashMap<string, Entry> entries;
+        // most recently used entry
+        private Entry? head;
+        // least recently used entry
+        private unowned Entry? tail;
+        private size_t max_size;
+        private size_t current_size;
+
+        construct {
+            this.entries = new HashMap<string, Entry> ();
+            this.head = null;
+            this.tail = null;
+            this.current_size = 0;
+        }
+
+        /**
+         * @max_size: Maximum number of bytes used by events
+         */
+        public EventCache (size_t max_size) {
+            this.max_size = max_size;
+        }
+
+        public static unowned EventCache get_instance () {
+            instance_mutex.lock ();
+            if (instance == null) {
+                Settings settings = new Factory().get_settings ();
+                instance = new EventCache (settings.get_epg_cache_size ());
+                log.debug ("Caching up to %u KiB of EPG events",
+                    (uint)(instance.max_size / 1024));
+            }
+            instance_mutex.unlock ();
+            return instance;
+        }
+
+        /**
+         * @returns: The cached event or NULL if it isn't in the cache
+         */
+        public Event? lookup (uint group_id, uint channel_sid, uint event_id) {
+            string key = get_key (group_id, channel_sid, event_id);
+            lock (this.entries) {
+                Entry? entry = this.entries.get (key);
+                if (entry == null)
+                    return null;
+                this.unlink (entry);
+                this.link_head (entry);
+                return entry.event;
+            }
+        }
+
+        /**
+         * Add @event to the cache or replace the cached version
+         */
+        public void add (uint group_id, uint channel_sid, Event event) {
+            Entry entry = new Entry ();
+            entry.key = get_key (group_id, channel_sid, event.id);
+            entry.event = create_compact_copy (event);
+            entry.size = ENTRY_OVERHEAD + entry.key.length
+                + ((event.name == null) ? 0 : event.name.length)
+                + ((event.description == null) ? 0 : event.description.length);
+            if (entry.size > this.max_size)
+                return;
+
+            lock (this.entries) {
+                this.remove_entry (entry.key);
+
+                this.entries.set (entry.key, entry);
+                this.link_head (entry);
+                this.current_size += entry.size;
+
+                while (this.current_size > this.max_size)
+                    this.remove_entry (this.tail.key);
+            }
+        }
+
+        public void remove (uint group_id, uint channel_sid, uint event_id) {
+            string key = get_key (group_id, channel_sid, event_id);
+            lock (this.entries) {
+                this.remove_entry (key);
+            }
+        }
+
+        /**
+         * Remove all events
+         */
+        public void clear () {
+            lock (this.entries) {
+                this.entries.clear ();
+                // unlink entries one by one to avoid a deep recursion
+                while (this.head != null)
+                    this.head = this.head.next;
+                this.tail = null;
+                this.current_size = 0;
+            }
+        }
+
+        private void remove_entry (string key) {
+            Entry? entry;
+            if (!this.entries.unset (key, out entry))
+                return;
+            this.unlink (entry);
+            this.current_size -= entry.size;
+        }
+
+        private void link_head (Entry entry) {
+            entry.prev = null;
+            entry.next = this.head;
+            if (this.head != null)
+                this.head.prev = entry;
+            else
+                this.tail = entry;
+            this.head = entry;
+        }
+
+        private void unlink (Entry entry) {
+            if (entry.next != null)
+                entry.next.prev = entry.prev;
+            else
+                this.tail = entry.prev;
+
+            if (entry.prev != null)
+                entry.prev.next = entry.next;
+            else
+                this.head = entry.next;
+
+            entry.prev = null;
+            entry.next = null;
+        }
+
+        private static Event create_compact_copy (Event event) {
+            Event copy = new Event ();
+            copy.id = event.id;
+            copy.year = event.year;
+            copy.month = event.month;
+            copy.day = event.day;
+            copy.hour = event.hour;
+            copy.minute = event.minute;
+            copy.second = event.second;
+            copy.duration = event.duration;
+            copy.running_status = event.running_status;
+            copy.free_ca_mode = event.free_ca_mode;
+            copy.name = event.name;
+            copy.description = event.description;
+            return copy;
+        }
+
+        private static string get_key (uint group_id, uint channel_sid,
+                uint event_id) {
+            return "%u:%u:%u".printf (group_id, channel_sid, event_id);
+        }
+    }
+
+}
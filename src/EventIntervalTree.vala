@@ -0,0 +1,185 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+
+namespace DVB {
+
+    /**
+     * Balanced binary search tree of events ordered by start time
+     * where each node knows the latest end time in its subtree.
+     * Finding all k events that overlap a time span takes
+     * O(log n + k) steps.
+     */
+    public class EventIntervalTree : GLib.Object {
+
+        private class Node {
+            public EventElement element;
+            public int64 end;
+            // latest end of all events in this subtree
+            public int64 max_end;
+            public int height;
+            public Node? left;
+            public Node? right;
+
+            public Node (EventElement element) {
+                this.element = element;
+                this.end = (int64)element.starttime + element.duration;
+                this.max_end = this.end;
+                this.height = 1;
+            }
+
+            public void update () {
+                this.height = 1 + int.max (get_height (this.left),
+                    get_height (this.right));
+                this.max_end = this.end;
+                if (this.left != null && this.left.max_end > this.max_end)
+                    this.max_end = this.left.max_end;
+                if (this.right != null && this.right.max_end > this.max_end)
+                    this.max_end = this.right.max_end;
+            }
+        }
+
+        private Node? root;
+
+        public void insert (EventElement element) {
+            this.root = insert_node ((owned)this.root, element);
+        }
+
+        public void remove (EventElement element) {
+            this.root = remove_node ((owned)this.root, element);
+        }
+
+        public void clear () {
+            this.root = null;
+        }
+
+        /**
+         * @returns: Events that start before @end and end
+         * after @start, sorted by start time
+         */
+        public Gee.List<EventElement> get_overlapping (int64 start, int64 end) {
+            Gee.List<EventElement> result = new ArrayList<EventElement> ();
+            collect_overlapping (this.root, start, end, result);
+            return result;
+        }
+
+        private static void collect_overlapping (Node? node, int64 start,
+                int64 end, Gee.List<EventElement> result) {
+            // No event in this subtree ends after start
+            if (node == null || node.max_end <= start)
+                return;
+
+            collect_overlapping (node.left, start, end, result);
+
+            // This event and all in the right subtree start too late
+            if ((int64)node.element.starttime >= end)
+                return;
+            if (node.end > start)
+                result.add (node.element);
+
+            collect_overlapping (node.right, start, end, result);
+        }
+
+        private static int get_height (Node? node) {
+            return (node == null) ? 0 : node.height;
+        }
+
+        private static int compare (EventElement a, EventElement b) {
+            int cmp = EventElement.compare (a, b);
+            if (cmp != 0) return cmp;
+            if (a.id == b.id) return 0;
+            return (a.id < b.id) ? -1 : 1;
+        }
+
+        private static Node rotate_right (owned Node node) {
+            Node pivot = (owned)node.left;
+            node.left = (owned)pivot.right;
+            node.update ();
+            pivot.right = (owned)node;
+            pivot.update ();
+            return pivot;
+        }
+
+        private static Node rotate_left (owned Node node) {
+            Node pivot = (owned)node.right;
+            node.right = (owned)pivot.left;
+            node.update ();
+            pivot.left = (owned)node;
+            pivot.update ();
+            return pivot;
+        }
+
+        private static Node balance (owned Node node) {
+            node.update ();
+            int diff = get_height (node.left) - get_height (node.right);
+            if (diff > 1) {
+                if (get_height (node.left.left) < get_height (node.left.right))
+                    node.left = rotate_left ((owned)node.left);
+                return rotate_right ((owned)node);
+            } else if (diff < -1) {
+                if (get_height (node.right.right) < get_height (node.right.left))
+                    node.right = rotate_right ((owned)node.right);
+                return rotate_left ((owned)node);
+            }
+            return node;
+        }
+
+        private static Node insert_node (owned Node? node, EventElement element) {
+            if (node == null)
+                return new Node (element);
+
+            if (compare (element, node.element) < 0)
+                node.left = insert_node ((owned)node.left, element);
+            else
+                node.right = insert_node ((owned)node.right, element);
+
+            return balance ((owned)node);
+        }
+
+        private static Node? remove_node (owned Node? node, EventElement element) {
+            if (node == null)
+                return null;
+
+            int cmp = compare (element, node.element);
+            if (cmp < 0) {
+                node.left = remove_node ((owned)node.left, element);
+            } else if (cmp > 0) {
+                node.right = remove_node ((owned)node.right, element);
+            } else {
+                if (node.left == null)
+                    return (owned)node.right;
+                if (node.right == null)
+                    return (owned)node.left;
+
+                // Replace with the first event of the right subtree
+                Node successor = node.right;
+                while (successor.left != null)
+                    successor = successor.left;
+                node.element = successor.element;
+                node.end = successor.end;
+                node.right = remove_node ((owned)node.right, successor.element);
+            }
+
+            return balance ((owned)node);
+        }
+    }
+
+}
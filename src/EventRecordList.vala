@@ -0,0 +1,125 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+
+namespace DVB {
+
+    /**
+     * Events of a single channel as they are decoded from the EIT.
+     *
+     * Every event is a fixed size record and each distinct string
+     * is stored only once for all events. Event objects are only
+     * created when the events are added to the schedule.
+     */
+    public class EventRecordList {
+
+        private const uint8 FREE_CA_MODE_FLAG = 0x08;
+        private const uint8 RUNNING_STATUS_MASK = 0x07;
+
+        private struct Record {
+            public int64 starttime; // UNIX timestamp
+            public uint32 duration;
+            public uint16 id;
+            // running status and free CA mode
+            public uint8 flags;
+            public unowned string? name;
+            public unowned string? description;
+            public unowned string? extended_description;
+        }
+
+        private Record[] records;
+        // ids of all events
+        private HashTable<uint, uint> ids;
+        private StringChunk strings;
+
+        public int size {
+            get { return this.records.length; }
+        }
+
+        public EventRecordList () {
+            this.records = new Record[0];
+            this.ids = new HashTable<uint, uint> (direct_hash, direct_equal);
+            this.strings = new StringChunk (4096);
+        }
+
+        public bool contains (uint event_id) {
+            return this.ids.contains (event_id);
+        }
+
+        /**
+         * @starttime: UNIX timestamp
+         * @returns: FALSE if an event with the same id has already been added
+         */
+        public bool add (uint event_id, int64 starttime, uint duration,
+                uint running_status, bool free_ca_mode, string? name,
+                string? description, string? extended_description) {
+            if (this.contains (event_id))
+                return false;
+
+            Record record = Record ();
+            record.starttime = starttime;
+            record.duration = (uint32)duration;
+            record.id = (uint16)event_id;
+            record.flags = (uint8)(running_status & RUNNING_STATUS_MASK);
+            if (free_ca_mode)
+                record.flags |= FREE_CA_MODE_FLAG;
+            record.name = this.intern (name);
+            record.description = this.intern (description);
+            record.extended_description = this.intern (extended_description);
+
+            this.ids.add (event_id);
+            this.records += record;
+            return true;
+        }
+
+        /**
+         * Whether the event at @index has started and ended in the past
+         */
+        public bool has_expired (int index) {
+            Record record = this.records[index];
+            return (record.starttime + record.duration < (int64)time_t ());
+        }
+
+        /**
+         * @returns: A new event for the record at @index
+         */
+        public Event get (int index) {
+            Record record = this.records[index];
+
+            Event event = new Event ();
+            event.id = record.id;
+            event.set_start_time (record.starttime);
+            event.duration = record.duration;
+            event.running_status = record.flags & RUNNING_STATUS_MASK;
+            event.free_ca_mode = ((record.flags & FREE_CA_MODE_FLAG) != 0);
+            event.name = record.name;
+            event.description = record.description;
+            event.extended_description = record.extended_description;
+            return event;
+        }
+
+        private unowned string? intern (string? text) {
+            if (text == null)
+                return null;
+            return this.strings.insert_const (text);
+        }
+    }
+
+}
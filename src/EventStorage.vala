@@ -24,14 +24,40 @@ namespace DVB {
 
     /**
      * We don't want to hold the complete information about
-     * every event in memory. Just remember id and starttime
-     * so we can have a sorted list.
+     * every event in memory. Just remember id, starttime and
+     * duration so we can have a sorted list.
      */
-    public class EventElement : GLib.Object {
+    public class EventElement {
 
         public uint id;
         /* Time is stored in UTC */
         public time_t starttime;
+        public uint duration; // in seconds
+
+        /**
+         * Whether the event has started and ended in the past
+         */
+        public bool has_expired () {
+            Time current_utc = Time.gm (time_t ());
+            // set day light saving time to undefined
+            current_utc.isdst = -1;
+
+            return (this.starttime + this.duration < current_utc.mktime ());
+        }
+
+        /**
+         * @returns: Fraction of the event's duration that
+         * lies between @start and @end
+         */
+        public double get_overlap_percentage (time_t start, time_t end) {
+            time_t this_end = this.starttime + this.duration;
+            if (this.duration == 0 || this.starttime > end || this_end < start)
+                return 0;
+
+            time_t overlap_start = Utils.t_max (this.starttime, start);
+            time_t overlap_end = Utils.t_min (this_end, end);
+            return Math.fabs (overlap_end - overlap_start) / this.duration;
+        }
 
         public static int compare (EventElement event1, EventElement event2) {
             if (event1 == null && event2 == null) return 0;
@@ -47,6 +73,7 @@ namespace DVB {
             EventElement element = new EventElement ();
             element.id = event.id;
             element.starttime = event.get_start_timestamp ();
+            element.duration = event.duration;
             return element;
         }
     }
@@ -55,6 +82,8 @@ namespace DVB {
 
         private Sequence<EventElement> events;
         private Map<uint, unowned SequenceIter<EventElement>> event_id_map;
+        // the same events for finding overlapping ones
+        private EventIntervalTree interval_tree;
 
         // concurrent modification protection
 	    private int _stamp = 0;
@@ -74,6 +103,7 @@ namespace DVB {
         public EventStorage () {
             this.events = new Sequence<EventElement> ();
             this.event_id_map = new HashMap<uint, unowned SequenceIter<EventElement>> ();
+            this.interval_tree = new EventIntervalTree ();
         }
 
         public void insert (Event event) {
@@ -81,15 +111,20 @@ namespace DVB {
 
             SequenceIter<EventElement> iter = this.events.insert_sorted (element, EventElement.compare);
             this.event_id_map.set (event.id, iter);
+            this.interval_tree.insert (element);
 
             _stamp++;
 
             assert (this.events.get_length () == this.event_id_map.size);
         }
 
+        /**
+         * Remove the events from position @start up to,
+         * but not including, position @end
+         */
         public void remove_range (int start, int end) {
             assert (start >= 0);
-            assert (end < this.events.get_length ());
+            assert (end <= this.events.get_length ());
 
             SequenceIter<EventElement> begin_iter = this.events.get_iter_at_pos (start);
             SequenceIter<EventElement> end_iter = this.events.get_iter_at_pos (end);
@@ -98,6 +133,7 @@ namespace DVB {
             while (iter != end_iter) {
                 EventElement element = iter.get();
                 this.event_id_map.unset (element.id);
+                this.interval_tree.remove (element);
 
                 iter = iter.next ();
             }
@@ -113,6 +149,7 @@ namespace DVB {
             foreach (Event event in events) {
                 SequenceIter<EventElement> iter = this.event_id_map.get (event.id);
                 if (iter != null) {
+                    this.interval_tree.remove (iter.get ());
                     iter.remove ();
                     this.event_id_map.unset (event.id);
                 }
@@ -120,6 +157,16 @@ namespace DVB {
             _stamp++;
         }
 
+        public void remove (uint event_id) {
+            SequenceIter<EventElement> iter = this.event_id_map.get (event_id);
+            if (iter != null) {
+                this.interval_tree.remove (iter.get ());
+                iter.remove ();
+                this.event_id_map.unset (event_id);
+            }
+            _stamp++;
+        }
+
         public new EventElement get (int index) {
             assert (index < this.events.get_length ());
 
@@ -154,27 +201,45 @@ namespace DVB {
             return (prev.is_begin ()) ? null : prev.get();
         }
 
+        /**
+         * @returns: Events that overlap with @event,
+         * sorted by start time
+         */
         public Gee.List<EventElement> get_overlapping_events (Event event) {
-            EventElement element = EventElement.new_from_event (event);
-            time_t event_end = event.get_end_timestamp ();
-
-            SequenceIter<EventElement> start_iter = this.events.search (element, EventElement.compare).prev ();
-
-            Gee.List<EventElement> overlap = new ArrayList<EventElement> ();
-
-            SequenceIter<EventElement> end_iter = start_iter;
-            while (!end_iter.is_end ()) {
-                EventElement data = end_iter.get ();
-                if (data.starttime > event_end) {
-                    break;
-                }
-
-                overlap.add (data);
+            return this.interval_tree.get_overlapping (
+                event.get_start_timestamp (), event.get_end_timestamp ());
+        }
 
-                end_iter = end_iter.next ();
-            }
+        /**
+         * @start: Start time in the same representation as
+         * EventElement.starttime
+         * @end: End time in the same representation as
+         * EventElement.starttime
+         * @returns: Events that start before @end and end
+         * after @start, sorted by start time
+         */
+        public Gee.List<EventElement> get_events_in_range (int64 start,
+                int64 end) {
+            return this.interval_tree.get_overlapping (start, end);
+        }
 
-            return overlap;
+        /**
+         * @returns: The first event that starts at @start
+         * or later or NULL
+         */
+        public EventElement? get_first_starting_at (time_t start) {
+            EventElement probe = new EventElement ();
+            probe.starttime = start;
+            // The probe comes before all events starting at the same time
+            SequenceIter<EventElement> iter = this.events.search (probe,
+                (a, b) => {
+                    if (a == probe)
+                        return (a.starttime <= b.starttime) ? -1 : +1;
+                    if (b == probe)
+                        return (a.starttime < b.starttime) ? -1 : +1;
+                    return EventElement.compare (a, b);
+                });
+            return (iter.is_end ()) ? null : iter.get ();
         }
 
         public bool foreach (ForallFunc<EventElement> f) {
@@ -30,6 +30,7 @@ namespace DVB {
 
         private static SqliteConfigTimersStore store;
         private static SqliteEPGStore epgstore;
+        private static SqliteRecordingsIndex recordings_index;
         private static DVB.Settings settings;
 
         public TimersStore get_timers_store () {
@@ -77,6 +78,21 @@ namespace DVB {
         	return epgstore;
         }
 
+        public RecordingsIndex? get_recordings_index () {
+            lock (recordings_index) {
+        	if (recordings_index == null) {
+        		recordings_index = new SqliteRecordingsIndex ();
+                try {
+                    recordings_index.open ();
+                } catch (SqlError e) {
+                    log.error ("%s", e.message);
+                    recordings_index = null;
+                }
+        	}
+            }
+        	return recordings_index;
+        }
+
         public DVB.Settings get_settings () {
             lock(settings) {
             if (settings == null) {
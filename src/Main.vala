@@ -28,8 +28,9 @@ namespace Main {
     private static bool disable_epg_scanner;
     private static bool disable_mediaserver;
     private static MainLoop mainloop;
+    // monotonic time when the daemon has been started
+    private static int64 start_time;
     public static DVB.Logging.Logger log;
-    public static DBusConnection conn;
 
     const OptionEntry[] options =  {
         { "debug", 'd', 0, OptionArg.NONE, out has_debug,
@@ -46,25 +47,38 @@ namespace Main {
 
     private static void start_manager () {
         manager = DVB.Manager.get_instance ();
+        log_startup_phase ("Created manager");
         DVB.Utils.dbus_own_name (DVB.Constants.DBUS_SERVICE,
             on_bus_acquired);
     }
 
     private static void on_bus_acquired (DBusConnection _conn) {
+        log_startup_phase ("Acquired D-Bus name");
         DVB.Utils.dbus_register_object<DVB.IDBusManager> (_conn,
             DVB.Constants.DBUS_MANAGER_PATH, manager);
-        conn = _conn;
+        DVB.Manager.conn = _conn;
 
         restore_device_groups ();
+        log_startup_phase ("Restored device groups");
 
         start_recordings_store ();
+        log_startup_phase ("Registered all D-Bus services");
+    }
+
+    /**
+     * Log how long it took since the start of the daemon
+     * to reach @phase
+     */
+    private static void log_startup_phase (string phase) {
+        log.info ("Startup: %s after %.3f seconds", phase,
+            (get_monotonic_time () - start_time) / 1000000.0);
     }
 
     private static void start_recordings_store () {
         log.info ("Creating new RecordingsStore D-Bus service");
 
         recstore = DVB.RecordingsStore.get_instance ();
-        DVB.Utils.dbus_register_object<DVB.IDBusRecordingsStore> (conn,
+        DVB.Utils.dbus_register_object<DVB.IDBusRecordingsStore> (DVB.Manager.conn,
                 DVB.Constants.DBUS_RECORDINGS_STORE_PATH, recstore);
     }
 
@@ -72,6 +86,7 @@ namespace Main {
         log.info ("Exiting");
 
         DVB.RTSPServer.shutdown ();
+        DVB.Schedule.stop_restoring ();
         DVB.Manager.shutdown ();
         new DVB.Factory().shutdown ();
         DVB.RecordingsStore.shutdown ();
@@ -83,10 +98,6 @@ namespace Main {
         mainloop.quit ();
     }
 
-    public static bool get_disable_epg_scanner () {
-        return Main.disable_epg_scanner;
-    }
-
     private static bool check_feature_version (string name, uint major,
             uint minor, uint micro) {
         Gst.Registry reg = Gst.Registry.get ();
@@ -182,6 +193,8 @@ namespace Main {
     }
 
     public static int main (string[] args) {
+        start_time = get_monotonic_time ();
+
         // set timezone to avoid that strftime stats /etc/localtime on every call
         Environment.set_variable ("TZ", "/etc/localtime", false);
 
@@ -200,6 +213,8 @@ namespace Main {
             return 1;
         }
 
+        DVB.Manager.disable_epg_scanner = disable_epg_scanner;
+
         if (has_version) {
             stdout.printf (Config.PACKAGE_NAME);
             stdout.printf (" %s\n", Config.PACKAGE_VERSION);
@@ -33,6 +33,17 @@ namespace DVB {
 
         private static Logger log = LogManager.getLogManager().getDefaultLogger();
 
+        /**
+         * Whether scanning for EPG data has been disabled
+         * on the command line
+         */
+        public static bool disable_epg_scanner;
+
+        /**
+         * Connection that the daemon's objects are exported on
+         */
+        public static DBusConnection conn;
+
         public Gee.Collection<DeviceGroup> device_groups {
             owned get {
                 return this.groups.values;
@@ -152,7 +163,7 @@ namespace DVB {
                     /* change to universal Scanner */
                     data.scanner = new Scanner (device, type);
 
-                    Utils.dbus_register_object (Main.conn, path, (IDBusScanner)data.scanner);
+                    Utils.dbus_register_object (conn, path, (IDBusScanner)data.scanner);
 
                     data.signal_id = data.scanner.destroyed.connect (this.on_scanner_destroyed);
 
@@ -387,6 +398,28 @@ namespace DVB {
             return true;
         }
 
+        /**
+         * @returns: Adapter, frontend, type and name of
+         * all connected devices
+         */
+        public FrontendInfo[] GetAllAdapterInfos () throws DBusError {
+            FrontendInfo[] infos;
+            lock (this.devices) {
+                infos = new FrontendInfo[this.devices.size];
+                for (int i = 0; i < infos.length; i++) {
+                    Device dev = this.devices.get (i);
+                    infos[i] = FrontendInfo ();
+                    infos[i].adapter = dev.Adapter;
+                    infos[i].frontend = dev.Frontend;
+                    infos[i].name = dev.Name;
+                    infos[i].type_t = dev.isTerrestrial ();
+                    infos[i].type_s = dev.isSatellite ();
+                    infos[i].type_c = dev.isCable ();
+                }
+            }
+            return infos;
+        }
+
         /**
          * @returns: Whether the device has been added successfully
          *
@@ -417,7 +450,7 @@ namespace DVB {
             devgroup.device_removed.connect (this.on_device_removed_from_group);
 
             string path = Constants.DBUS_DEVICE_GROUP_PATH.printf (group_id);
-            Utils.dbus_register_object<IDBusDeviceGroup> (Main.conn,
+            Utils.dbus_register_object<IDBusDeviceGroup> (conn,
                 path, devgroup);
 
             if (group_id > device_group_counter)
@@ -454,16 +487,16 @@ namespace DVB {
             }
 
             uint32 max_id = 0;
-            Recorder rec = device_group.recorder;
             foreach (Timer t in timers) {
                 if (t.Id > max_id) max_id = t.Id;
-                uint32 rec_id;
-                if (!rec.add_timer (t, out rec_id)) {
-                    try {
-                        timers_store.remove_timer_from_device_group (t.Id, device_group);
-                    } catch (SqlError e) {
-                        log.error ("Failed removing timer: %s", e.message);
-                    }
+            }
+
+            Recorder rec = device_group.recorder;
+            foreach (Timer t in rec.restore_timers (timers)) {
+                try {
+                    timers_store.remove_timer_from_device_group (t.Id, device_group);
+                } catch (SqlError e) {
+                    log.error ("Failed removing timer: %s", e.message);
                 }
             }
 
@@ -582,6 +615,7 @@ namespace DVB {
                             new Factory().get_epg_store ().remove_events_of_group (
                                 devgroup.Id
                             );
+                            EventCache.get_instance ().clear ();
                             new Factory().get_timers_store ().remove_all_timers_from_device_group (
                                 devgroup.Id
                             );
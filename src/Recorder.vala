@@ -42,24 +42,38 @@ namespace DVB {
         // Contains timer ids
         private Set<uint32> active_timers;
 
-        private bool have_check_timers_timeout;
-        private uint check_timers_event_id;
+        // Timers ordered by the time they have to be started or stopped
+        private TimerQueue deadlines;
+        private uint deadline_source_id;
         // Maps timer id to timer
         private HashMap<uint32, Timer> timers;
+        // Maps channel SID to the channel's timers
+        private HashMap<uint, TimerIndex> channel_timers;
+        // Maps timer id to the index of the planned device,
+        // null if timers changed since the last plan
+        private HashMap<uint32, int>? timer_plan;
+        private Gee.List<uint32> conflicting_timers;
         // Maps timer id to Recording
         private Map<uint, Recording> recordings;
 
-        private const int CHECK_TIMERS_INTERVAL = 5;
+        // Retry starting a recording that failed after this many seconds
+        private const int START_RETRY_INTERVAL = 5;
+        // Check timers at least this often in seconds,
+        // in case the system clock changed
+        private const int MAX_DEADLINE_INTERVAL = 60;
         private const string ATTRIBUTES = FileAttribute.STANDARD_TYPE + "," + FileAttribute.ACCESS_CAN_WRITE;
 
         construct {
             this.active_timers = new HashSet<uint32> ();
             this.timers = new HashMap<uint, Timer> ();
-            this.have_check_timers_timeout = false;
+            this.channel_timers = new HashMap<uint, TimerIndex> ();
+            this.timer_plan = null;
+            this.conflicting_timers = new ArrayList<uint32> ();
+            this.deadlines = new TimerQueue ();
+            this.deadline_source_id = 0;
             RecordingsStore.get_instance ().restore_from_dir (
                 this.DeviceGroup.RecordingsDirectory);
             this.recordings = new HashMap<uint, Recording> ();
-            this.check_timers_event_id = 0;
         }
 
         public Recorder (DVB.DeviceGroup dev) {
@@ -152,24 +166,28 @@ namespace DVB {
                 return ret;
 
             lock (this.timers) {
+                // Check whether less timers could be recorded
+                this.update_plan ();
+                TimerPlanner planner = this.create_planner ();
+                planner.add (new_timer.Id, new_timer.Channel.Param.Frequency,
+                    new_timer.get_start_time_timestamp (),
+                    new_timer.get_end_time_timestamp (), false);
+                Gee.List<uint32> conflicts;
+                HashMap<uint32, int> plan = planner.plan (out conflicts);
+
+                // Reject the timer if it can't be recorded or if a
+                // timer that could be recorded before can't anymore
                 bool has_conflict = false;
-                int conflict_count = 0;
-
-                // Check for conflicts
-                foreach (uint32 key in this.timers.keys) {
-                    if (this.timers.get(key).conflicts_with (new_timer)) {
-                        conflict_count++;
-
-                        if (conflict_count >= this.DeviceGroup.size) {
-                            log.debug ("Timer is conflicting with another timer: %s",
-                                this.timers.get(key).to_string ());
-                            has_conflict = true;
-                            break;
-                        }
+                foreach (uint32 conflict_id in conflicts) {
+                    if (!this.conflicting_timers.contains (conflict_id)) {
+                        has_conflict = true;
+                        break;
                     }
                 }
-
-                if (!has_conflict) {
+                if (has_conflict) {
+                    log.debug ("Timer is conflicting with other timers: %s",
+                        new_timer.to_string ());
+                } else {
                     this.timers.set (new_timer.Id, new_timer);
                     try {
                         ret = new Factory().get_timers_store ().add_timer_to_device_group (new_timer,
@@ -178,13 +196,10 @@ namespace DVB {
                         log.error ("%s", e.message);
                     }
 
-                    if (this.timers.size == 1 && !this.have_check_timers_timeout) {
-                        log.debug ("Creating new check timers");
-                        this. check_timers_event_id = Timeout.add_seconds (
-                            CHECK_TIMERS_INTERVAL, this.check_timers
-                        );
-                        this.have_check_timers_timeout = true;
-                    }
+                    this.schedule_timer (new_timer);
+                    // The trial plan already contains the new timer
+                    this.timer_plan = plan;
+                    this.conflicting_timers = conflicts;
 
                     timer_id = new_timer.Id;
                 }
@@ -196,6 +211,36 @@ namespace DVB {
             return ret;
         }
 
+        /**
+         * @stored_timers: Timers of the device group in the timers store
+         * @returns: Timers that expired and haven't been restored
+         *
+         * Add timers that were stored before without checking them
+         * for conflicts one by one, and plan all of them at once.
+         * Whether a timer conflicts must not depend on the order
+         * the timers are restored in.
+         */
+        public Gee.List<Timer> restore_timers (Collection<Timer> stored_timers) {
+            var expired = new ArrayList<Timer> ();
+            lock (this.timers) {
+                foreach (Timer timer in stored_timers) {
+                    if (timer.has_expired ()) {
+                        expired.add (timer);
+                        continue;
+                    }
+                    this.timers.set (timer.Id, timer);
+                    this.schedule_timer (timer);
+                }
+                this.update_plan ();
+                foreach (uint32 timer_id in this.conflicting_timers) {
+                    log.debug ("Restored timer is conflicting with other timers: %s",
+                        this.timers.get (timer_id).to_string ());
+                }
+            }
+
+            return expired;
+        }
+
         /**
          * @event_id: id of the EPG event
          * @channel_sid: SID of channel
@@ -240,12 +285,13 @@ namespace DVB {
             bool ret = false;
             lock (this.timers) {
                 if (this.timers.has_key (timer_id)) {
+                    Timer timer = this.timers.get (timer_id);
                     if (this.is_timer_active (timer_id)) {
                         // Abort recording
-                        Timer timer = this.timers.get (timer_id);
                         this.stop_recording (timer);
                     }
                     this.timers.unset (timer_id);
+                    this.unschedule_timer (timer);
                     try {
                         ret = new Factory().get_timers_store ().remove_timer_from_device_group (
                             timer_id, this.DeviceGroup);
@@ -325,6 +371,7 @@ namespace DVB {
                         Timer timer = this.timers.get (timer_id);
                         timer.set_start_time (start_year, start_month,
                             start_day, start_hour, start_minute);
+                        this.schedule_timer (timer);
 
                         try {
                             ret = new Factory().get_timers_store ().update_timer (
@@ -398,6 +445,7 @@ namespace DVB {
                 if (ret) {
                     Timer timer = this.timers.get (timer_id);
                     timer.Duration = duration;
+                    this.schedule_timer (timer);
 
                     try {
                         ret = new Factory().get_timers_store ().update_timer (
@@ -553,45 +601,128 @@ namespace DVB {
         public OverlapType HasTimerForEvent (uint event_id, uint channel_sid)
                 throws DBusError
         {
-            EPGStore epgstore = new Factory().get_epg_store ();
-            Event? event = null;
-            try {
-                event = epgstore.get_event (event_id, channel_sid,
-                    this.DeviceGroup.Id);
-            } catch (SqlError e) {
-                log.error ("%s", e.message);
-            }
-            if (event == null) {
-                log.debug ("Could not find event with id %u", event_id);
-                return OverlapType.UNKNOWN;
+            return this.HasTimersForEvents (channel_sid,
+                new uint[] { event_id })[0];
+        }
+
+        /**
+         * @channel_sid: SID of channel
+         * @event_ids: ids of EPG events of the channel
+         * @returns: How the timers overlap with each event
+         * or OverlapType.UNKNOWN if the event doesn't exist
+         */
+        public OverlapType[] HasTimersForEvents (uint channel_sid,
+                uint[] event_ids) throws DBusError
+        {
+            OverlapType[] overlaps = new OverlapType[event_ids.length];
+
+            Channel? channel = this.DeviceGroup.Channels.get_channel (
+                channel_sid);
+            if (channel == null) {
+                for (int i = 0; i < event_ids.length; i++)
+                    overlaps[i] = OverlapType.UNKNOWN;
+                return overlaps;
             }
 
-            OverlapType val= OverlapType.NONE;
+            Schedule schedule = channel.Schedule;
             lock (this.timers) {
-                foreach (uint32 key in this.timers.keys) {
-                    Timer timer = this.timers.get (key);
+                TimerIndex? index = this.channel_timers.get (channel_sid);
+                for (int i = 0; i < event_ids.length; i++) {
+                    int64 start;
+                    uint duration;
+                    if (!schedule.get_event_time (event_ids[i], out start,
+                            out duration)) {
+                        log.debug ("Could not find event with id %u",
+                            event_ids[i]);
+                        overlaps[i] = OverlapType.UNKNOWN;
+                    } else if (index == null) {
+                        overlaps[i] = OverlapType.NONE;
+                    } else {
+                        overlaps[i] = index.get_overlap (start,
+                            start + duration);
+                    }
+                }
+            }
 
-                    if (timer.Channel.Sid == channel_sid) {
-                        OverlapType overlap = timer.get_overlap_utc (
-                            event.year, event.month, event.day, event.hour,
-                            event.minute, event.duration/60);
+            return overlaps;
+        }
 
-                        if (overlap == OverlapType.PARTIAL
-                                || overlap == OverlapType.COMPLETE) {
-                            val = overlap;
-                            break;
-                        }
+        /**
+         * @returns: How the timers of the channel with SID @channel_sid
+         * overlap with @event
+         */
+        public OverlapType get_timer_overlap (Event event, uint channel_sid) {
+            int64 start = (int64)cUtils.timegm (event.get_utc_start_time ());
+            lock (this.timers) {
+                TimerIndex? index = this.channel_timers.get (channel_sid);
+                if (index == null)
+                    return OverlapType.NONE;
+                return index.get_overlap (start, start + event.duration);
+            }
+        }
+
+        /**
+         * @returns: The device each timer will be recorded with,
+         * sorted by start time of the timers
+         */
+        public TimerPlanInfo[] GetTimerPlan () throws DBusError {
+            TimerPlanInfo[] infos;
+            lock (this.timers) {
+                this.update_plan ();
+                Gee.List<Device> devices = this.get_plan_devices ();
+
+                var sorted_timers = new ArrayList<Timer> ();
+                sorted_timers.add_all (this.timers.values);
+                sorted_timers.sort ((a, b) => {
+                    time_t a_start = a.get_start_time_timestamp ();
+                    time_t b_start = b.get_start_time_timestamp ();
+                    if (a_start < b_start) return -1;
+                    else if (a_start > b_start) return +1;
+                    else return 0;
+                });
+
+                infos = new TimerPlanInfo[sorted_timers.size];
+                for (int i = 0; i < infos.length; i++) {
+                    Timer timer = sorted_timers.get (i);
+                    int device = this.timer_plan.get (timer.Id);
+
+                    infos[i] = TimerPlanInfo ();
+                    infos[i].timer_id = timer.Id;
+                    infos[i].conflicting = (device == -1);
+                    if (device == -1) {
+                        infos[i].adapter = 0;
+                        infos[i].frontend = 0;
+                    } else {
+                        infos[i].adapter = devices.get (device).Adapter;
+                        infos[i].frontend = devices.get (device).Frontend;
                     }
                 }
             }
+            return infos;
+        }
 
-            return val;
+        /**
+         * @returns: Ids of timers that can't be recorded,
+         * because all devices are busy
+         */
+        public uint32[] GetConflictingTimers () throws DBusError {
+            uint32[] timer_ids;
+            lock (this.timers) {
+                this.update_plan ();
+                timer_ids = new uint32[this.conflicting_timers.size];
+                for (int i = 0; i < timer_ids.length; i++)
+                    timer_ids[i] = this.conflicting_timers.get (i);
+            }
+            return timer_ids;
         }
 
         public void stop () {
-            if (this.check_timers_event_id > 0)
-                Source.remove (this.check_timers_event_id);
             lock (this.timers) {
+                if (this.deadline_source_id != 0) {
+                    Source.remove (this.deadline_source_id);
+                    this.deadline_source_id = 0;
+                }
+                this.deadlines.clear ();
                 foreach (uint32 timer_id in this.active_timers) {
                     Timer timer = this.timers.get (timer_id);
                     this.stop_recording (timer);
@@ -642,7 +773,7 @@ namespace DVB {
 
             ChannelFactory channel_factory = this.DeviceGroup.channel_factory;
             PlayerThread? player = channel_factory.watch_channel (channel,
-                filesink, true);
+                filesink, true, null, this.get_planned_device (timer));
             if (player != null) {
                 log.debug ("Setting pipeline to playing");
                 Gst.StateChangeReturn ret = player.get_pipeline().set_state (
@@ -714,8 +845,9 @@ namespace DVB {
             lock (this.timers) {
                 this.active_timers.remove (timer_id);
                 this.timers.unset (timer_id);
+                this.unschedule_timer (timer);
             }
-            rec.monitor_recording ();
+            RecordingsStore.get_instance ().monitor_recording (rec);
 
             this.changed (timer_id, ChangeType.DELETED);
 
@@ -772,66 +904,178 @@ namespace DVB {
             return recording;
         }
 
-        private bool check_timers () {
-            log.debug ("Checking timers");
-
-            bool val;
-            SList<Timer> ended_recordings =
-                new SList<Timer> ();
+        /**
+         * Add @timer to the queue of deadlines and the index of its
+         * channel or update it if its start time or duration changed
+         */
+        private void schedule_timer (Timer timer) {
             lock (this.timers) {
-                foreach (uint32 timer_id in this.active_timers) {
-                    Timer timer =
-                        this.timers.get (timer_id);
-                    if (timer.is_end_due()) {
-                        ended_recordings.prepend (timer);
-                    }
+                this.timer_plan = null;
+                uint sid = timer.Channel.Sid;
+                TimerIndex? index = this.channel_timers.get (sid);
+                if (index == null) {
+                    index = new TimerIndex ();
+                    this.channel_timers.set (sid, index);
                 }
+                index.add (timer);
+
+                time_t deadline;
+                if (this.active_timers.contains (timer.Id))
+                    deadline = timer.get_end_time_timestamp ();
+                else
+                    deadline = timer.get_start_time_timestamp ();
+                this.deadlines.schedule (timer.Id, deadline);
+                this.arm_deadline_timeout ();
+            }
+        }
 
-                // Delete timers of recordings that have ended
-                for (int i=0; i<ended_recordings.length(); i++) {
-                    Timer timer = ended_recordings.nth_data (i);
-                    this.stop_recording (timer);
+        private void unschedule_timer (Timer timer) {
+            lock (this.timers) {
+                this.timer_plan = null;
+                uint sid = timer.Channel.Sid;
+                TimerIndex? index = this.channel_timers.get (sid);
+                if (index != null) {
+                    index.remove (timer.Id);
+                    if (index.is_empty)
+                        this.channel_timers.unset (sid);
                 }
 
-                // Store items we want to delete in here
-                SList<uint32> deleteable_items = new SList<uint32> ();
+                if (this.deadlines.unschedule (timer.Id))
+                    this.arm_deadline_timeout ();
+            }
+        }
 
-                foreach (uint32 key in this.timers.keys) {
-                    Timer timer = this.timers.get (key);
-
-                    log.debug ("Checking timer: %s", timer.to_string());
-
-                    // Check if we should start new recording and if we didn't
-                    // start it before
-                    if (timer.is_start_due()
-                            && !this.active_timers.contains (timer.Id)) {
-                        this.start_recording (timer);
-                    } else if (timer.has_expired()) {
-                        log.debug ("Removing expired timer: %s", timer.to_string());
-                        deleteable_items.prepend (key);
-                    }
-                }
+        /**
+         * Wake up when the earliest deadline is due
+         */
+        private void arm_deadline_timeout () {
+            if (this.deadline_source_id != 0) {
+                Source.remove (this.deadline_source_id);
+                this.deadline_source_id = 0;
+            }
+
+            uint32 timer_id;
+            int64 deadline;
+            if (!this.deadlines.peek (out timer_id, out deadline))
+                return;
+
+            int64 delay = deadline * 1000 - get_real_time () / 1000;
+            delay = delay.clamp (0, MAX_DEADLINE_INTERVAL * 1000);
+            this.deadline_source_id = Timeout.add ((uint)delay,
+                this.on_deadline);
+        }
 
-                // Delete items from this.timers using this.DeleteTimer
-                for (int i=0; i<deleteable_items.length(); i++) {
-                    this.delete_timer (deleteable_items.nth_data (i));
+        private bool on_deadline () {
+            lock (this.timers) {
+                this.deadline_source_id = 0;
+
+                uint32 timer_id;
+                int64 deadline;
+                while (this.deadlines.peek (out timer_id, out deadline)
+                        && deadline <= (int64)time_t ()) {
+                    Timer? timer = this.timers.get (timer_id);
+                    if (timer == null)
+                        this.deadlines.unschedule (timer_id);
+                    else
+                        this.handle_due_timer (timer);
                 }
 
-                if (this.timers.size == 0 && this.active_timers.size == 0) {
-                    // We don't have any timers and no recording is in progress
-                    log.debug ("No timers left and no recording in progress");
-                    this.have_check_timers_timeout = false;
-                    this.check_timers_event_id = 0;
-                    val = false;
+                log.debug ("%d timers and %d active recordings left",
+                    this.timers.size, this.active_timers.size);
+                this.arm_deadline_timeout ();
+            }
+            return false;
+        }
+
+        /**
+         * Start or stop the recording of @timer, whose deadline is due
+         */
+        private void handle_due_timer (Timer timer) {
+            time_t now = time_t ();
+
+            if (this.active_timers.contains (timer.Id)) {
+                if (timer.get_end_time_timestamp () <= now) {
+                    this.stop_recording (timer);
+                } else {
+                    this.deadlines.schedule (timer.Id,
+                        timer.get_end_time_timestamp ());
+                }
+            } else if (timer.has_expired ()) {
+                log.debug ("Removing expired timer: %s", timer.to_string());
+                this.delete_timer (timer.Id);
+            } else if (timer.get_start_time_timestamp () <= now) {
+                this.start_recording (timer);
+                if (this.active_timers.contains (timer.Id)) {
+                    // Recording timers must not be dropped from the plan
+                    this.timer_plan = null;
+                    this.deadlines.schedule (timer.Id,
+                        timer.get_end_time_timestamp ());
                 } else {
-                    // We still have timers
-                    log.debug ("%d timers and %d active recordings left",
-                        this.timers.size,
-                        this.active_timers.size);
-                    val = true;
+                    this.deadlines.schedule (timer.Id,
+                        now + START_RETRY_INTERVAL);
                 }
+            } else {
+                this.deadlines.schedule (timer.Id,
+                    timer.get_start_time_timestamp ());
+            }
+        }
+
+        /**
+         * @returns: Planner with all timers
+         */
+        private TimerPlanner create_planner () {
+            var planner = new TimerPlanner (this.DeviceGroup.size);
+            foreach (Timer timer in this.timers.values) {
+                planner.add (timer.Id, timer.Channel.Param.Frequency,
+                    timer.get_start_time_timestamp (),
+                    timer.get_end_time_timestamp (),
+                    this.active_timers.contains (timer.Id));
+            }
+            return planner;
+        }
+
+        private void update_plan () {
+            lock (this.timers) {
+                if (this.timer_plan == null) {
+                    Gee.List<uint32> conflicts;
+                    this.timer_plan = this.create_planner ().plan (
+                        out conflicts);
+                    this.conflicting_timers = conflicts;
+                }
+            }
+        }
+
+        /**
+         * @returns: Devices of the group in the order used by the plan
+         */
+        private Gee.List<Device> get_plan_devices () {
+            var devices = new ArrayList<Device> ();
+            devices.add_all (this.DeviceGroup.Devices);
+            devices.sort ((a, b) => {
+                if (a.Adapter != b.Adapter)
+                    return (a.Adapter < b.Adapter) ? -1 : +1;
+                if (a.Frontend != b.Frontend)
+                    return (a.Frontend < b.Frontend) ? -1 : +1;
+                return 0;
+            });
+            return devices;
+        }
+
+        /**
+         * @returns: The device planned for @timer or NULL if
+         * all devices are planned to be busy
+         */
+        private Device? get_planned_device (Timer timer) {
+            lock (this.timers) {
+                this.update_plan ();
+                if (!this.timer_plan.has_key (timer.Id))
+                    return null;
+                int device = this.timer_plan.get (timer.Id);
+                if (device == -1)
+                    return null;
+                Gee.List<Device> devices = this.get_plan_devices ();
+                return (device < devices.size) ? devices.get (device) : null;
             }
-            return val;
         }
 
         private void on_eit_structure (PlayerThread player, Section section) {
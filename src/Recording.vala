@@ -37,7 +37,6 @@ namespace DVB {
         public string? Description {get; set;}
         public GLib.Time StartTime {get; set;}
         public int64 Length {get; set;}
-        public FileMonitor file_monitor {get; set;}
 
         public uint[] get_start () {
             return new uint[] {
@@ -49,15 +48,6 @@ namespace DVB {
             };
         }
 
-        public void monitor_recording () {
-            try {
-                this.file_monitor = this.Location.monitor_file (0, null);
-                this.file_monitor.changed.connect (this.on_recording_file_changed);
-            } catch (Error e) {
-                warning ("Could not create FileMonitor: %s", e.message);
-            }
-        }
-
         public void save_to_disk () {
             var writer = new io.RecordingWriter (this);
             try {
@@ -66,18 +56,6 @@ namespace DVB {
                 log.error ("Could not save recording: %s", e.message);
             }
         }
-
-        private void on_recording_file_changed (FileMonitor monitor,
-                File file, File? other_file, FileMonitorEvent event) {
-            if (event == FileMonitorEvent.DELETED) {
-                string location = file.get_path ();
-                log.debug ("%s has been deleted", location);
-
-                monitor.cancel ();
-
-                RecordingsStore.get_instance().remove (this);
-            }
-        }
     }
 
 }
@@ -32,12 +32,37 @@ namespace DVB {
 
         private HashMap<uint32, Recording> recordings;
         private uint32 last_id;
+        private ArrayList<uint32> pending_ids;
+        private ArrayList<uint> pending_types;
+        private uint changed_bulk_source;
+        // Maps the directory of each recording to the recording
+        private HashMap<string, Recording> recording_dirs;
+        // Monitors the recording directories of each channel directory
+        private HashMap<string, FileMonitor> channel_monitors;
+        // Number of monitored recordings in each channel directory
+        private HashMap<string, int> channel_n_recordings;
+        private HashSet<uint32> monitored_ids;
+        private ArrayList<io.RecordingReader> readers;
+        private uint check_source;
         private static RecordingsStore instance;
         private static RecMutex instance_mutex = RecMutex ();
 
+        // Seconds to wait before checking for new recordings
+        // after a directory has been created
+        private const int NEW_DIRECTORY_CHECK_DELAY = 10;
+
         construct {
             this.recordings = new HashMap <uint32, Recording> ();
             this.last_id = 0;
+            this.pending_ids = new ArrayList<uint32> ();
+            this.pending_types = new ArrayList<uint> ();
+            this.changed_bulk_source = 0;
+            this.recording_dirs = new HashMap<string, Recording> ();
+            this.channel_monitors = new HashMap<string, FileMonitor> ();
+            this.channel_n_recordings = new HashMap<string, int> ();
+            this.monitored_ids = new HashSet<uint32> ();
+            this.readers = new ArrayList<io.RecordingReader> ();
+            this.check_source = 0;
         }
 
         public static unowned RecordingsStore get_instance () {
@@ -53,6 +78,11 @@ namespace DVB {
             instance_mutex.lock ();
             RecordingsStore rs = instance;
             if (rs != null) {
+                if (rs.check_source != 0)
+                    Source.remove (rs.check_source);
+                foreach (FileMonitor monitor in rs.channel_monitors.values)
+                    monitor.cancel ();
+                rs.channel_monitors.clear ();
                 rs.recordings.clear ();
                 instance = null;
             }
@@ -79,23 +109,189 @@ namespace DVB {
                 }
 
                 this.recordings.set (id, rec);
-                this.changed (id, ChangeType.ADDED);
+                string? dir = get_recording_dir (rec);
+                if (dir != null)
+                    this.recording_dirs.set (dir, rec);
+                this.emit_changed (id, ChangeType.ADDED);
             }
             return true;
         }
 
         public bool add_and_monitor (Recording rec) {
             if (this.add (rec)) {
-                rec.monitor_recording ();
+                this.monitor_recording (rec);
                 return true;
             }
             return false;
         }
 
+        /**
+         * Remove @rec when its directory is deleted
+         *
+         * A single monitor watches the directories of all
+         * recordings of a channel.
+         */
+        public void monitor_recording (Recording rec) {
+            string? channel_dir = get_channel_dir (rec);
+            if (channel_dir == null)
+                return;
+
+            lock (this.recordings) {
+                if (this.monitored_ids.contains (rec.Id))
+                    return;
+
+                if (this.channel_monitors.has_key (channel_dir)) {
+                    this.channel_n_recordings.set (channel_dir,
+                        this.channel_n_recordings.get (channel_dir) + 1);
+                } else {
+                    FileMonitor monitor;
+                    try {
+                        monitor = rec.Location.get_parent ().get_parent ()
+                            .monitor_directory (FileMonitorFlags.NONE, null);
+                    } catch (Error e) {
+                        log.warning ("Could not create FileMonitor: %s",
+                            e.message);
+                        return;
+                    }
+                    monitor.changed.connect (this.on_channel_dir_changed);
+                    this.channel_monitors.set (channel_dir, monitor);
+                    this.channel_n_recordings.set (channel_dir, 1);
+                }
+                this.monitored_ids.add (rec.Id);
+            }
+        }
+
+        private void unmonitor_recording (Recording rec) {
+            string? channel_dir = get_channel_dir (rec);
+            if (channel_dir == null || !this.monitored_ids.remove (rec.Id))
+                return;
+
+            int n_recordings = this.channel_n_recordings.get (channel_dir) - 1;
+            if (n_recordings > 0) {
+                this.channel_n_recordings.set (channel_dir, n_recordings);
+            } else {
+                this.channel_n_recordings.unset (channel_dir);
+                FileMonitor monitor = this.channel_monitors.get (channel_dir);
+                this.channel_monitors.unset (channel_dir);
+                monitor.cancel ();
+            }
+        }
+
+        private void on_channel_dir_changed (FileMonitor monitor,
+                File file, File? other_file, FileMonitorEvent event) {
+            if (event == FileMonitorEvent.CREATED) {
+                // Check new directories for recordings
+                // once they have been copied, even if regular
+                // checks are turned off
+                if (this.check_source != 0)
+                    Source.remove (this.check_source);
+                this.check_source = Timeout.add_seconds (
+                    NEW_DIRECTORY_CHECK_DELAY, this.check_recordings);
+                return;
+            }
+
+            if (event != FileMonitorEvent.DELETED)
+                return;
+
+            string path = file.get_path ();
+            lock (this.recordings) {
+                var deleted = new ArrayList<Recording> ();
+                if (this.recording_dirs.has_key (path)) {
+                    deleted.add (this.recording_dirs.get (path));
+                } else if (this.channel_monitors.has_key (path)) {
+                    // The channel directory itself has been deleted
+                    foreach (Recording rec in this.recording_dirs.values) {
+                        if (get_channel_dir (rec) == path)
+                            deleted.add (rec);
+                    }
+                }
+
+                foreach (Recording rec in deleted) {
+                    log.debug ("%s has been deleted",
+                        get_recording_dir (rec));
+                    this.remove (rec);
+                }
+            }
+        }
+
         public void remove (Recording rec) {
             uint32 rec_id = rec.Id;
-            this.recordings.unset (rec_id);
-            this.changed (rec_id, ChangeType.DELETED);
+            lock (this.recordings) {
+                // Another recording may have the same id
+                if (this.recordings.get (rec_id) != rec)
+                    return;
+                this.unmonitor_recording (rec);
+                string? dir = get_recording_dir (rec);
+                if (dir != null && this.recording_dirs.get (dir) == rec)
+                    this.recording_dirs.unset (dir);
+                this.recordings.unset (rec_id);
+                this.emit_changed (rec_id, ChangeType.DELETED);
+            }
+        }
+
+        /**
+         * Emit changed right away and queue the change
+         * for the next emission of changed_bulk
+         */
+        private void emit_changed (uint32 rec_id, ChangeType type) {
+            this.changed (rec_id, type);
+
+            lock (this.pending_ids) {
+                this.pending_ids.add (rec_id);
+                this.pending_types.add (type);
+                if (this.changed_bulk_source == 0) {
+                    this.changed_bulk_source = Idle.add (
+                        this.emit_changed_bulk);
+                }
+            }
+        }
+
+        private bool emit_changed_bulk () {
+            uint32[] rec_ids;
+            uint[] types;
+            lock (this.pending_ids) {
+                rec_ids = new uint32[this.pending_ids.size];
+                types = new uint[rec_ids.length];
+                for (int i=0; i<rec_ids.length; i++) {
+                    rec_ids[i] = this.pending_ids.get (i);
+                    types[i] = this.pending_types.get (i);
+                }
+                this.pending_ids.clear ();
+                this.pending_types.clear ();
+                this.changed_bulk_source = 0;
+            }
+
+            this.changed_bulk (rec_ids, types);
+            return false;
+        }
+
+        /**
+         * @directory: Path of the directory containing the recording
+         * @returns: The recording or NULL
+         */
+        public Recording? get_recording_in_directory (string directory) {
+            Recording? rec;
+            lock (this.recordings) {
+                rec = this.recording_dirs.get (directory);
+            }
+            return rec;
+        }
+
+        private static string? get_recording_dir (Recording rec) {
+            if (rec.Location == null)
+                return null;
+            File? dir = rec.Location.get_parent ();
+            return (dir == null) ? null : dir.get_path ();
+        }
+
+        private static string? get_channel_dir (Recording rec) {
+            if (rec.Location == null)
+                return null;
+            File? dir = rec.Location.get_parent ();
+            if (dir == null)
+                return null;
+            dir = dir.get_parent ();
+            return (dir == null) ? null : dir.get_path ();
         }
 
         public uint32 get_next_id () {
@@ -294,20 +490,12 @@ namespace DVB {
 
         public bool GetAllInformations (uint32 rec_id, out RecordingInfo info) throws DBusError {
             bool ret;
-            info = RecordingInfo ();
             lock (this.recordings) {
                 if (this.recordings.has_key (rec_id)) {
-                    Recording rec = this.recordings.get (rec_id);
-                    string name = rec.Name;
-                    info.name = (name == null) ? "" : name;
-                    info.id = rec_id;
-                    info.length = rec.Length;
-                    info.description = (rec.Description == null) ? "" : rec.Description;
-                    info.location = rec.Location.get_path ();
-                    info.start_timestamp = (int64)rec.StartTime.mktime ();
-                    info.channel = rec.ChannelName;
+                    info = recording_to_info (this.recordings.get (rec_id));
                     ret = true;
                 } else {
+                    info = RecordingInfo ();
                     info.name = "";
                     info.id = 0;
                     info.length = 0;
@@ -321,9 +509,76 @@ namespace DVB {
             return ret;
         }
 
+        /**
+         * @returns: Informations about all recordings
+         */
+        public RecordingInfo[] GetAllRecordingInfos () throws DBusError {
+            RecordingInfo[] infos;
+            lock (this.recordings) {
+                infos = new RecordingInfo[this.recordings.size];
+
+                int i = 0;
+                foreach (Recording rec in this.recordings.values) {
+                    infos[i] = recording_to_info (rec);
+                    i++;
+                }
+            }
+            return infos;
+        }
+
+        private static RecordingInfo recording_to_info (Recording rec) {
+            RecordingInfo info = RecordingInfo ();
+            string name = rec.Name;
+            info.name = (name == null) ? "" : name;
+            info.id = rec.Id;
+            info.length = rec.Length;
+            info.description = (rec.Description == null) ? "" : rec.Description;
+            info.location = rec.Location.get_path ();
+            info.start_timestamp = (int64)rec.StartTime.mktime ();
+            info.channel = rec.ChannelName;
+            return info;
+        }
+
         public void restore_from_dir (File recordingsbasedir) {
+            foreach (io.RecordingReader reader in this.readers) {
+                // Device groups may share the recordings directory
+                if (reader.directory.equal (recordingsbasedir))
+                    return;
+            }
+
             var reader = new io.RecordingReader (recordingsbasedir, this);
+            this.readers.add (reader);
             reader.load_into ();
+
+            if (this.check_source == 0) {
+                int interval = new Factory().get_settings ()
+                    .get_recordings_check_interval ();
+                if (interval > 0) {
+                    this.check_source = Timeout.add_seconds (interval,
+                        this.check_recordings);
+                }
+            }
+        }
+
+        /**
+         * Check all recordings directories for changes
+         * the monitors missed, e.g. on network file systems
+         */
+        private bool check_recordings () {
+            foreach (io.RecordingReader reader in this.readers)
+                reader.check ();
+
+            // Restore the regular interval after a check
+            // of new directories
+            int interval = new Factory().get_settings ()
+                .get_recordings_check_interval ();
+            if (interval > 0) {
+                this.check_source = Timeout.add_seconds (interval,
+                    this.check_recordings);
+            } else {
+                this.check_source = 0;
+            }
+            return false;
         }
 
     }
@@ -37,24 +37,145 @@ namespace DVB {
         // Use weak to avoid ref cycle
         public weak Channel channel {get; construct;}
 
-        private static RecMutex mutex = RecMutex ();
+        // serializes transactions of all schedules
+        private static RecMutex writer_mutex = RecMutex ();
+
+        private static ThreadPool<Schedule>? restore_pool;
+        private static Mutex restore_mutex = Mutex ();
+        // number of schedules waiting to be restored in the background
+        private static int restore_pending = 0;
+        private static int restore_n_events;
+        private static int restore_n_schedules;
+        private static int64 restore_start_time;
 
         private EPGStore epgstore;
         private EventStorage events;
+        private unowned EventCache cache;
+        private bool restored;
 
         construct {
+            this.restored = false;
             this.events = new EventStorage ();
             this.epgstore = new Factory().get_epg_store ();
+            this.cache = EventCache.get_instance ();
+        }
+
+        /**
+         * Restore events of schedules in the background, schedules
+         * of the most popular channels first
+         */
+        public static void restore_in_background (Schedule schedule) {
+            restore_mutex.lock ();
+            if (restore_pool == null) {
+                int threads = new Factory().get_settings ().get_epg_database_readers ();
+                try {
+                    restore_pool = new ThreadPool<Schedule>.with_owned_data (
+                        (s) => { s.restore_with_report (); }, threads, false);
+                    restore_pool.set_sort_function (compare_popularity);
+                } catch (ThreadError e) {
+                    log.error ("Could not create thread pool: %s", e.message);
+                }
+            }
+            if (restore_pending == 0) {
+                restore_start_time = get_monotonic_time ();
+                restore_n_events = 0;
+                restore_n_schedules = 0;
+            }
+            restore_pending++;
+            if (restore_pool != null) {
+                try {
+                    restore_pool.add (schedule);
+                } catch (ThreadError e) {
+                    log.error ("%s", e.message);
+                    restore_pending--;
+                }
+            } else {
+                restore_pending--;
+            }
+            restore_mutex.unlock ();
+        }
+
+        /**
+         * Stop restoring schedules in the background
+         */
+        public static void stop_restoring () {
+            restore_mutex.lock ();
+            ThreadPool<Schedule>? pool = (owned)restore_pool;
+            restore_mutex.unlock ();
+            // Schedules that haven't been restored yet
+            // will be restored on first access
+            if (pool != null)
+                ThreadPool.free ((owned)pool, true, true);
+        }
+
+        /**
+         * Channels with a lower logical channel number come first,
+         * because they are the most popular ones
+         */
+        private static int compare_popularity (Schedule a, Schedule b) {
+            Channel? channel_a = a.channel;
+            Channel? channel_b = b.channel;
+            if (channel_a == null || channel_b == null)
+                return (channel_a == null) ? ((channel_b == null) ? 0 : 1) : -1;
+
+            uint? lcn_a = channel_a.LogicalChannelNumber;
+            uint? lcn_b = channel_b.LogicalChannelNumber;
+            if (lcn_a != null && lcn_b != null && lcn_a != lcn_b)
+                return (lcn_a < lcn_b) ? -1 : 1;
+            else if (lcn_a != null && lcn_b == null)
+                return -1;
+            else if (lcn_a == null && lcn_b != null)
+                return 1;
+
+            if (channel_a.Sid == channel_b.Sid) return 0;
+            return (channel_a.Sid < channel_b.Sid) ? -1 : 1;
         }
 
-        public async void restore () {
+        private void restore_with_report () {
+            int n_events = this.restore ();
+
+            restore_mutex.lock ();
+            restore_n_events += n_events;
+            if (n_events >= 0)
+                restore_n_schedules++;
+            restore_pending--;
+            if (restore_pending == 0) {
+                double duration = (get_monotonic_time () - restore_start_time)
+                    / 1000000.0;
+                log.info ("Restored %d EPG events of %d channels in %.3f seconds",
+                    restore_n_events, restore_n_schedules, duration);
+            }
+            restore_mutex.unlock ();
+        }
+
+        /**
+         * Load events from the EPG store, unless that has
+         * already been done
+         *
+         * @returns: The number of restored events or -1 if the
+         * schedule has already been restored
+         */
+        public int restore () {
+            lock (this.events) {
+                if (this.restored)
+                    return -1;
+                this.restored = true;
+
+                Channel? channel = this.channel;
+                if (channel == null)
+                    return -1;
+                return this.restore_events (channel);
+            }
+        }
+
+        private int restore_events (Channel channel) {
             Gee.List<Event> levents;
             try {
                 levents = this.epgstore.get_events (
-                    this.channel.Sid, this.channel.GroupId);
+                    channel.Sid, channel.GroupId);
             } catch (SqlError e1) {
                 log.error ("%s", e1.message);
-                return;
+                return 0;
             }
 
             int newest_expired = -1;
@@ -71,17 +192,20 @@ namespace DVB {
 
             if (newest_expired != -1) {
                 event = levents.get (newest_expired);
+                writer_mutex.lock ();
                 try {
                     this.epgstore.remove_events_older_than (event,
-                        this.channel.Sid, this.channel.GroupId);
+                        channel.Sid, channel.GroupId);
                 } catch (SqlError e2) {
                     log.error ("%s", e2.message);
-                    return;
+                } finally {
+                    writer_mutex.unlock ();
                 }
             }
 
             log.debug ("Finished restoring %d EPG events for channel %u",
-                this.events.size, this.channel.Sid);
+                this.events.size, channel.Sid);
+            return this.events.size;
         }
 
         public Schedule (Channel channel) {
@@ -92,10 +216,10 @@ namespace DVB {
             int last_expired = -1;
 
             lock (this.events) {
+                this.restore ();
                 for (int i=0; i<this.events.size; i++) {
                     EventElement element = this.events.get (i);
-                    Event? e = this.get_event (element.id);
-                    if (e != null && e.has_expired ()) {
+                    if (element.has_expired ()) {
                         last_expired = i;
                     } else {
                         // events are sorted, all other events didn't expire, too
@@ -106,23 +230,35 @@ namespace DVB {
                 log.debug ("Removing expired events of channel %s (%u)",
                     channel.Name, channel.Sid);
 
-                for (int i=0; i<=last_expired; i++) {
-                    EventElement element = this.events.get (i);
-                    Event? event = this.get_event (element.id);
-                    try {
-                        this.epgstore.remove_events_older_than (event,
-                            this.channel.Sid, this.channel.GroupId);
-                    } catch (SqlError e) {
-                        log.error ("%s", e.message);
+                if (last_expired > -1) {
+                    // Removes all expired events at once
+                    Event? event = this.get_cached_event (
+                        this.events.get (last_expired).id);
+                    if (event != null) {
+                        writer_mutex.lock ();
+                        try {
+                            this.epgstore.remove_events_older_than (event,
+                                this.channel.Sid, this.channel.GroupId);
+                        } catch (SqlError e) {
+                            log.error ("%s", e.message);
+                        } finally {
+                            writer_mutex.unlock ();
+                        }
                     }
-                }
 
-                if (last_expired > -1) {
-                    this.events.remove_range (0, last_expired);
+                    for (int i=0; i<=last_expired; i++) {
+                        this.cache.remove (this.channel.GroupId,
+                            this.channel.Sid, this.events.get (i).id);
+                    }
+                    this.events.remove_range (0, last_expired + 1);
                 }
             }
         }
 
+        /**
+         * @returns: The event with all its information
+         * as stored in the EPG store
+         */
         public Event? get_event (uint event_id) {
             try {
                 return this.epgstore.get_event (event_id,
@@ -133,6 +269,24 @@ namespace DVB {
             }
         }
 
+        /**
+         * @returns: The event without extended description and
+         * components, which is only read from the EPG store
+         * if it isn't in the cache
+         */
+        private Event? get_cached_event (uint event_id) {
+            Event? event = this.cache.lookup (this.channel.GroupId,
+                this.channel.Sid, event_id);
+            if (event == null) {
+                event = this.get_event (event_id);
+                if (event != null) {
+                    this.cache.add (this.channel.GroupId, this.channel.Sid,
+                        event);
+                }
+            }
+            return event;
+        }
+
         /**
          * When an event with the same id already exists, it's replaced
          */
@@ -140,60 +294,119 @@ namespace DVB {
             if (event.has_expired ()) return;
 
             lock (this.events) {
+                this.restore ();
+                writer_mutex.lock ();
                 try {
                     this.store_event (event);
                 } catch (SqlError e) {
                     log.error ("%s", e.message);
+                } finally {
+                    writer_mutex.unlock ();
                 }
             }
         }
 
-        public void add_all (Collection<Event> new_events) {
+        public void add_all (EventRecordList new_events) {
+            // events that have to be written to the EPG store
+            var batch = new HashMap<uint, Event> ();
+            // events that have to be removed from the EPG store
+            var removed = new HashSet<uint> ();
             lock (this.events) {
+                this.restore ();
+                writer_mutex.lock ();
                 try {
-                    mutex.lock ();
-                    ((database.sqlite.SqliteDatabase)this.epgstore).begin_transaction ();
-
-                    foreach (Event event in new_events) {
-                        if (!event.has_expired ())
-                            this.store_event (event);
+                    for (int i = 0; i < new_events.size; i++) {
+                        if (!new_events.has_expired (i)) {
+                            Event event = new_events.get (i);
+                            this.merge_event (event, batch, removed);
+                            batch.set (event.id, event);
+                            removed.remove (event.id);
+                        }
                     }
-
-                    ((database.sqlite.SqliteDatabase)this.epgstore).end_transaction ();
+                    // Write while the events are locked, otherwise
+                    // readers could miss events that have been
+                    // evicted from the cache but aren't stored yet
+                    this.epgstore.replace_events (removed, batch.values,
+                        this.channel.Sid, this.channel.GroupId);
                 } catch (SqlError e) {
                     log.error ("%s", e.message);
                 } finally {
-                    mutex.unlock ();
+                    writer_mutex.unlock ();
                 }
             }
         }
 
         private void store_event (Event event) throws SqlError {
-            Gee.List<Event> overlap = this.get_overlapping_events (event);
+            this.merge_event (event);
+            this.epgstore.add_or_update_event (event, this.channel.Sid,
+                this.channel.GroupId);
+        }
+
+        /**
+         * @pending: Events that haven't been added to the EPG store yet
+         * @removed: Collects the ids of replaced events that have to
+         * be removed from the EPG store, they are removed immediately
+         * if it's NULL
+         *
+         * Replace overlapping events that don't match @event and
+         * add @event to the events in memory. The caller has
+         * to add @event to the EPG store.
+         */
+        private void merge_event (Event event,
+                Map<uint, Event>? pending = null,
+                Set<uint>? removed = null) throws SqlError {
+            Gee.List<Event> overlap = this.get_overlapping_events (event,
+                pending);
             int s = match_events (overlap, event);
             if (s > MATCH_THRESHOLD) {
                 this.events.remove_all (overlap);
                 foreach (Event overlapping_event in overlap) {
-                    this.epgstore.remove_event (overlapping_event.id, this.channel.Sid,
-                        this.channel.GroupId);
+                    if (removed != null) {
+                        removed.add (overlapping_event.id);
+                    } else {
+                        this.epgstore.remove_event (overlapping_event.id,
+                            this.channel.Sid, this.channel.GroupId);
+                    }
+                    this.cache.remove (this.channel.GroupId, this.channel.Sid,
+                        overlapping_event.id);
+                    if (pending != null)
+                        pending.unset (overlapping_event.id);
                 }
             }
 
-            this.epgstore.add_or_update_event (event, this.channel.Sid,
-                this.channel.GroupId);
+            this.cache.add (this.channel.GroupId, this.channel.Sid, event);
 
-            if (!this.events.contains_event_with_id (event.id)) {
+            if (this.events.contains_event_with_id (event.id)) {
+                EventElement element = this.events.get_by_id (event.id);
+                if (element.starttime != event.get_start_timestamp ()
+                        || element.duration != event.duration) {
+                    // Keep events sorted by start and end time
+                    this.events.remove (event.id);
+                    this.events.insert (event);
+                }
+            } else {
                 this.events.insert (event);
             }
         }
 
-        private Gee.List<Event> get_overlapping_events (Event event) {
+        /**
+         * @pending: Events that haven't been added to the EPG store yet,
+         * they are used if they have been evicted from the cache
+         */
+        private Gee.List<Event> get_overlapping_events (Event event,
+                Map<uint, Event>? pending = null) {
             Gee.List<EventElement> elements = this.events.get_overlapping_events (event);
+            time_t start = event.get_start_timestamp ();
+            time_t end = event.get_end_timestamp ();
 
             Gee.List<Event> overlap = new ArrayList<Event> ();
             foreach (EventElement data in elements) {
-                Event? e = this.get_event (data.id);
-                if (e != null && e.get_overlap_percentage (event) >= MIN_EVENT_OVERLAP)
+                if (data.get_overlap_percentage (start, end) < MIN_EVENT_OVERLAP)
+                    continue;
+                Event? e = (pending != null) ? pending.get (data.id) : null;
+                if (e == null)
+                    e = this.get_cached_event (data.id);
+                if (e != null)
                     overlap.add (e);
             }
 
@@ -229,27 +442,54 @@ namespace DVB {
             return (int)max_score;
         }
 
+        /**
+         * @start: UNIX timestamp of the start of the event
+         * @duration: Duration of the event in seconds
+         * @returns: FALSE if there's no event with id @event_id
+         *
+         * Get the time of an event without reading it from the EPG store
+         */
+        public bool get_event_time (uint event_id, out int64 start,
+                out uint duration) {
+            lock (this.events) {
+                this.restore ();
+                if (!this.events.contains_event_with_id (event_id)) {
+                    start = 0;
+                    duration = 0;
+                    return false;
+                }
+                EventElement element = this.events.get_by_id (event_id);
+                start = get_element_timestamp (element);
+                duration = element.duration;
+            }
+            return true;
+        }
+
         public bool contains (uint event_id) {
             bool val;
             lock (this.events) {
+                this.restore ();
                 val = this.events.contains_event_with_id (event_id);
             }
             return val;
         }
 
         public Event? get_running_event () {
-             Event? running_event = null;
+             uint running_id = 0;
+             bool found = false;
              lock (this.events) {
-                 foreach (EventElement element in this.events) {;
-                    Event? event = this.get_event (element.id);
+                 this.restore ();
+                 foreach (EventElement element in this.events) {
+                    Event? event = this.get_cached_event (element.id);
                     if (event != null && event.is_running ()) {
-                        running_event = event;
+                        running_id = event.id;
+                        found = true;
                         break;
                     }
                 }
             }
 
-            return running_event;
+            return (found) ? this.get_event (running_id) : null;
         }
 
         /**
@@ -263,12 +503,13 @@ namespace DVB {
             time_t timer_start = start.mktime ();
             time_t timer_end = timer_start + duration * 60;
             lock (this.events) {
+                this.restore ();
                 // Difference between end of timer and end of event
                 time_t last_diff = 0;
                 foreach (EventElement element in this.events) {
                     // convert UTC to local time
                     time_t event_start = cUtils.timegm (Time.local (element.starttime));
-                    Event? event = this.get_event (element.id);
+                    Event? event = this.get_cached_event (element.id);
                     if (event == null) continue;
 
                     time_t event_end = event_start + event.duration;
@@ -295,9 +536,9 @@ namespace DVB {
         public uint32[] GetAllEvents () throws DBusError {
             ArrayList<uint32> events = new ArrayList<uint32> ();
             lock (this.events) {
+                this.restore ();
                  foreach (EventElement element in this.events) {
-                    Event? event = this.get_event (element.id);
-                    if (event == null || event.has_expired ()) continue;
+                    if (element.has_expired ()) continue;
                     events.add (element.id);
                  }
             }
@@ -310,37 +551,52 @@ namespace DVB {
         }
 
         public EventInfo[] GetAllEventInfos () throws DBusError {
-            ArrayList<Event> all_events = new ArrayList<Event> ();
-            lock (this.events) {
-                foreach (EventElement element in this.events) {
-                    Event? event = this.get_event (element.id);
-                    if (event != null && !event.has_expired ())
-                        all_events.add (event);
-                }
-            }
+            ArrayList<Event> all_events = this.get_all_valid_events ();
 
             int n_events = all_events.size;
             EventInfo[] event_infos = new EventInfo[n_events];
-            int i = 0;
-            Event event = null;
-            if (n_events > i)
-                event = all_events.get (i);
-            while (event != null) {
-                event_infos[i] = event_to_event_info (event);
-
-                if (i+1 == n_events) {
-                    event_infos[i].next = 0;
-                    event = null;
-                } else {
-                    event = all_events.get (i+1);
-                    event_infos[i].next = event.id;
-                }
-                i++;
+            for (int i=0; i<n_events; i++) {
+                event_infos[i] = event_to_event_info (all_events.get (i));
+                event_infos[i].next = (i+1 == n_events)
+                    ? 0 : all_events.get (i+1).id;
             }
 
             return event_infos;
         }
 
+        public TimedEventInfo[] GetAllTimedEventInfos () throws DBusError {
+            ArrayList<Event> all_events = this.get_all_valid_events ();
+
+            Recorder? recorder = this.get_recorder ();
+            int n_events = all_events.size;
+            TimedEventInfo[] event_infos = new TimedEventInfo[n_events];
+            for (int i=0; i<n_events; i++) {
+                event_infos[i] = this.event_to_timed_event_info (
+                    all_events.get (i), recorder);
+                event_infos[i].next = (i+1 == n_events)
+                    ? 0 : all_events.get (i+1).id;
+            }
+
+            return event_infos;
+        }
+
+        /**
+         * @returns: All events that didn't expire yet sorted by start time
+         */
+        private ArrayList<Event> get_all_valid_events () {
+            ArrayList<Event> all_events = new ArrayList<Event> ();
+            lock (this.events) {
+                this.restore ();
+                foreach (EventElement element in this.events) {
+                    if (element.has_expired ()) continue;
+                    Event? event = this.get_cached_event (element.id);
+                    if (event != null)
+                        all_events.add (event);
+                }
+            }
+            return all_events;
+        }
+
         public bool GetInformations (uint32 event_id, out EventInfo event_info)
                 throws DBusError
         {
@@ -348,9 +604,10 @@ namespace DVB {
             event_info = EventInfo();
 
             lock (this.events) {
+                this.restore ();
                 if (this.events.contains_event_with_id (event_id)) {
                     EventElement element = this.events.get_by_id (event_id);
-                    Event? event = this.get_event (element.id);
+                    Event? event = this.get_cached_event (element.id);
 
                     event_info = event_to_event_info (event);
                     EventElement? next_element = this.events.next (element);
@@ -374,6 +631,106 @@ namespace DVB {
             return ret;
         }
 
+        public int64[] GetLocalStartTimestamps () throws DBusError {
+            int64[] timestamps = {};
+            lock (this.events) {
+                this.restore ();
+                foreach (EventElement element in this.events) {
+                    if (element.has_expired ()) continue;
+                    timestamps += get_element_timestamp (element);
+                }
+            }
+            return timestamps;
+        }
+
+        public TimedEventInfo[] GetEventsInRange (int64 start, int64 end)
+                throws DBusError
+        {
+            ArrayList<Event> range_events = new ArrayList<Event> ();
+            uint32 next_id = 0;
+            // Daylight saving time may shift the start time
+            // of elements by an hour, check exact times below
+            int64 element_start = to_element_time (start) - 3600;
+            int64 element_end = to_element_time (end) + 3600;
+            lock (this.events) {
+                this.restore ();
+                foreach (EventElement element in
+                        this.events.get_events_in_range (element_start, element_end)) {
+                    int64 event_start = get_element_timestamp (element);
+                    if (event_start >= end) {
+                        // events are sorted, all other events start later
+                        next_id = element.id;
+                        break;
+                    }
+                    if (event_start + element.duration <= start)
+                        continue;
+                    Event? event = this.get_cached_event (element.id);
+                    if (event == null)
+                        continue;
+                    range_events.add (event);
+                }
+                if (next_id == 0) {
+                    EventElement? next = this.events.get_first_starting_at (
+                        (time_t)element_end);
+                    if (next != null)
+                        next_id = next.id;
+                }
+            }
+
+            Recorder? recorder = this.get_recorder ();
+            TimedEventInfo[] event_infos = new TimedEventInfo[range_events.size];
+            for (int i=0; i<event_infos.length; i++) {
+                Event event = range_events.get (i);
+                event_infos[i] = this.event_to_timed_event_info (event,
+                    recorder);
+                if (i+1 == event_infos.length) {
+                    event_infos[i].next = next_id;
+                } else {
+                    event_infos[i].next = range_events.get (i+1).id;
+                }
+            }
+
+            return event_infos;
+        }
+
+        /**
+         * @returns: The currently running and the next event
+         */
+        public RunningNextInfo get_running_next_info () {
+            RunningNextInfo info = RunningNextInfo ();
+            info.channel_sid = this.channel.Sid;
+            info.running_name = "";
+            info.next_name = "";
+
+            lock (this.events) {
+                this.restore ();
+                foreach (EventElement element in this.events) {
+                    Event? event = this.get_cached_event (element.id);
+                    if (event == null || !event.is_running ())
+                        continue;
+
+                    info.running_id = event.id;
+                    info.running_name = (event.name == null) ? "" : event.name;
+                    info.running_start =
+                        (int64)event.get_local_start_time ().mktime ();
+
+                    EventElement? next_element = this.events.next (element);
+                    if (next_element != null) {
+                        Event? next = this.get_cached_event (next_element.id);
+                        if (next != null) {
+                            info.next_id = next.id;
+                            info.next_name = (next.name == null) ? "" : next.name;
+                            info.next_start =
+                                (int64)next.get_local_start_time ().mktime ();
+                        }
+                    }
+                    break;
+                }
+            }
+
+            return info;
+        }
+
         public uint32 NowPlaying () throws DBusError {
             Event? event = this.get_running_event ();
 
@@ -383,6 +740,7 @@ namespace DVB {
         public uint32 Next (uint32 event_id) throws DBusError {
             uint32 next_event = 0;
             lock (this.events) {
+                this.restore ();
                 if (this.events.contains_event_with_id (event_id)) {
                     EventElement element = this.events.get_by_id (event_id);
                     EventElement? next = this.events.next (element);
@@ -404,8 +762,9 @@ namespace DVB {
             name = "";
 
             lock (this.events) {
+                this.restore ();
                 if (this.events.contains_event_with_id (event_id)) {
-                    Event? event = this.get_extended_event_by_id (event_id);
+                    Event? event = this.get_cached_event (event_id);
                     if (event != null && event.name != null) {
                         name = event.name;
                         ret = true;
@@ -425,8 +784,9 @@ namespace DVB {
             description = "";
 
             lock (this.events) {
+                this.restore ();
                 if (this.events.contains_event_with_id (event_id)) {
-                    Event? event = this.get_extended_event_by_id (event_id);
+                    Event? event = this.get_cached_event (event_id);
                     if (event != null && event.description != null) {
                         description = event.description;
                         ret = true;
@@ -446,8 +806,10 @@ namespace DVB {
             description = "";
 
             lock (this.events) {
+                this.restore ();
                 if (this.events.contains_event_with_id (event_id)) {
-                    Event? event = this.get_extended_event_by_id (event_id);
+                    // Extended descriptions aren't cached
+                    Event? event = this.get_event (event_id);
                     if (event != null && event.extended_description != null) {
                         description = event.extended_description;
                         ret = true;
@@ -460,6 +822,27 @@ namespace DVB {
             return ret;
         }
 
+        public string[] GetExtendedDescriptions (uint32[] event_ids)
+                throws DBusError
+        {
+            string[] descriptions = new string[event_ids.length];
+
+            lock (this.events) {
+                this.restore ();
+                for (int i=0; i<event_ids.length; i++) {
+                    descriptions[i] = "";
+                    if (!this.events.contains_event_with_id (event_ids[i]))
+                        continue;
+                    // Extended descriptions aren't cached
+                    Event? event = this.get_event (event_ids[i]);
+                    if (event != null && event.extended_description != null)
+                        descriptions[i] = event.extended_description;
+                }
+            }
+
+            return descriptions;
+        }
+
         public bool GetDuration (uint32 event_id, out uint duration)
                 throws DBusError
         {
@@ -467,8 +850,9 @@ namespace DVB {
             duration = 0;
 
             lock (this.events) {
+                this.restore ();
                 if (this.events.contains_event_with_id (event_id)) {
-                    Event? event = this.get_extended_event_by_id (event_id);
+                    Event? event = this.get_cached_event (event_id);
                     if (event != null) {
                         duration = event.duration;
                         ret = true;
@@ -488,8 +872,9 @@ namespace DVB {
             start_time = new uint[0];
 
             lock (this.events) {
+                this.restore ();
                 if (this.events.contains_event_with_id (event_id)) {
-                    Event? event = this.get_extended_event_by_id (event_id);
+                    Event? event = this.get_cached_event (event_id);
                     if (event != null) {
                         Time local_time = event.get_local_start_time ();
                         start_time = to_time_array (local_time);
@@ -510,8 +895,9 @@ namespace DVB {
             timestamp = 0;
 
             lock (this.events) {
+                this.restore ();
                 if (this.events.contains_event_with_id (event_id)) {
-                    Event? event = this.get_extended_event_by_id (event_id);
+                    Event? event = this.get_cached_event (event_id);
                     if (event != null) {
                         Time local_time = event.get_local_start_time ();
                         timestamp = (int64)local_time.mktime ();
@@ -530,8 +916,9 @@ namespace DVB {
             running = false;
 
             lock (this.events) {
+                this.restore ();
                 if (this.events.contains_event_with_id (event_id)) {
-                    Event? event = this.get_extended_event_by_id (event_id);
+                    Event? event = this.get_cached_event (event_id);
                     if (event != null) {
                         running = (event.is_running ());
                         ret = true;
@@ -551,8 +938,9 @@ namespace DVB {
             scrambled = false;
 
             lock (this.events) {
+                this.restore ();
                 if (this.events.contains_event_with_id (event_id)) {
-                    Event? event = this.get_extended_event_by_id (event_id);
+                    Event? event = this.get_cached_event (event_id);
                     if (event != null) {
                         scrambled = (!event.free_ca_mode);
                         ret = true;
@@ -565,11 +953,6 @@ namespace DVB {
             return ret;
         }
 
-        private Event? get_extended_event_by_id (uint event_id) {
-            EventElement element = this.events.get_by_id (event_id);
-            return this.get_event (element.id);
-        }
-
         private static uint[] to_time_array (Time local_time) {
             uint[] start = new uint[6];
             start[0] = local_time.year + 1900;
@@ -581,6 +964,49 @@ namespace DVB {
             return start;
         }
 
+        /**
+         * @returns: UNIX timestamp of the start of the event
+         */
+        private static int64 get_element_timestamp (EventElement element) {
+            // starttime holds the UTC time interpreted as local time
+            return (int64)cUtils.timegm (Time.local (element.starttime));
+        }
+
+        /**
+         * @returns: UNIX timestamp @timestamp in the representation
+         * of EventElement.starttime
+         */
+        private static int64 to_element_time (int64 timestamp) {
+            Time utc_time = Time.gm ((time_t)timestamp);
+            utc_time.isdst = -1;
+            return (int64)utc_time.mktime ();
+        }
+
+        private Recorder? get_recorder () {
+            DeviceGroup? group = Manager.get_instance ().get_device_group_if_exists (
+                this.channel.GroupId);
+            return (group == null) ? null : group.recorder;
+        }
+
+        private TimedEventInfo event_to_timed_event_info (Event event,
+                Recorder? recorder) {
+            TimedEventInfo event_info = TimedEventInfo();
+            event_info.id = event.id;
+            event_info.name = (event.name == null) ? "" : event.name;
+            event_info.duration = event.duration;
+            event_info.short_description =
+                (event.description == null) ? "" : event.description;
+            event_info.local_start_timestamp =
+                (int64)event.get_local_start_time ().mktime ();
+            if (recorder == null) {
+                event_info.timer_overlap = OverlapType.UNKNOWN;
+            } else {
+                event_info.timer_overlap = recorder.get_timer_overlap (event,
+                    this.channel.Sid);
+            }
+            return event_info;
+        }
+
         private static EventInfo event_to_event_info (Event event) {
             EventInfo event_info = EventInfo();
             event_info.id = event.id;
@@ -32,6 +32,16 @@ namespace DVB {
 
         private const string EPG_SECTION = "epg";
         private const string SCAN_INTERVAL = "scan_interval";
+        private const string MAX_DWELL_TIME = "max_dwell_time";
+        private const string CACHE_SIZE = "cache_size";
+        private const string DATABASE_JOURNAL_MODE = "database_journal_mode";
+        private const string DATABASE_SYNCHRONOUS = "database_synchronous";
+        private const string DATABASE_CACHE_SIZE = "database_cache_size";
+        private const string DATABASE_MMAP_SIZE = "database_mmap_size";
+        private const string DATABASE_READERS = "database_readers";
+
+        private const string RECORDINGS_SECTION = "recordings";
+        private const string CHECK_INTERVAL = "check_interval";
 
         private const string STREAMING_SECTION = "streaming";
         private const string INTERFACE = "interface";
@@ -39,6 +49,18 @@ namespace DVB {
         private const int DEFAULT_MARGIN_START = 5;
         private const int DEFAULT_MARGIN_END = 5;
         private const int DEFAULT_SCAN_INTERVAL = 30;
+        private const int DEFAULT_MAX_DWELL_TIME = 60;
+        private const int DEFAULT_CACHE_SIZE = 8192;
+        private const string DEFAULT_DATABASE_JOURNAL_MODE = "WAL";
+        private const string DEFAULT_DATABASE_SYNCHRONOUS = "NORMAL";
+        private const int DEFAULT_DATABASE_CACHE_SIZE = 4096;
+        private const int DEFAULT_DATABASE_MMAP_SIZE = 65536;
+        private const int DEFAULT_DATABASE_READERS = 3;
+        private const int DEFAULT_CHECK_INTERVAL = 15;
+        private const string[] JOURNAL_MODES = {"DELETE", "TRUNCATE",
+            "PERSIST", "MEMORY", "WAL", "OFF"};
+        private const string[] SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL",
+            "EXTRA"};
         private const string DEFAULT_INTERFACE = "lo";
 
         private const string DEFAULT_SETTINGS =
@@ -47,6 +69,15 @@ namespace DVB {
         margin_end=5
         [epg]
         scan_interval=30
+        max_dwell_time=60
+        cache_size=8192
+        database_journal_mode=WAL
+        database_synchronous=NORMAL
+        database_cache_size=4096
+        database_mmap_size=65536
+        database_readers=3
+        [recordings]
+        check_interval=15
         [streaming]
         interface=lo""";
 
@@ -67,6 +98,96 @@ namespace DVB {
             return val * 60;
         }
 
+        /**
+         * @returns: Maximum number of seconds to wait for EIT
+         * on a single transponder
+         */
+        public int get_epg_max_dwell_time () {
+            int val;
+            try {
+                val = this.get_integer (EPG_SECTION, MAX_DWELL_TIME);
+            } catch (KeyFileError e) {
+                log.warning ("%s", e.message);
+                val = DEFAULT_MAX_DWELL_TIME;
+            }
+            return val;
+        }
+
+        /**
+         * @returns: Maximum number of bytes used to keep
+         * EPG events in memory
+         */
+        public size_t get_epg_cache_size () {
+            int val;
+            try {
+                val = this.get_integer (EPG_SECTION, CACHE_SIZE);
+            } catch (KeyFileError e) {
+                log.warning ("%s", e.message);
+                val = DEFAULT_CACHE_SIZE;
+            }
+            return (size_t)int.max (val, 0) * 1024;
+        }
+
+        /**
+         * @returns: Journal mode of the EPG database
+         */
+        public string get_epg_database_journal_mode () {
+            return this.get_choice (EPG_SECTION, DATABASE_JOURNAL_MODE,
+                JOURNAL_MODES, DEFAULT_DATABASE_JOURNAL_MODE);
+        }
+
+        /**
+         * @returns: Value of the EPG database's synchronous flag
+         */
+        public string get_epg_database_synchronous () {
+            return this.get_choice (EPG_SECTION, DATABASE_SYNCHRONOUS,
+                SYNCHRONOUS_MODES, DEFAULT_DATABASE_SYNCHRONOUS);
+        }
+
+        /**
+         * @returns: Size of the page cache of each connection
+         * to the EPG database in KiB
+         */
+        public int get_epg_database_cache_size () {
+            int val;
+            try {
+                val = this.get_integer (EPG_SECTION, DATABASE_CACHE_SIZE);
+            } catch (KeyFileError e) {
+                log.warning ("%s", e.message);
+                val = DEFAULT_DATABASE_CACHE_SIZE;
+            }
+            return int.max (val, 0);
+        }
+
+        /**
+         * @returns: Maximum number of bytes of the EPG database
+         * that are accessed with memory-mapped I/O
+         */
+        public int64 get_epg_database_mmap_size () {
+            int val;
+            try {
+                val = this.get_integer (EPG_SECTION, DATABASE_MMAP_SIZE);
+            } catch (KeyFileError e) {
+                log.warning ("%s", e.message);
+                val = DEFAULT_DATABASE_MMAP_SIZE;
+            }
+            return (int64)int.max (val, 0) * 1024;
+        }
+
+        /**
+         * @returns: Number of read-only connections to the EPG database
+         */
+        public int get_epg_database_readers () {
+            int val;
+            try {
+                val = this.get_integer (EPG_SECTION, DATABASE_READERS);
+            } catch (KeyFileError e) {
+                log.warning ("%s", e.message);
+                val = DEFAULT_DATABASE_READERS;
+            }
+            return int.max (val, 1);
+        }
+
         public int get_timers_margin_start () {
             int start_margin;
             try {
@@ -89,6 +210,24 @@ namespace DVB {
             return end_margin;
         }
 
+        /**
+         * The interval is stored in minutes in the configuration file.
+         *
+         * @returns: Number of seconds between checks of the recordings
+         * directories for changes the file monitors missed or 0
+         * to never check
+         */
+        public int get_recordings_check_interval () {
+            int val;
+            try {
+                val = this.get_integer (RECORDINGS_SECTION, CHECK_INTERVAL);
+            } catch (KeyFileError e) {
+                log.warning ("%s", e.message);
+                val = DEFAULT_CHECK_INTERVAL;
+            }
+            return int.max (val, 0) * 60;
+        }
+
         public string get_streaming_interface () {
             string val;
             try {
@@ -100,6 +239,28 @@ namespace DVB {
             return val;
         }
 
+        /**
+         * @returns: The value of @key in upper case if it's one of
+         * @choices, else @default_value
+         */
+        private string get_choice (string group_name, string key,
+                string[] choices, string default_value) {
+            string val;
+            try {
+                val = this.get_string (group_name, key).strip ().up ();
+            } catch (KeyFileError e) {
+                log.warning ("%s", e.message);
+                return default_value;
+            }
+            foreach (string choice in choices) {
+                if (choice == val)
+                    return val;
+            }
+            log.warning ("Invalid value %s for %s, using %s", val, key,
+                default_value);
+            return default_value;
+        }
+
         public File get_settings_file () {
             File config_dir = File.new_for_path (
                 Environment.get_user_config_dir ());
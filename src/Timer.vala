@@ -239,7 +239,7 @@ namespace DVB {
                 this.EventID = event.id;
         }
 
-        private time_t get_end_time_timestamp () {
+        public time_t get_end_time_timestamp () {
             var t = Utils.create_time (this.starttime.year + 1900,
                 this.starttime.month + 1, this.starttime.day,
                 this.starttime.hour, this.starttime.minute);
@@ -250,7 +250,7 @@ namespace DVB {
             return t.mktime ();
         }
 
-        private time_t get_start_time_timestamp () {
+        public time_t get_start_time_timestamp () {
             var t = this.get_start_time_time ();
             return t.mktime ();
         }
@@ -0,0 +1,145 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+
+namespace DVB {
+
+    /**
+     * Index of the timers of a single channel to find out
+     * how they overlap with a period of time.
+     *
+     * The timers are sorted by start time and for each timer the
+     * latest end time of all timers starting before is stored.
+     * The index is rebuilt in O(m log m) steps with the first query
+     * after a timer changed, afterwards each query takes O(log m) steps.
+     */
+    public class TimerIndex : GLib.Object {
+
+        private class Interval {
+            public int64 start;
+            public int64 end;
+        }
+
+        private HashMap<uint32, Timer> timers;
+        // start times in ascending order
+        private int64[] starts;
+        // max_ends[i] is the latest end of the timers up to starts[i]
+        private int64[] max_ends;
+        private bool dirty;
+
+        public bool is_empty {
+            get { return this.timers.is_empty; }
+        }
+
+        construct {
+            this.timers = new HashMap<uint32, Timer> ();
+            this.starts = new int64[0];
+            this.max_ends = new int64[0];
+            this.dirty = false;
+        }
+
+        /**
+         * Add @timer or update it after its start time or duration changed
+         */
+        public void add (Timer timer) {
+            this.timers.set (timer.Id, timer);
+            this.dirty = true;
+        }
+
+        public void remove (uint32 timer_id) {
+            if (this.timers.unset (timer_id))
+                this.dirty = true;
+        }
+
+        /**
+         * @start: UNIX timestamp
+         * @end: UNIX timestamp
+         * @returns: OverlapType.COMPLETE if a timer covers the whole
+         * period, OverlapType.PARTIAL if a timer covers a part of it
+         * or OverlapType.NONE
+         */
+        public OverlapType get_overlap (int64 start, int64 end) {
+            if (this.dirty)
+                this.rebuild ();
+
+            // Timers starting not after start cover the period
+            // completely if one of them ends not before end
+            int n = this.count_starting_before (start, true);
+            if (n > 0 && this.max_ends[n - 1] >= end
+                    && this.max_ends[n - 1] > start)
+                return OverlapType.COMPLETE;
+
+            // Timers starting before end overlap if one of them
+            // ends after start
+            n = this.count_starting_before (end, false);
+            if (n > 0 && this.max_ends[n - 1] > start)
+                return OverlapType.PARTIAL;
+
+            return OverlapType.NONE;
+        }
+
+        /**
+         * @returns: Number of timers that start before @time
+         * or at @time if @inclusive is TRUE
+         */
+        private int count_starting_before (int64 time, bool inclusive) {
+            int low = 0;
+            int high = this.starts.length;
+            while (low < high) {
+                int mid = (low + high) / 2;
+                if (this.starts[mid] < time
+                        || (inclusive && this.starts[mid] == time))
+                    low = mid + 1;
+                else
+                    high = mid;
+            }
+            return low;
+        }
+
+        private void rebuild () {
+            var intervals = new ArrayList<Interval> ();
+            foreach (Timer timer in this.timers.values) {
+                Interval interval = new Interval ();
+                interval.start = timer.get_start_time_timestamp ();
+                interval.end = timer.get_end_time_timestamp ();
+                intervals.add (interval);
+            }
+            intervals.sort ((a, b) => {
+                if (a.start < b.start) return -1;
+                else if (a.start > b.start) return +1;
+                else return 0;
+            });
+
+            this.starts = new int64[intervals.size];
+            this.max_ends = new int64[intervals.size];
+            int64 max_end = int64.MIN;
+            for (int i = 0; i < intervals.size; i++) {
+                Interval interval = intervals.get (i);
+                this.starts[i] = interval.start;
+                if (interval.end > max_end)
+                    max_end = interval.end;
+                this.max_ends[i] = max_end;
+            }
+            this.dirty = false;
+        }
+    }
+
+}
@@ -0,0 +1,228 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+
+namespace DVB {
+
+    /**
+     * Assigns timers to the devices of a group ahead of time.
+     *
+     * Timers are assigned in the order they start. A timer of a
+     * transport stream that a device is already tuned to shares that
+     * device. Otherwise it gets a free device. If all devices are busy,
+     * a device recording a single timer is taken away from that timer
+     * if fewer upcoming timers could share the device with it than with
+     * the new timer, or as many, but it ends later. Timers that are
+     * already recording never lose their device.
+     *
+     * Planning m timers takes O(m log m + m * d) steps for d devices.
+     */
+    public class TimerPlanner : GLib.Object {
+
+        private class Entry {
+            public uint32 timer_id;
+            public uint transport;
+            public int64 start;
+            public int64 end;
+            public bool active;
+            public int device;
+        }
+
+        private class Slot {
+            public uint transport;
+            // latest end of the timers recorded with the device
+            public int64 end;
+            // timers that haven't ended yet
+            public ArrayList<Entry> recording;
+        }
+
+        public int n_devices { get; construct; }
+
+        private ArrayList<Entry> entries;
+        // Maps transport to its entries sorted by start time
+        private HashMap<uint, ArrayList<Entry>> transport_entries;
+
+        construct {
+            this.entries = new ArrayList<Entry> ();
+            this.transport_entries = new HashMap<uint, ArrayList<Entry>> ();
+        }
+
+        /**
+         * @n_devices: Number of devices that can record at the same time
+         */
+        public TimerPlanner (int n_devices) {
+            base (n_devices: n_devices);
+        }
+
+        /**
+         * @transport: Identifies the transport stream of the timer's channel
+         * @start: UNIX timestamp
+         * @end: UNIX timestamp
+         * @active: Whether the timer is already recording
+         */
+        public void add (uint32 timer_id, uint transport, int64 start,
+                int64 end, bool active) {
+            Entry entry = new Entry ();
+            entry.timer_id = timer_id;
+            entry.transport = transport;
+            entry.start = start;
+            entry.end = end;
+            entry.active = active;
+            entry.device = -1;
+            this.entries.add (entry);
+        }
+
+        /**
+         * @conflicts: Ids of timers that can't be recorded
+         * @returns: Maps the id of each timer to the index of the
+         * device recording it or -1 if the timer can't be recorded
+         */
+        public HashMap<uint32, int> plan (out Gee.List<uint32> conflicts) {
+            this.entries.sort ((a, b) => {
+                if (a.start < b.start) return -1;
+                else if (a.start > b.start) return +1;
+                else if (a.end < b.end) return -1;
+                else if (a.end > b.end) return +1;
+                else return 0;
+            });
+
+            this.transport_entries.clear ();
+            foreach (Entry entry in this.entries) {
+                if (!this.transport_entries.has_key (entry.transport)) {
+                    this.transport_entries.set (entry.transport,
+                        new ArrayList<Entry> ());
+                }
+                this.transport_entries.get (entry.transport).add (entry);
+            }
+
+            Slot?[] slots = new Slot?[this.n_devices];
+            foreach (Entry entry in this.entries) {
+                entry.device = this.find_device (slots, entry);
+                if (entry.device == -1)
+                    continue;
+
+                Slot? slot = slots[entry.device];
+                if (slot == null) {
+                    slot = new Slot ();
+                    slot.transport = entry.transport;
+                    slot.end = entry.end;
+                    slot.recording = new ArrayList<Entry> ();
+                    slots[entry.device] = slot;
+                } else if (entry.end > slot.end) {
+                    slot.end = entry.end;
+                }
+                slot.recording.add (entry);
+            }
+
+            var plan = new HashMap<uint32, int> ();
+            conflicts = new ArrayList<uint32> ();
+            foreach (Entry entry in this.entries) {
+                plan.set (entry.timer_id, entry.device);
+                if (entry.device == -1)
+                    conflicts.add (entry.timer_id);
+            }
+            return plan;
+        }
+
+        /**
+         * @returns: Index of the device that should record @entry
+         * or -1 if all devices are busy
+         */
+        private int find_device (Slot?[] slots, Entry entry) {
+            int free = -1;
+            for (int i = 0; i < slots.length; i++) {
+                if (slots[i] == null || slots[i].end <= entry.start) {
+                    slots[i] = null;
+                    if (free == -1)
+                        free = i;
+                } else if (slots[i].transport == entry.transport) {
+                    // Share the device
+                    return i;
+                }
+            }
+            if (free != -1)
+                return free;
+
+            int victim = -1;
+            int victim_sharers = 0;
+            int sharers = this.count_sharers (entry.transport, entry.start,
+                entry.end);
+            for (int i = 0; i < slots.length; i++) {
+                Slot slot = slots[i];
+                Iterator<Entry> it = slot.recording.iterator ();
+                while (it.next ()) {
+                    if (it.get ().end <= entry.start)
+                        it.remove ();
+                }
+                if (slot.recording.size != 1 || slot.recording.get (0).active)
+                    continue;
+
+                int slot_sharers = this.count_sharers (slot.transport,
+                    entry.start, slot.end);
+                if (!entry.active && (slot_sharers > sharers
+                        || (slot_sharers == sharers && slot.end <= entry.end)))
+                    continue;
+                if (victim == -1 || slot_sharers < victim_sharers
+                        || (slot_sharers == victim_sharers
+                            && slot.end > slots[victim].end)) {
+                    victim = i;
+                    victim_sharers = slot_sharers;
+                }
+            }
+
+            if (victim != -1) {
+                slots[victim].recording.get (0).device = -1;
+                slots[victim] = null;
+            }
+            return victim;
+        }
+
+        /**
+         * @returns: Number of timers of @transport that start
+         * after @after and before @before
+         */
+        private int count_sharers (uint transport, int64 after, int64 before) {
+            ArrayList<Entry> list = this.transport_entries.get (transport);
+            return find_first_start (list, before, false)
+                - find_first_start (list, after, true);
+        }
+
+        /**
+         * @returns: Index of the first entry in @list that starts
+         * after @time or at @time if @inclusive is FALSE
+         */
+        private static int find_first_start (ArrayList<Entry> list,
+                int64 time, bool inclusive) {
+            int low = 0;
+            int high = list.size;
+            while (low < high) {
+                int mid = (low + high) / 2;
+                int64 start = list.get (mid).start;
+                if (start < time || (inclusive && start == time))
+                    low = mid + 1;
+                else
+                    high = mid;
+            }
+            return low;
+        }
+    }
+
+}
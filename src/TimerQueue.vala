@@ -0,0 +1,165 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+
+namespace DVB {
+
+    /**
+     * Priority queue of timer ids ordered by the time when
+     * each timer has to be handled next.
+     *
+     * Adding, moving and removing a timer takes O(log n) steps.
+     */
+    public class TimerQueue : GLib.Object {
+
+        private class Entry {
+            public uint32 timer_id;
+            public int64 deadline;
+        }
+
+        // binary min-heap of entries ordered by deadline
+        private ArrayList<Entry> heap;
+        // Maps timer id to position in heap
+        private HashMap<uint32, int> positions;
+
+        public int size {
+            get { return this.heap.size; }
+        }
+
+        construct {
+            this.heap = new ArrayList<Entry> ();
+            this.positions = new HashMap<uint32, int> ();
+        }
+
+        /**
+         * @deadline: UNIX timestamp
+         *
+         * Add the timer or move it if it's already part of the queue
+         */
+        public void schedule (uint32 timer_id, int64 deadline) {
+            if (this.positions.has_key (timer_id)) {
+                int pos = this.positions.get (timer_id);
+                Entry entry = this.heap.get (pos);
+                int64 old_deadline = entry.deadline;
+                entry.deadline = deadline;
+                if (deadline < old_deadline)
+                    this.sift_up (pos);
+                else
+                    this.sift_down (pos);
+            } else {
+                Entry entry = new Entry ();
+                entry.timer_id = timer_id;
+                entry.deadline = deadline;
+                this.heap.add (entry);
+                this.positions.set (timer_id, this.heap.size - 1);
+                this.sift_up (this.heap.size - 1);
+            }
+        }
+
+        /**
+         * @returns: FALSE if the timer isn't part of the queue
+         */
+        public bool unschedule (uint32 timer_id) {
+            if (!this.positions.has_key (timer_id))
+                return false;
+            int pos = this.positions.get (timer_id);
+            this.positions.unset (timer_id);
+
+            int last = this.heap.size - 1;
+            Entry last_entry = this.heap.remove_at (last);
+            if (pos != last) {
+                int64 old_deadline = this.heap.get (pos).deadline;
+                this.heap.set (pos, last_entry);
+                this.positions.set (last_entry.timer_id, pos);
+                if (last_entry.deadline < old_deadline)
+                    this.sift_up (pos);
+                else
+                    this.sift_down (pos);
+            }
+            return true;
+        }
+
+        public bool contains (uint32 timer_id) {
+            return this.positions.has_key (timer_id);
+        }
+
+        /**
+         * @returns: FALSE if the queue is empty
+         *
+         * Get the timer that has to be handled first
+         */
+        public bool peek (out uint32 timer_id, out int64 deadline) {
+            if (this.heap.size == 0) {
+                timer_id = 0;
+                deadline = 0;
+                return false;
+            }
+            Entry first = this.heap.get (0);
+            timer_id = first.timer_id;
+            deadline = first.deadline;
+            return true;
+        }
+
+        public void clear () {
+            this.heap.clear ();
+            this.positions.clear ();
+        }
+
+        private void swap (int i, int j) {
+            Entry a = this.heap.get (i);
+            Entry b = this.heap.get (j);
+            this.heap.set (i, b);
+            this.heap.set (j, a);
+            this.positions.set (b.timer_id, i);
+            this.positions.set (a.timer_id, j);
+        }
+
+        private void sift_up (int pos) {
+            while (pos > 0) {
+                int parent = (pos - 1) / 2;
+                if (this.heap.get (parent).deadline <= this.heap.get (pos).deadline)
+                    break;
+                this.swap (pos, parent);
+                pos = parent;
+            }
+        }
+
+        private void sift_down (int pos) {
+            int size = this.heap.size;
+            while (true) {
+                int smallest = pos;
+                int left = 2 * pos + 1;
+                int right = left + 1;
+                if (left < size && this.heap.get (left).deadline
+                        < this.heap.get (smallest).deadline)
+                    smallest = left;
+                if (right < size && this.heap.get (right).deadline
+                        < this.heap.get (smallest).deadline)
+                    smallest = right;
+                if (smallest == pos)
+                    break;
+                this.swap (pos, smallest);
+                pos = smallest;
+            }
+        }
+    }
+
+}
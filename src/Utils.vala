@@ -18,18 +18,23 @@
  */
 
 using GLib;
+using DVB.Logging;
 
 namespace DVB.Utils {
 
     private const string NAME_ATTRS = FileAttribute.STANDARD_TYPE + "," + FileAttribute.STANDARD_NAME;
     private const string READ_ATTRS = FileAttribute.STANDARD_TYPE + "," + FileAttribute.ACCESS_CAN_READ;
 
+    private static Logger get_log () {
+        return LogManager.getLogManager ().getDefaultLogger ();
+    }
+
     public static inline unowned string? get_nick_from_enum (GLib.Type enumtype, int val) {
         EnumClass eclass = (EnumClass)enumtype.class_ref ();
         unowned EnumValue? eval = eclass.get_value (val);
 
         if (eval == null) {
-            Main.log.error ("Enum has no value %d", val);
+            get_log ().error ("Enum has no value %d", val);
             return null;
         } else {
             return eval.value_nick;
@@ -41,7 +46,7 @@ namespace DVB.Utils {
         unowned EnumValue? eval = enumclass.get_value_by_name (name);
 
         if (eval == null) {
-            Main.log.error ("Enum has no member named %s", name);
+            get_log ().error ("Enum has no member named %s", name);
             evalue = 0;
             return false;
         } else {
@@ -55,7 +60,7 @@ namespace DVB.Utils {
         unowned EnumValue? eval = enumclass.get_value (val);
 
         if (eval == null) {
-            Main.log.error ("Enum has no value %d", val);
+            get_log ().error ("Enum has no value %d", val);
             return null;
         } else {
             return eval.value_name;
@@ -73,7 +78,7 @@ namespace DVB.Utils {
         }
 
         foreach (File dir in create_dirs) {
-            Main.log.debug ("Creating %s", dir.get_path ());
+            get_log ().debug ("Creating %s", dir.get_path ());
             dir.make_directory (null);
         }
     }
@@ -83,7 +88,7 @@ namespace DVB.Utils {
         try {
             regex = new Regex ("[^-_\\.a-zA-Z0-9]", 0, 0);
         } catch (RegexError e) {
-            Main.log.error ("RegexError: %s", e.message);
+            get_log ().error ("RegexError: %s", e.message);
             return text;
         }
 
@@ -91,7 +96,7 @@ namespace DVB.Utils {
         try {
             new_text = regex.replace_literal (text, -1, 0, "_", 0);
         } catch (RegexError e) {
-            Main.log.error ("RegexError: %s", e.message);
+            get_log ().error ("RegexError: %s", e.message);
             return text;
         }
 
@@ -160,17 +165,17 @@ namespace DVB.Utils {
         try {
             info = file.query_info (READ_ATTRS, 0, null);
         } catch (Error e) {
-            Main.log.error ("Could not retrieve attributes: %s", e.message);
+            get_log ().error ("Could not retrieve attributes: %s", e.message);
             return false;
         }
 
         if (info.get_file_type () != FileType.REGULAR) {
-            Main.log.error ("%s is not a regular file", file.get_path ());
+            get_log ().error ("%s is not a regular file", file.get_path ());
             return false;
         }
 
         if (!info.get_attribute_boolean (FileAttribute.ACCESS_CAN_READ)) {
-            Main.log.error ("Cannot read %s", file.get_path ());
+            get_log ().error ("Cannot read %s", file.get_path ());
             return false;
         }
 
@@ -195,13 +200,13 @@ namespace DVB.Utils {
                 break;
 
                 case FileType.REGULAR:
-                Main.log.debug ("Deleting file %s", child.get_path ());
+                get_log ().debug ("Deleting file %s", child.get_path ());
                 child.delete (null);
                 break;
             }
         }
 
-        Main.log.debug ("Deleting directory %s", dir.get_path ());
+        get_log ().debug ("Deleting directory %s", dir.get_path ());
         dir.delete (null);
     }
 
@@ -237,7 +242,7 @@ namespace DVB.Utils {
     }
 
     public static void dbus_own_name (string service_name, BusAcquiredCallback cb) {
-        Main.log.info ("Creating D-Bus service %s", service_name);
+        get_log ().info ("Creating D-Bus service %s", service_name);
         Bus.own_name (BusType.SESSION, service_name, BusNameOwnerFlags.NONE,
             cb,
             () => {},
@@ -248,7 +253,7 @@ namespace DVB.Utils {
         try {
             conn.register_object (object_path, obj);
         } catch (IOError e) {
-            Main.log.error ("Could not register object '%s': %s", object_path, e.message);
+            get_log ().error ("Could not register object '%s': %s", object_path, e.message);
         }
     }
 
@@ -24,6 +24,11 @@ namespace DVB.database {
     public interface EPGStore : GLib.Object {
 
         public abstract bool add_or_update_event (Event event, uint channel_sid, uint group_id) throws SqlError;
+        /**
+         * Remove the events with the ids in @removed_ids and add or
+         * update all @events in a single transaction
+         */
+        public abstract bool replace_events (Gee.Collection<uint> removed_ids, Gee.Collection<Event> events, uint channel_sid, uint group_id) throws SqlError;
         public abstract Event? get_event (uint event_id, uint channel_sid, uint group_id) throws SqlError;
         public abstract bool remove_event (uint event_id, uint channel_sid, uint group_id) throws SqlError;
         public abstract bool remove_events_older_than (Event event, uint channel_sid, uint group_id) throws SqlError;
@@ -0,0 +1,53 @@
+/*
+ * Copyright (C) 2010 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+
+namespace DVB.database {
+
+    /**
+     * Stores the recordings restored from each directory
+     * together with the modification time of the directory
+     */
+    public interface RecordingsIndex : GLib.Object {
+
+        /**
+         * @basedir: The directory containing the recordings
+         * @mtimes: Maps the directory of each recording to its
+         * modification time in microseconds
+         * @returns: Maps the directory of each recording to the recording
+         */
+        public abstract Gee.Map<string, Recording> get_recordings (File basedir,
+            out Gee.Map<string, int64?> mtimes) throws SqlError;
+
+        /**
+         * @recordings: Maps directories to their recording or to NULL
+         * if the directory doesn't contain a recording anymore
+         * @mtimes: Maps the directory of each recording to its
+         * modification time in microseconds
+         *
+         * Add, update and remove all directories in a single transaction
+         */
+        public abstract bool update_directories (File basedir,
+            Gee.Map<string, Recording?> recordings,
+            Gee.Map<string, int64?> mtimes) throws SqlError;
+
+    }
+
+}
@@ -266,7 +266,7 @@ namespace DVB.database.sqlite {
 
                 // Create device group
                 DeviceGroup group = new DeviceGroup ((uint)group_id, channels_file, rec_dir,
-                    type, !Main.get_disable_epg_scanner ());
+                    type, !Manager.disable_epg_scanner);
                 group.Name = statement.column_text (4);
 
                 groups.add (group);
@@ -298,7 +298,7 @@ namespace DVB.database.sqlite {
 
                 // Create device group
                 group = new DeviceGroup ((uint)group_id, channels_file, rec_dir,
-                    type, !Main.get_disable_epg_scanner());
+                    type, !Manager.disable_epg_scanner);
                 group.Name = this.select_device_group_statement.column_text (4);
             }
 
@@ -88,12 +88,20 @@ namespace DVB.database.sqlite {
 
         public void set_journal_mode () {
             try {
-                this.exec_sql ("PRAGMA journal_mode = TRUNCATE");
+                this.exec_sql ("PRAGMA journal_mode = %s".printf (
+                    this.get_journal_mode ()));
             } catch (SqlError e) {
                 log.error ("%s", e.message);
             }
         }
 
+        /**
+         * @returns: The journal mode used for the database
+         */
+        protected virtual string get_journal_mode () {
+            return "TRUNCATE";
+        }
+
         /**
          * Get database version
          */
@@ -133,16 +141,28 @@ namespace DVB.database.sqlite {
             this.exec_sql ("END;");
         }
 
+        public void rollback_transaction () throws SqlError {
+            this.exec_sql ("ROLLBACK;");
+        }
+
         protected void throw_last_error_reset (Statement stmnt) throws SqlError {
             stmnt.reset ();
             this.throw_last_error ();
         }
 
         protected void throw_last_error (string? errmsg=null) throws SqlError {
-            int code = this.db.errcode ();
+            throw_error (this.db, errmsg);
+        }
+
+        /**
+         * Throw the last error that occured on @database
+         */
+        protected static void throw_error (Database database,
+                string? errmsg=null) throws SqlError {
+            int code = database.errcode ();
             string msg;
             if (errmsg == null) {
-                msg = "SqlError: %d: %s".printf (code, this.db.errmsg ());
+                msg = "SqlError: %d: %s".printf (code, database.errmsg ());
             } else {
                 msg = errmsg;
             }
@@ -28,13 +28,14 @@ namespace DVB.database.sqlite {
 
         private static Logger log = LogManager.getLogManager().getDefaultLogger();
 
-        private const int VERSION = 2;
+        private const int VERSION = 3;
 
+        // starttime is the UNIX timestamp of the start
         private const string CREATE_EVENTS_TABLE_STATEMENT =
             """CREATE TABLE events (group_id INTEGER,
             sid INTEGER,
             event_id INTEGER,
-            starttime JULIAN,
+            starttime INTEGER,
             duration INTEGER,
             running_status INTEGER(2),
             free_ca_mode INTEGER(1),
@@ -43,36 +44,41 @@ namespace DVB.database.sqlite {
             extended_description TEXT,
             PRIMARY KEY (group_id, sid, event_id))""";
 
-        private const string INSERT_EVENT_SQL =
-            "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)";
+        // Covers restoring the events of a channel
+        // and removing expired ones
+        private const string CREATE_STARTTIME_INDEX_STATEMENT =
+            """CREATE INDEX events_starttime ON events
+            (group_id, sid, starttime, duration, event_id)""";
+
+        // Converts julian days of version 2 to UNIX timestamps
+        private const string MIGRATE_EVENTS_STATEMENT =
+            """INSERT INTO events SELECT group_id, sid, event_id,
+            CAST(round((starttime - 2440587.5) * 86400) AS INTEGER),
+            duration, running_status, free_ca_mode, name, description,
+            extended_description FROM events_v2""";
+
+        private const string UPSERT_EVENT_SQL =
+            """INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (group_id, sid, event_id) DO UPDATE SET
+            starttime=excluded.starttime, duration=excluded.duration,
+            running_status=excluded.running_status,
+            free_ca_mode=excluded.free_ca_mode, name=excluded.name,
+            description=excluded.description,
+            extended_description=excluded.extended_description""";
 
         private const string DELETE_EVENT_STATEMENT =
             "DELETE FROM events WHERE group_id=? AND sid=? AND event_id=?";
 
-        private const string SELECT_ALL_EVENTS_STATEMENT =
-            """SELECT event_id, datetime(starttime),
-            duration, running_status, free_ca_mode, name,
-            description, extended_description
-            FROM events WHERE group_id='%u' AND sid='%u'""";
-
         private const string SELECT_MINIMAL_EVENTS_STATEMENT =
-            """SELECT event_id, datetime(starttime),
-            duration FROM events WHERE group_id='%u' AND sid='%u'
+            """SELECT event_id, starttime,
+            duration FROM events WHERE group_id=? AND sid=?
             ORDER BY starttime ASC""";
 
         private const string HAS_EVENT_STATEMENT =
             "SELECT 1 FROM events WHERE group_id=? AND sid=? AND event_id=? LIMIT 1";
 
-        private const string UPDATE_EVENT_SQL =
-            """UPDATE events SET starttime=?, duration=?, running_status=?,
-            free_ca_mode=?, name=?, description=?,
-            extended_description=? WHERE group_id=? AND sid=? AND event_id=?""";
-
-        private const string TO_JULIAN_SQL =
-            "SELECT julianday(?)";
-
         private const string SELECT_EVENT_SQL =
-            """SELECT event_id, datetime(starttime),
+            """SELECT event_id, starttime,
             duration, running_status, free_ca_mode, name,
             description, extended_description
             FROM events WHERE group_id=? AND sid=? AND event_id=?""";
@@ -81,17 +87,30 @@ namespace DVB.database.sqlite {
         "DELETE FROM events WHERE group_id=?";
 
         private const string DELETE_EXPIRED_EVENTS =
-        """DELETE FROM events WHERE starttime <= julianday(?, 'unixepoch')
-        AND sid=? AND group_id=?""";
+        """DELETE FROM events WHERE sid=?2 AND group_id=?3
+        AND starttime < ?1 AND starttime + duration <= ?1""";
+
+        // how long readers wait for the writer in milliseconds
+        private const int BUSY_TIMEOUT = 5000;
+
+        /**
+         * Read-only connection with its own prepared statements
+         */
+        private class ReadConnection {
+            public Database db;
+            public Statement has_event_statement;
+            public Statement select_event_statement;
+            public Statement select_events_statement;
+        }
 
-        private Statement to_julian_statement;
-        private Statement insert_event_statement;
-        private Statement update_event_statement;
+        private Statement upsert_event_statement;
         private Statement delete_event_statement;
-        private Statement has_event_statement;
-        private Statement select_event_statement;
         private Statement delete_events_group;
         private Statement delete_expired_events;
+        // idle read-only connections
+        private AsyncQueue<ReadConnection> read_connections;
+        private int n_read_connections;
+        private DVB.Settings settings;
 
         public SqliteEPGStore () {
             File cache_dir = File.new_for_path (
@@ -100,126 +119,217 @@ namespace DVB.database.sqlite {
             File database_file = our_cache.get_child ("eventsdb.sqlite3");
 
             base (database_file, VERSION);
+            this.settings = new Factory().get_settings ();
+            this.read_connections = new AsyncQueue<ReadConnection> ();
+            this.n_read_connections = 0;
+        }
+
+        protected override string get_journal_mode () {
+            return this.settings.get_epg_database_journal_mode ();
         }
 
         public override void on_open () {
-            this.db.prepare (TO_JULIAN_SQL, -1,
-                out this.to_julian_statement);
-            this.db.prepare (INSERT_EVENT_SQL, -1,
-                out this.insert_event_statement);
-            this.db.prepare (UPDATE_EVENT_SQL, -1,
-                out this.update_event_statement);
+            try {
+                this.exec_sql ("PRAGMA synchronous = %s".printf (
+                    this.settings.get_epg_database_synchronous ()));
+                this.set_cache_and_mmap_size (this.db);
+            } catch (SqlError e) {
+                log.error ("%s", e.message);
+            }
+
+            this.db.prepare (UPSERT_EVENT_SQL, -1,
+                out this.upsert_event_statement);
             this.db.prepare (DELETE_EVENT_STATEMENT, -1,
                 out this.delete_event_statement);
-            this.db.prepare (HAS_EVENT_STATEMENT, -1,
-                out this.has_event_statement);
-            this.db.prepare (SELECT_EVENT_SQL, -1,
-                out this.select_event_statement);
             this.db.prepare (DELETE_EVENTS_GROUP, -1,
                 out this.delete_events_group);
             this.db.prepare (DELETE_EXPIRED_EVENTS, -1,
                 out this.delete_expired_events);
+
+            // Readers don't have to wait for writers in WAL mode
+            int readers = this.settings.get_epg_database_readers ();
+            for (int i=0; i<readers; i++) {
+                ReadConnection? conn = this.open_read_connection ();
+                if (conn == null) break;
+                this.read_connections.push ((owned)conn);
+                this.n_read_connections++;
+            }
+            log.debug ("Opened %d read-only connections to %s",
+                this.n_read_connections, this.database_file.get_path ());
+        }
+
+        private ReadConnection? open_read_connection () {
+            var conn = new ReadConnection ();
+            if (Database.open_v2 (this.database_file.get_path (), out conn.db,
+                    Sqlite.OPEN_READONLY) != Sqlite.OK) {
+                log.error ("Could not open read-only connection: %s",
+                    (conn.db == null) ? "" : conn.db.errmsg ());
+                return null;
+            }
+            conn.db.busy_timeout (BUSY_TIMEOUT);
+            try {
+                this.set_cache_and_mmap_size (conn.db);
+            } catch (SqlError e) {
+                log.error ("%s", e.message);
+            }
+
+            if (conn.db.prepare (HAS_EVENT_STATEMENT, -1,
+                        out conn.has_event_statement) != Sqlite.OK
+                    || conn.db.prepare (SELECT_EVENT_SQL, -1,
+                        out conn.select_event_statement) != Sqlite.OK
+                    || conn.db.prepare (SELECT_MINIMAL_EVENTS_STATEMENT, -1,
+                        out conn.select_events_statement) != Sqlite.OK) {
+                log.error ("%s", conn.db.errmsg ());
+                return null;
+            }
+            return conn;
+        }
+
+        private void set_cache_and_mmap_size (Database database)
+                throws SqlError {
+            // Negative values are in KiB instead of pages
+            string sql = "PRAGMA cache_size = -%d; PRAGMA mmap_size = %s".printf (
+                this.settings.get_epg_database_cache_size (),
+                this.settings.get_epg_database_mmap_size ().to_string ());
+            if (database.exec (sql) != Sqlite.OK)
+                throw_error (database);
+        }
+
+        /**
+         * Wait for an idle read-only connection
+         */
+        private ReadConnection acquire_read_connection () throws SqlError {
+            if (this.n_read_connections == 0)
+                throw new SqlError.CANTOPEN ("No connection for reading");
+            return this.read_connections.pop ();
+        }
+
+        private void release_read_connection (owned ReadConnection conn) {
+            this.read_connections.push ((owned)conn);
         }
 
         public override void create () throws SqlError {
             this.exec_sql (CREATE_EVENTS_TABLE_STATEMENT);
-            this.exec_sql ("PRAGMA synchronous=OFF");
+            this.exec_sql (CREATE_STARTTIME_INDEX_STATEMENT);
         }
 
         public override void upgrade (int old_version, int new_version)
                 throws SqlError
         {
-            if (old_version == 1) {
-                this.exec_sql ("PRAGMA synchronous=OFF");
+            if (old_version < 3) {
+                log.info ("Converting start times of events to UNIX timestamps");
+                this.begin_transaction ();
+                try {
+                    this.exec_sql ("ALTER TABLE events RENAME TO events_v2");
+                    this.exec_sql (CREATE_EVENTS_TABLE_STATEMENT);
+                    this.exec_sql (MIGRATE_EVENTS_STATEMENT);
+                    this.exec_sql ("DROP TABLE events_v2");
+                    this.exec_sql (CREATE_STARTTIME_INDEX_STATEMENT);
+                } catch (SqlError e) {
+                    this.rollback_transaction ();
+                    throw e;
+                }
+                this.end_transaction ();
             }
         }
 
         public bool add_or_update_event (Event event, uint channel_sid,
                 uint group_id) throws SqlError
+        {
+            return this.upsert_event (event, channel_sid, group_id);
+        }
+
+        public bool replace_events (Gee.Collection<uint> removed_ids,
+                Gee.Collection<Event> events, uint channel_sid,
+                uint group_id) throws SqlError
+        {
+            bool success = true;
+            this.begin_transaction ();
+            try {
+                foreach (uint event_id in removed_ids) {
+                    if (!this.remove_event (event_id, channel_sid, group_id))
+                        success = false;
+                }
+                foreach (Event event in events) {
+                    if (!this.upsert_event (event, channel_sid, group_id))
+                        success = false;
+                }
+            } catch (SqlError e) {
+                this.rollback_transaction ();
+                throw e;
+            }
+            this.end_transaction ();
+
+            return success;
+        }
+
+        private bool upsert_event (Event event, uint channel_sid,
+                uint group_id) throws SqlError
         {
             int free_ca_mode = (event.free_ca_mode) ? 1 : 0;
 
             string name = SqliteUtils.escape (event.name);
             string desc = SqliteUtils.escape (event.description);
             string ext_desc = SqliteUtils.escape (event.extended_description);
-            double julian_start = this.to_julian (event.year, event.month,
-                event.day, event.hour, event.minute, event.second);
+            int64 start = get_start_timestamp (event);
 
             // Check if start time got converted correctly
-            if (julian_start <= 0) {
+            if (start <= 0) {
                 log.warning ("Failed to convert start time");
                 return false;
             }
 
-            if (this.contains_event (event, channel_sid, group_id)) {
-                if (this.update_event_statement.bind_double (1, julian_start) != Sqlite.OK
-                        || this.update_event_statement.bind_int (2, (int)event.duration) != Sqlite.OK
-                        || this.update_event_statement.bind_int (3, (int)event.running_status) != Sqlite.OK
-                        || this.update_event_statement.bind_int (4, free_ca_mode) != Sqlite.OK
-                        || this.update_event_statement.bind_text (5, name) != Sqlite.OK
-                        || this.update_event_statement.bind_text (6, desc) != Sqlite.OK
-                        || this.update_event_statement.bind_text (7, ext_desc) != Sqlite.OK
-                        || this.update_event_statement.bind_int (8, (int)group_id) != Sqlite.OK
-                        || this.update_event_statement.bind_int (9, (int)channel_sid) != Sqlite.OK
-                        || this.update_event_statement.bind_int (10, (int)event.id) != Sqlite.OK) {
-                    this.throw_last_error ();
-                    return false;
-                }
-
-                if (this.update_event_statement.step () != Sqlite.DONE) {
-                    this.throw_last_error_reset (this.update_event_statement);
-                    return false;
-                }
-
-                this.update_event_statement.reset ();
-            } else {
-                if (this.insert_event_statement.bind_int (1, (int)group_id) != Sqlite.OK
-                        || this.insert_event_statement.bind_int (2, (int)channel_sid) != Sqlite.OK
-                        || this.insert_event_statement.bind_int (3, (int)event.id) != Sqlite.OK
-                        || this.insert_event_statement.bind_double (4, julian_start) != Sqlite.OK
-                        || this.insert_event_statement.bind_int (5, (int)event.duration) != Sqlite.OK
-                        || this.insert_event_statement.bind_int (6, (int)event.running_status) != Sqlite.OK
-                        || this.insert_event_statement.bind_int (7, free_ca_mode) != Sqlite.OK
-                        || this.insert_event_statement.bind_text (8, name) != Sqlite.OK
-                        || this.insert_event_statement.bind_text (9, desc) != Sqlite.OK
-                        || this.insert_event_statement.bind_text (10, ext_desc) != Sqlite.OK) {
-                    this.throw_last_error ();
-                    return false;
-                }
-
-                if (this.insert_event_statement.step () != Sqlite.DONE) {
-                    this.throw_last_error_reset (this.insert_event_statement);
-                    return false;
-                }
+            if (this.upsert_event_statement.bind_int (1, (int)group_id) != Sqlite.OK
+                    || this.upsert_event_statement.bind_int (2, (int)channel_sid) != Sqlite.OK
+                    || this.upsert_event_statement.bind_int (3, (int)event.id) != Sqlite.OK
+                    || this.upsert_event_statement.bind_int64 (4, start) != Sqlite.OK
+                    || this.upsert_event_statement.bind_int (5, (int)event.duration) != Sqlite.OK
+                    || this.upsert_event_statement.bind_int (6, (int)event.running_status) != Sqlite.OK
+                    || this.upsert_event_statement.bind_int (7, free_ca_mode) != Sqlite.OK
+                    || this.upsert_event_statement.bind_text (8, name) != Sqlite.OK
+                    || this.upsert_event_statement.bind_text (9, desc) != Sqlite.OK
+                    || this.upsert_event_statement.bind_text (10, ext_desc) != Sqlite.OK) {
+                this.throw_last_error ();
+                return false;
+            }
 
-                this.insert_event_statement.reset ();
+            if (this.upsert_event_statement.step () != Sqlite.DONE) {
+                this.throw_last_error_reset (this.upsert_event_statement);
+                return false;
             }
+
+            this.upsert_event_statement.reset ();
             return true;
         }
 
         public Event? get_event (uint event_id, uint channel_sid,
                 uint group_id) throws SqlError
         {
-            if (this.select_event_statement.bind_int (1, (int)group_id) != Sqlite.OK
-                    || this.select_event_statement.bind_int (2, (int)channel_sid) != Sqlite.OK
-                    || this.select_event_statement.bind_int (3, (int)event_id) != Sqlite.OK) {
-                this.throw_last_error ();
-                return null;
-            }
+            ReadConnection conn = this.acquire_read_connection ();
+            unowned Statement statement = conn.select_event_statement;
+            Event? event = null;
+            try {
+                if (statement.bind_int (1, (int)group_id) != Sqlite.OK
+                        || statement.bind_int (2, (int)channel_sid) != Sqlite.OK
+                        || statement.bind_int (3, (int)event_id) != Sqlite.OK) {
+                    throw_error (conn.db);
+                }
 
-            int rc = this.select_event_statement.step ();
+                int rc = statement.step ();
 
-            if (rc != Sqlite.ROW && rc != Sqlite.DONE) {
-                this.throw_last_error_reset (this.select_event_statement);
-                return null;
-            }
+                if (rc != Sqlite.ROW && rc != Sqlite.DONE) {
+                    statement.reset ();
+                    throw_error (conn.db);
+                }
 
-            // ROW means there's data, DONE means there's none
-            Event? event = null;
-            if (rc != Sqlite.DONE) {
-                event = this.create_event_from_statement (this.select_event_statement);
+                // ROW means there's data, DONE means there's none
+                if (rc != Sqlite.DONE) {
+                    event = this.create_event_from_statement (statement);
+                }
+                statement.reset ();
+            } finally {
+                this.release_read_connection ((owned)conn);
             }
-            this.select_event_statement.reset ();
 
             return event;
         }
@@ -247,7 +357,7 @@ namespace DVB.database.sqlite {
         public bool remove_events_older_than (Event event, uint channel_sid,
                 uint group_id) throws SqlError
         {
-            time_t timestamp = event.get_end_timestamp ();
+            int64 timestamp = get_start_timestamp (event) + event.duration;
 
             if (this.delete_expired_events.bind_int64 (1, timestamp) != Sqlite.OK
                     || this.delete_expired_events.bind_int (2, (int)channel_sid) != Sqlite.OK
@@ -269,19 +379,24 @@ namespace DVB.database.sqlite {
 
         public bool contains_event (Event event, uint channel_sid, uint group_id) throws SqlError
         {
-            if (this.has_event_statement.bind_int (1, (int)group_id) != Sqlite.OK
-                    || this.has_event_statement.bind_int (2, (int)channel_sid) != Sqlite.OK
-                    || this.has_event_statement.bind_int (3, (int)event.id) != Sqlite.OK) {
-                this.throw_last_error ();
-                return false;
-            }
-
+            ReadConnection conn = this.acquire_read_connection ();
+            unowned Statement statement = conn.has_event_statement;
             int c = 0;
-            while (this.has_event_statement.step () == Sqlite.ROW) {
-                c = this.has_event_statement.column_int (0);
-            }
+            try {
+                if (statement.bind_int (1, (int)group_id) != Sqlite.OK
+                        || statement.bind_int (2, (int)channel_sid) != Sqlite.OK
+                        || statement.bind_int (3, (int)event.id) != Sqlite.OK) {
+                    throw_error (conn.db);
+                }
+
+                while (statement.step () == Sqlite.ROW) {
+                    c = statement.column_int (0);
+                }
 
-            this.has_event_statement.reset ();
+                statement.reset ();
+            } finally {
+                this.release_read_connection ((owned)conn);
+            }
 
             return (c > 0);
         }
@@ -291,23 +406,21 @@ namespace DVB.database.sqlite {
         {
             Gee.List<Event> events = new ArrayList<Event> ();
 
-            if (this.db == null) {
-                log.warning ("DB not initialized");
-                return events;
-            }
-
-            string statement_str = SELECT_MINIMAL_EVENTS_STATEMENT.printf (
-                group_id, channel_sid);
-
-            Statement statement;
-            if (this.db.prepare (statement_str, -1, out statement) != Sqlite.OK) {
-                this.throw_last_error ();
-                return events;
-            }
+            ReadConnection conn = this.acquire_read_connection ();
+            unowned Statement statement = conn.select_events_statement;
+            try {
+                if (statement.bind_int (1, (int)group_id) != Sqlite.OK
+                        || statement.bind_int (2, (int)channel_sid) != Sqlite.OK) {
+                    throw_error (conn.db);
+                }
 
-            while (statement.step () == Sqlite.ROW) {
-                Event event = this.create_minimal_event (statement);
-                events.add (event);
+                while (statement.step () == Sqlite.ROW) {
+                    Event event = this.create_minimal_event (statement);
+                    events.add (event);
+                }
+                statement.reset ();
+            } finally {
+                this.release_read_connection ((owned)conn);
             }
 
             return events;
@@ -333,14 +446,7 @@ namespace DVB.database.sqlite {
             var event = new Event ();
             event.id = (uint)statement.column_int (0);
 
-            weak string starttime = statement.column_text (1);
-            starttime.scanf ("%04u-%02u-%02u %02u:%02u:%02u",
-                &event.year,
-                &event.month,
-                &event.day,
-                &event.hour,
-                &event.minute,
-                &event.second);
+            event.set_start_time (statement.column_int64 (1));
 
             event.duration = (uint)statement.column_int (2);
 
@@ -351,14 +457,7 @@ namespace DVB.database.sqlite {
             var event = new Event ();
             event.id = (uint)statement.column_int (0);
 
-            weak string starttime = statement.column_text (1);
-            starttime.scanf ("%04u-%02u-%02u %02u:%02u:%02u",
-                &event.year,
-                &event.month,
-                &event.day,
-                &event.hour,
-                &event.minute,
-                &event.second);
+            event.set_start_time (statement.column_int64 (1));
 
             event.duration = (uint)statement.column_int (2);
             event.running_status = (uint)statement.column_int (3);
@@ -377,28 +476,13 @@ namespace DVB.database.sqlite {
             return event;
         }
 
-        private double to_julian (uint year, uint month, uint day,
-                uint hour, uint minute, uint second) throws SqlError {
-
-            string datetime_str = "%04u-%02u-%02u %02u:%02u:%02u".printf (
-                year, month, day, hour, minute, second);
-
-            if (this.to_julian_statement.bind_text (1, datetime_str)
-                    != Sqlite.OK) {
-                this.throw_last_error ();
+        /**
+         * @returns: UNIX timestamp of the start of @event
+         */
+        private static int64 get_start_timestamp (Event event) {
+            if (event.year < 1970 || event.month < 1 || event.day < 1)
                 return 0;
-            }
-
-            if (this.to_julian_statement.step () != Sqlite.ROW) {
-                this.throw_last_error ();
-                return 0;
-            }
-
-            double val = this.to_julian_statement.column_double (0);
-
-            this.to_julian_statement.reset ();
-
-            return val;
+            return (int64)cUtils.timegm (event.get_utc_start_time ());
         }
 
     }
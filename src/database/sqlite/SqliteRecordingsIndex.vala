@@ -0,0 +1,213 @@
+/*
+ * Copyright (C) 2010 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+using Sqlite;
+using DVB.Logging;
+
+namespace DVB.database.sqlite {
+
+    public class SqliteRecordingsIndex : SqliteDatabase, RecordingsIndex {
+
+        private static Logger log = LogManager.getLogManager().getDefaultLogger();
+
+        private const int VERSION = 1;
+
+        // mtime is the modification time of directory in microseconds,
+        // starttime is the UNIX timestamp of the start
+        private const string CREATE_RECORDINGS_TABLE_STATEMENT =
+            """CREATE TABLE recordings (directory TEXT PRIMARY KEY,
+            basedir TEXT,
+            mtime INTEGER,
+            id INTEGER,
+            channel_name TEXT,
+            location TEXT,
+            starttime INTEGER,
+            length INTEGER,
+            name TEXT,
+            description TEXT)""";
+
+        private const string CREATE_BASEDIR_INDEX_STATEMENT =
+            "CREATE INDEX recordings_basedir ON recordings (basedir)";
+
+        private const string UPSERT_RECORDING_SQL =
+            "INSERT OR REPLACE INTO recordings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)";
+
+        private const string DELETE_RECORDING_STATEMENT =
+            "DELETE FROM recordings WHERE directory=?";
+
+        private const string SELECT_RECORDINGS_STATEMENT =
+            """SELECT directory, mtime, id, channel_name, location, starttime,
+            length, name, description FROM recordings WHERE basedir=?""";
+
+        private Statement upsert_recording_statement;
+        private Statement delete_recording_statement;
+        private Statement select_recordings_statement;
+
+        public SqliteRecordingsIndex () {
+            File cache_dir = File.new_for_path (
+            Environment.get_user_cache_dir ());
+            File our_cache = cache_dir.get_child ("gnome-dvb-daemon");
+            File database_file = our_cache.get_child ("recordingsindex.sqlite3");
+
+            base (database_file, VERSION);
+        }
+
+        public override void on_open () {
+            this.db.prepare (UPSERT_RECORDING_SQL, -1,
+                out this.upsert_recording_statement);
+            this.db.prepare (DELETE_RECORDING_STATEMENT, -1,
+                out this.delete_recording_statement);
+            this.db.prepare (SELECT_RECORDINGS_STATEMENT, -1,
+                out this.select_recordings_statement);
+        }
+
+        public override void create () throws SqlError {
+            this.exec_sql (CREATE_RECORDINGS_TABLE_STATEMENT);
+            this.exec_sql (CREATE_BASEDIR_INDEX_STATEMENT);
+        }
+
+        public override void upgrade (int old_version, int new_version)
+                throws SqlError
+        {
+        }
+
+        public Gee.Map<string, Recording> get_recordings (File basedir,
+                out Gee.Map<string, int64?> mtimes) throws SqlError
+        {
+            var recordings = new HashMap<string, Recording> ();
+            mtimes = new HashMap<string, int64?> ();
+
+            if (this.select_recordings_statement.bind_text (1,
+                    basedir.get_path ()) != Sqlite.OK) {
+                this.throw_last_error ();
+            }
+
+            int rc;
+            while ((rc = this.select_recordings_statement.step ()) == Sqlite.ROW) {
+                string directory = this.select_recordings_statement.column_text (0);
+                mtimes.set (directory,
+                    this.select_recordings_statement.column_int64 (1));
+                recordings.set (directory, create_recording_from_statement (
+                    this.select_recordings_statement));
+            }
+            if (rc != Sqlite.DONE)
+                this.throw_last_error_reset (this.select_recordings_statement);
+            this.select_recordings_statement.reset ();
+
+            return recordings;
+        }
+
+        public bool update_directories (File basedir,
+                Gee.Map<string, Recording?> recordings,
+                Gee.Map<string, int64?> mtimes) throws SqlError
+        {
+            bool success = true;
+            this.begin_transaction ();
+            try {
+                foreach (Map.Entry<string, Recording?> entry in recordings.entries) {
+                    bool ret;
+                    if (entry.value == null) {
+                        ret = this.remove_directory (entry.key);
+                    } else {
+                        ret = this.upsert_recording (basedir, entry.key,
+                            mtimes.get (entry.key), entry.value);
+                    }
+                    if (!ret)
+                        success = false;
+                }
+            } catch (SqlError e) {
+                this.rollback_transaction ();
+                throw e;
+            }
+            this.end_transaction ();
+
+            return success;
+        }
+
+        private bool upsert_recording (File basedir, string directory,
+                int64 mtime, Recording rec) throws SqlError
+        {
+            unowned Statement statement = this.upsert_recording_statement;
+            string? location = (rec.Location == null)
+                ? null : rec.Location.get_path ();
+
+            if (statement.bind_text (1, directory) != Sqlite.OK
+                    || statement.bind_text (2, basedir.get_path ()) != Sqlite.OK
+                    || statement.bind_int64 (3, mtime) != Sqlite.OK
+                    || statement.bind_int64 (4, rec.Id) != Sqlite.OK
+                    || bind_text_or_null (statement, 5, rec.ChannelName) != Sqlite.OK
+                    || bind_text_or_null (statement, 6, location) != Sqlite.OK
+                    || statement.bind_int64 (7, (int64)rec.StartTime.mktime ()) != Sqlite.OK
+                    || statement.bind_int64 (8, rec.Length) != Sqlite.OK
+                    || bind_text_or_null (statement, 9, rec.Name) != Sqlite.OK
+                    || bind_text_or_null (statement, 10, rec.Description) != Sqlite.OK) {
+                this.throw_last_error ();
+                return false;
+            }
+
+            if (statement.step () != Sqlite.DONE) {
+                this.throw_last_error_reset (statement);
+                return false;
+            }
+
+            statement.reset ();
+            return true;
+        }
+
+        private bool remove_directory (string directory) throws SqlError {
+            if (this.delete_recording_statement.bind_text (1, directory) != Sqlite.OK) {
+                this.throw_last_error ();
+                return false;
+            }
+
+            if (this.delete_recording_statement.step () != Sqlite.DONE) {
+                this.throw_last_error_reset (this.delete_recording_statement);
+                return false;
+            }
+
+            this.delete_recording_statement.reset ();
+            return true;
+        }
+
+        private static int bind_text_or_null (Statement statement, int index,
+                string? text) {
+            if (text == null)
+                return statement.bind_null (index);
+            return statement.bind_text (index, text);
+        }
+
+        private static Recording create_recording_from_statement (
+                Statement statement) {
+            var rec = new Recording ();
+            rec.Id = (uint32)statement.column_int64 (2);
+            rec.ChannelName = statement.column_text (3);
+            string? location = statement.column_text (4);
+            rec.Location = (location == null) ? null : File.new_for_path (location);
+            rec.StartTime = Time.local ((time_t)statement.column_int64 (5));
+            rec.Length = statement.column_int64 (6);
+            rec.Name = statement.column_text (7);
+            rec.Description = statement.column_text (8);
+            return rec;
+        }
+
+    }
+
+}
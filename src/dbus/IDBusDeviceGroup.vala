@@ -21,6 +21,16 @@ using GLib;
 
 namespace DVB {
 
+    public struct RunningNextInfo {
+        public uint32 channel_sid;
+        public uint32 running_id;
+        public string running_name;
+        public int64 running_start;
+        public uint32 next_id;
+        public string next_name;
+        public int64 next_start;
+    }
+
     [DBus (name = "org.gnome.DVB.DeviceGroup")]
     public interface IDBusDeviceGroup : GLib.Object {
 
@@ -91,6 +101,13 @@ namespace DVB {
          */
         public abstract bool GetSchedule (uint channel_sid, out ObjectPath opath) throws DBusError, IOError;
 
+        /**
+         * @channel_sids: IDs of channels
+         * @returns: The currently running and the next event of each
+         * given channel. The ID of the event is 0 if there's none.
+         */
+        public abstract RunningNextInfo[] GetInformationsBulk (uint32[] channel_sids) throws DBusError, IOError;
+
         /**
          * @returns: Location of the recordings directory
          */
@@ -33,6 +33,15 @@ namespace DVB {
         public bool type_c;
     }
 
+    public struct FrontendInfo {
+        public uint adapter;
+        public uint frontend;
+        public string name;
+        public bool type_t;
+        public bool type_s;
+        public bool type_c;
+    }
+
     [DBus (name = "org.gnome.DVB.Manager")]
     public interface IDBusManager : GLib.Object {
 
@@ -129,6 +138,12 @@ namespace DVB {
         public abstract bool GetAdapterInfo (uint adapter, uint frontend,
             out AdapterInfo info) throws DBusError, IOError;
 
+        /**
+         * @returns: Adapter, frontend, type and name of
+         * all connected devices
+         */
+        public abstract FrontendInfo[] GetAllAdapterInfos () throws DBusError, IOError;
+
     }
 
 }
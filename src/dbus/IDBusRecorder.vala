@@ -27,6 +27,13 @@ namespace DVB {
         public string title;
     }
 
+    public struct TimerPlanInfo {
+        public uint32 timer_id;
+        public bool conflicting;
+        public uint adapter;
+        public uint frontend;
+    }
+
     [DBus (name = "org.gnome.DVB.Recorder")]
     public interface IDBusRecorder : GLib.Object {
 
@@ -181,6 +188,29 @@ namespace DVB {
          */
         public abstract OverlapType HasTimerForEvent (uint event_id, uint channel_sid) throws DBusError, IOError;
 
+        /**
+         * @channel_sid: SID of channel
+         * @event_ids: ids of EPG events of the channel
+         * @returns: How the timers overlap with each event
+         * or OverlapType.UNKNOWN if the event doesn't exist
+         *
+         * Same as HasTimerForEvent for many events of a channel at once
+         */
+        public abstract OverlapType[] HasTimersForEvents (uint channel_sid, uint[] event_ids) throws DBusError, IOError;
+
+        /**
+         * @returns: The device each timer will be recorded with,
+         * sorted by start time of the timers. Timers that can't be
+         * recorded, because all devices are busy, are marked as conflicting.
+         */
+        public abstract TimerPlanInfo[] GetTimerPlan () throws DBusError, IOError;
+
+        /**
+         * @returns: Ids of timers that can't be recorded,
+         * because all devices are busy
+         */
+        public abstract uint32[] GetConflictingTimers () throws DBusError, IOError;
+
     }
 
 }
@@ -37,6 +37,15 @@ namespace DVB {
          */
         public abstract signal void changed (uint32 rec_id, uint type);
 
+        /**
+         * @rec_ids: The ids of changed recordings
+         * @types: The type of each change, see changed
+         *
+         * Emitted once per main loop iteration with all
+         * changes since the last emission
+         */
+        public abstract signal void changed_bulk (uint32[] rec_ids, uint[] types);
+
         /**
          * @returns: A list of ids for all recordings
          */
@@ -112,6 +121,14 @@ namespace DVB {
          */
         public abstract bool GetAllInformations (uint32 rec_id, out RecordingInfo infos) throws DBusError, IOError;
 
+        /**
+         * @returns: Informations about all recordings
+         *
+         * Equivalent to calling GetAllInformations for each id
+         * returned by GetRecordings
+         */
+        public abstract RecordingInfo[] GetAllRecordingInfos () throws DBusError, IOError;
+
     }
 
 }
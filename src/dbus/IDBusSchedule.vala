@@ -30,6 +30,17 @@ namespace DVB {
         /* public uint[] local_start; */
     }
 
+    public struct TimedEventInfo {
+        public uint32 id;
+        public uint32 next;
+        public string name;
+        public uint duration;
+        public string short_description;
+        public int64 local_start_timestamp;
+        /* How the event overlaps with timers */
+        public OverlapType timer_overlap;
+    }
+
     [DBus (name = "org.gnome.DVB.Schedule")]
     public interface IDBusSchedule : GLib.Object {
 
@@ -37,8 +48,28 @@ namespace DVB {
 
         public abstract EventInfo[] GetAllEventInfos () throws DBusError, IOError;
 
+        /**
+         * @returns: Informations including the start time of all events
+         * that didn't expire yet
+         */
+        public abstract TimedEventInfo[] GetAllTimedEventInfos () throws DBusError, IOError;
+
         public abstract bool GetInformations (uint32 event_id, out EventInfo event_info) throws DBusError, IOError;
 
+        /**
+         * @returns: The start times of all events that didn't expire yet
+         * as UNIX timestamps in the same order as GetAllEventInfos()
+         */
+        public abstract int64[] GetLocalStartTimestamps () throws DBusError, IOError;
+
+        /**
+         * @start: UNIX timestamp
+         * @end: UNIX timestamp
+         * @returns: Informations including the start time of all events
+         * that are running between @start and @end
+         */
+        public abstract TimedEventInfo[] GetEventsInRange (int64 start, int64 end) throws DBusError, IOError;
+
         /**
          * @returns: ID of currently running event
          */
@@ -55,6 +86,13 @@ namespace DVB {
 
         public abstract bool GetExtendedDescription (uint32 event_id, out string description) throws DBusError, IOError;
 
+        /**
+         * @event_ids: IDs of events
+         * @returns: The extended description of each given event in the
+         * same order. The description is empty if the event doesn't exist.
+         */
+        public abstract string[] GetExtendedDescriptions (uint32[] event_ids) throws DBusError, IOError;
+
         public abstract bool GetDuration (uint32 event_id, out uint duration) throws DBusError, IOError;
 
         public abstract bool GetLocalStartTime (uint32 event_id, out uint[] start_time) throws DBusError, IOError;
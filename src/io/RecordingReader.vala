@@ -18,10 +18,23 @@
  */
 
 using GLib;
+using Gee;
+using DVB.database;
 using DVB.Logging;
 
 namespace DVB.io {
 
+    /**
+     * Restores recordings from the recordings index right away and
+     * checks the recordings directory in the background afterwards.
+     *
+     * Only directories whose modification time differs from the one
+     * in the index are read again. Because RecordingWriter replaces
+     * info.rec instead of writing to it, the modification time of
+     * a recording's directory changes with each new info.rec.
+     * The same way the directory can be checked again with check ()
+     * later on.
+     */
     public class RecordingReader : GLib.Object {
 
         private static Logger log = LogManager.getLogManager().getDefaultLogger();
@@ -30,10 +43,56 @@ namespace DVB.io {
         public RecordingsStore store {get; construct;}
         public int max_recursion {get; set; default = 3;}
 
+        /**
+         * Emitted when the store and the index have been
+         * updated after a check has been started
+         */
+        public signal void checked ();
+
         private const string ATTRS = FileAttribute.STANDARD_TYPE
             + "," + FileAttribute.ACCESS_CAN_READ
             + "," + FileAttribute.STANDARD_NAME
-            + "," + FileAttribute.STANDARD_IS_HIDDEN;
+            + "," + FileAttribute.STANDARD_IS_HIDDEN
+            + "," + FileAttribute.TIME_MODIFIED
+            + "," + FileAttribute.TIME_MODIFIED_USEC;
+
+        /**
+         * A directory that has to be read by a thread of the pool
+         */
+        private class ScanJob {
+            public RecordingReader reader;
+            public File directory;
+            public int64 mtime;
+            public int depth;
+        }
+
+        private static ThreadPool<ScanJob>? scan_pool;
+        private static Mutex scan_pool_mutex = Mutex ();
+
+        // Maps directory of each indexed recording to its modification time
+        private Gee.Map<string, int64?> indexed_mtimes;
+        // Directories that have been read again, their recording
+        // or NULL if they don't contain a recording anymore
+        private HashMap<string, Recording?> changed;
+        private HashMap<string, int64?> changed_mtimes;
+        // Directories of recordings that still exist
+        private HashSet<string> seen;
+        private bool scan_failed;
+        private int pending_jobs;
+        private int64 scan_start_time;
+        private bool restored;
+        private bool scanning;
+
+        construct {
+            this.indexed_mtimes = new HashMap<string, int64?> ();
+            this.changed = new HashMap<string, Recording?> ();
+            this.changed_mtimes = new HashMap<string, int64?> ();
+            this.seen = new HashSet<string> ();
+            this.scan_failed = false;
+            this.pending_jobs = 0;
+            this.restored = false;
+            this.scanning = false;
+        }
 
         /**
          * @recordingsbasedir: The directory to search
@@ -43,108 +102,299 @@ namespace DVB.io {
         }
 
         /**
-         * Searches recursively in the given directory
-         * for "info.rec" files, restores a new Recording
-         * from that file and adds it to itsself.
+         * Adds the recordings of the index to the store and searches
+         * recursively in the given directory for "info.rec" files
+         * that changed in the background.
          */
         public bool load_into () {
+            return this.check ();
+        }
+
+        /**
+         * Search the directory for new, changed and deleted
+         * recordings in the background and update the store
+         * and the index accordingly.
+         */
+        public bool check () {
+            if (this.scanning)
+                return false;
+
+            // Keep the recordings while a network share isn't mounted
             if (!this.directory.query_exists (null)) {
                 log.debug ("Directory %s does not exist", this.directory.get_path ());
                 return false;
             }
 
-            return this.restore_from_dir (this.directory);
+            if (!this.restored) {
+                this.restore_from_index ();
+                this.restored = true;
+            }
+
+            FileInfo info = get_readable_dir_info (this.directory);
+            if (info == null)
+                return false;
+
+            this.scanning = true;
+            this.scan_failed = false;
+            this.scan_start_time = get_monotonic_time ();
+            this.add_job (this.directory, get_mtime (info), 0);
+            return true;
+        }
+
+        private void restore_from_index () {
+            RecordingsIndex? index = new Factory().get_recordings_index ();
+            if (index == null)
+                return;
+
+            Gee.Map<string, Recording> recordings;
+            try {
+                recordings = index.get_recordings (this.directory,
+                    out this.indexed_mtimes);
+            } catch (SqlError e) {
+                log.error ("Could not read recordings index: %s", e.message);
+                return;
+            }
+
+            foreach (Recording rec in recordings.values) {
+                this.store.add_and_monitor (rec);
+            }
+            log.debug ("Restored %d recordings of %s from index",
+                recordings.size, this.directory.get_path ());
         }
 
-        private static bool is_readable_dir (File directory) {
+        private static FileInfo? get_readable_dir_info (File directory) {
             FileInfo info;
             try {
                 info = directory.query_info (ATTRS, 0, null);
             } catch (Error e) {
                 log.error ("Could not retrieve attributes: %s", e.message);
-                return false;
+                return null;
             }
 
             if (info.get_file_type () != FileType.DIRECTORY) {
                 log.error ("%s is not a directory", directory.get_path ());
-                return false;
+                return null;
             }
 
             if (!info.get_attribute_boolean (FileAttribute.ACCESS_CAN_READ)) {
                 log.error ("Cannot read %s", directory.get_path ());
-                return false;
+                return null;
             }
 
-            return true;
+            return info;
         }
 
-        private bool restore_from_dir (File recordingsbasedir, int depth = 0) {
-            if (depth >= max_recursion)
-                return true;
-            if (!is_readable_dir (recordingsbasedir))
-                return false;
+        /**
+         * @returns: Modification time in microseconds
+         */
+        private static int64 get_mtime (FileInfo info) {
+            return (int64)info.get_attribute_uint64 (FileAttribute.TIME_MODIFIED)
+                * 1000000
+                + info.get_attribute_uint32 (FileAttribute.TIME_MODIFIED_USEC);
+        }
+
+        private void add_job (File directory, int64 mtime, int depth) {
+            ScanJob job = new ScanJob ();
+            job.reader = this;
+            job.directory = directory;
+            job.mtime = mtime;
+            job.depth = depth;
+
+            AtomicInt.inc (ref this.pending_jobs);
+
+            scan_pool_mutex.lock ();
+            if (scan_pool == null) {
+                try {
+                    scan_pool = new ThreadPool<ScanJob>.with_owned_data (
+                        run_job, (int)get_num_processors (), false);
+                } catch (ThreadError e) {
+                    log.error ("Could not create thread pool: %s", e.message);
+                }
+            }
+            bool added = false;
+            if (scan_pool != null) {
+                try {
+                    scan_pool.add (job);
+                    added = true;
+                } catch (ThreadError e) {
+                    log.error ("%s", e.message);
+                }
+            }
+            scan_pool_mutex.unlock ();
 
+            if (!added) {
+                // Read the directory in this thread instead
+                run_job ((owned)job);
+            }
+        }
+
+        private static void run_job (owned ScanJob job) {
+            RecordingReader reader = job.reader;
+            reader.scan_dir (job.directory, job.mtime, job.depth);
+            if (AtomicInt.dec_and_test (ref reader.pending_jobs))
+                Idle.add (reader.apply_changes);
+        }
+
+        /**
+         * Read info.rec in @directory and search its subdirectories.
+         * Subdirectories of the recordings directory are searched by
+         * separate jobs. Directories of recordings that haven't been
+         * modified since they were indexed are skipped.
+         */
+        private void scan_dir (File directory, int64 mtime, int depth) {
             FileEnumerator files;
             try {
-                files = recordingsbasedir.enumerate_children (
-                    ATTRS, 0, null);
+                files = directory.enumerate_children (ATTRS, 0, null);
             } catch (Error e) {
                 log.error ("Could not read directory: %s", e.message);
-                return false;
+                lock (this.seen) {
+                    this.scan_failed = true;
+                }
+                return;
             }
 
-            bool success = true;
+            bool has_info_file = false;
             try {
                 FileInfo childinfo;
                 while ((childinfo = files.next_file (null)) != null) {
                     if (childinfo.get_is_hidden ())
                         continue;
 
-                    uint32 type = childinfo.get_attribute_uint32 (
-                        FileAttribute.STANDARD_TYPE);
+                    File child = directory.get_child (childinfo.get_name ());
 
-                    File child = recordingsbasedir.get_child (
-                        childinfo.get_name ());
-
-                    switch (type) {
+                    switch (childinfo.get_file_type ()) {
                         case FileType.DIRECTORY:
-                            this.restore_from_dir (child, depth + 1);
+                            if (depth + 1 >= this.max_recursion)
+                                break;
+
+                            int64 child_mtime = get_mtime (childinfo);
+                            string path = child.get_path ();
+                            int64? indexed_mtime = this.indexed_mtimes.get (path);
+                            if (indexed_mtime != null && (int64)indexed_mtime == child_mtime) {
+                                lock (this.seen) {
+                                    this.seen.add (path);
+                                }
+                            } else if (depth == 0) {
+                                this.add_job (child, child_mtime, depth + 1);
+                            } else {
+                                this.scan_dir (child, child_mtime, depth + 1);
+                            }
                         break;
 
                         case FileType.REGULAR:
-                            if (childinfo.get_name () == "info.rec") {
-                                Recording rec = null;
-                                try {
-                                    rec = this.deserialize (child);
-                                } catch (Error e) {
-                                    log.error (
-                                        "Could not deserialize recording: %s",
-                                        e.message);
-                                }
-                                if (rec != null) {
-                                    log.debug ("Restored recording from %s",
-                                        child.get_path ());
-                                    this.store.add_and_monitor (rec);
-
-
-                                }
-                            }
+                            if (childinfo.get_name () == "info.rec")
+                                has_info_file = true;
                         break;
                     }
                 }
             } catch (Error e) {
                 log.error ("%s", e.message);
-                success = false;
+                lock (this.seen) {
+                    this.scan_failed = true;
+                }
             } finally {
                 try {
                     files.close (null);
                 } catch (Error e) {
                     log.error ("Could not close file: %s", e.message);
-                    success = false;
                 }
             }
 
-            return success;
+            string path = directory.get_path ();
+            Recording? rec = null;
+            if (has_info_file) {
+                File info_file = directory.get_child ("info.rec");
+                try {
+                    rec = this.deserialize (info_file);
+                } catch (Error e) {
+                    log.error ("Could not deserialize recording: %s",
+                        e.message);
+                }
+                if (rec != null && rec.Location != null
+                        && !rec.Location.query_exists (null)) {
+                    log.debug ("%s has been deleted",
+                        rec.Location.get_path ());
+                    rec = null;
+                }
+                if (rec != null) {
+                    log.debug ("Restored recording from %s",
+                        info_file.get_path ());
+                }
+            }
+
+            lock (this.seen) {
+                if (rec != null) {
+                    this.seen.add (path);
+                    this.changed.set (path, rec);
+                    this.changed_mtimes.set (path, mtime);
+                } else if (this.indexed_mtimes.has_key (path)) {
+                    this.changed.set (path, null);
+                }
+            }
+        }
+
+        /**
+         * Update the store and the index after all
+         * directories have been searched
+         */
+        private bool apply_changes () {
+            if (this.scan_failed) {
+                log.warning ("Could not read all recordings of %s, keeping recordings of unread directories",
+                    this.directory.get_path ());
+            } else {
+                foreach (string path in this.indexed_mtimes.keys) {
+                    if (!this.seen.contains (path))
+                        this.changed.set (path, null);
+                }
+            }
+
+            foreach (Map.Entry<string, Recording?> entry in this.changed.entries) {
+                Recording? old_rec = this.store.get_recording_in_directory (
+                    entry.key);
+                if (entry.value == null) {
+                    this.indexed_mtimes.unset (entry.key);
+                } else {
+                    this.indexed_mtimes.set (entry.key,
+                        this.changed_mtimes.get (entry.key));
+                }
+
+                if (old_rec != null && entry.value != null
+                        && old_rec.Id == entry.value.Id) {
+                    // Already known, e.g. a recording of the Recorder
+                    // that finished since the last check
+                    this.store.monitor_recording (old_rec);
+                    continue;
+                }
+                if (old_rec != null)
+                    this.store.remove (old_rec);
+                if (entry.value != null)
+                    this.store.add_and_monitor (entry.value);
+            }
+
+            if (this.changed.size > 0) {
+                RecordingsIndex? index = new Factory().get_recordings_index ();
+                if (index != null) {
+                    try {
+                        index.update_directories (this.directory,
+                            this.changed, this.changed_mtimes);
+                    } catch (SqlError e) {
+                        log.error ("Could not update recordings index: %s",
+                            e.message);
+                    }
+                }
+            }
+
+            log.info ("Checked recordings of %s in %.3f seconds, %d directories changed",
+                this.directory.get_path (),
+                (get_monotonic_time () - this.scan_start_time) / 1000000.0,
+                this.changed.size);
+
+            this.changed.clear ();
+            this.changed_mtimes.clear ();
+            this.seen.clear ();
+            this.scanning = false;
+            this.checked ();
+            return false;
         }
 
         protected Recording? deserialize (File file) throws Error {
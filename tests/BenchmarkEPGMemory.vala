@@ -0,0 +1,170 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+
+namespace DVB.Tests {
+
+    /**
+     * Compare the memory needed to hold the events collected during an EPG
+     * pass as one Event per event with the EventRecordList of each channel.
+     *
+     * A synthetic schedule of repeating shows is decoded as the EPG scanner
+     * would decode it, with a new copy of every string. Each layout has to
+     * be measured in a process of its own, because freed memory is reused:
+     *     make tests/benchmark-epg-memory
+     *     tests/benchmark-epg-memory objects
+     *     tests/benchmark-epg-memory records
+     */
+    public class EPGMemoryBenchmark {
+
+        private const int CHANNELS = 100;
+        private const int DAYS = 7;
+        private const int SHOWS = 40;
+        private const uint[] DURATIONS = {1800, 2700, 3600, 5400};
+
+        private delegate void DecodeFunc (uint sid, uint event_id,
+            int64 start, uint duration, string name, string description,
+            string extended_description);
+
+        public static int main (string[] args) {
+            string mode = (args.length > 1) ? args[1] : "";
+            if (mode != "objects" && mode != "records") {
+                stderr.printf ("Usage: %s objects|records\n", args[0]);
+                return 1;
+            }
+
+            long before = get_rss ();
+            int n_events;
+            // Keep the events alive until the memory has been measured
+            Object? events;
+            if (mode == "objects")
+                events = collect_objects (out n_events);
+            else
+                events = collect_records (out n_events);
+            long after = get_rss ();
+
+            stdout.printf ("%s: %d events, %ld KiB\n", mode, n_events,
+                after - before);
+            return 0;
+        }
+
+        /**
+         * Call @func for every event of the synthetic schedule
+         */
+        private static void decode_schedule (DecodeFunc func) {
+            var rand = new Rand.with_seed (0);
+            int64 first_start = (int64)time_t ();
+            for (uint sid = 1; sid <= CHANNELS; sid++) {
+                int64 offset = 0;
+                uint event_id = 0;
+                while (offset < DAYS * 86400) {
+                    int show = rand.int_range (0, SHOWS);
+                    uint duration = DURATIONS[rand.int_range (0,
+                        DURATIONS.length)];
+                    // Sections are decoded twice, as present/following
+                    // and schedule
+                    for (int i = 0; i < 2; i++) {
+                        func (sid, event_id, first_start + offset, duration,
+                            "Show %d".printf (show),
+                            repeat ("Episode description %d ".printf (show), 3),
+                            repeat ("Extended description of show %d ".printf (
+                                show), 20));
+                    }
+                    offset += duration;
+                    event_id++;
+                }
+            }
+        }
+
+        private static Object collect_objects (out int n_events) {
+            var channel_events = new HashMap<uint, HashMap<uint, Event>> ();
+            int n = 0;
+            decode_schedule ((sid, event_id, start, duration, name,
+                    description, extended_description) => {
+                HashMap<uint, Event>? events = channel_events.get (sid);
+                if (events == null) {
+                    events = new HashMap<uint, Event> ();
+                    channel_events.set (sid, events);
+                }
+                if (events.has_key (event_id))
+                    return;
+
+                Event event = new Event ();
+                event.id = event_id;
+                event.set_start_time (start);
+                event.duration = duration;
+                event.running_status = Event.RUNNING_STATUS_RUNNING;
+                event.name = name;
+                event.description = description;
+                event.extended_description = extended_description;
+                events.set (event_id, event);
+                n++;
+            });
+            n_events = n;
+            return channel_events;
+        }
+
+        private static Object collect_records (out int n_events) {
+            var channel_events = new HashMap<uint, EventRecordList> ();
+            int n = 0;
+            decode_schedule ((sid, event_id, start, duration, name,
+                    description, extended_description) => {
+                EventRecordList? events = channel_events.get (sid);
+                if (events == null) {
+                    events = new EventRecordList ();
+                    channel_events.set (sid, events);
+                }
+                if (events.add (event_id, start, duration,
+                        Event.RUNNING_STATUS_RUNNING, false, name,
+                        description, extended_description))
+                    n++;
+            });
+            n_events = n;
+            return channel_events;
+        }
+
+        private static string repeat (string text, int n) {
+            var builder = new StringBuilder ();
+            for (int i = 0; i < n; i++)
+                builder.append (text);
+            return builder.str;
+        }
+
+        /**
+         * @returns: The resident set size of the process in KiB
+         */
+        private static long get_rss () {
+            string contents;
+            try {
+                FileUtils.get_contents ("/proc/self/status", out contents);
+            } catch (FileError e) {
+                stderr.printf ("%s\n", e.message);
+                return 0;
+            }
+            foreach (string line in contents.split ("\n")) {
+                if (line.has_prefix ("VmRSS:"))
+                    return long.parse (line.substring (6).strip ());
+            }
+            return 0;
+        }
+    }
+
+}
@@ -0,0 +1,147 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+
+namespace DVB.Tests {
+
+    /**
+     * Plan a synthetic set of timers with TimerPlanner and compare the
+     * number of timers that can't be recorded with the number when
+     * devices are assigned as each recording starts, like
+     * ChannelFactory.watch_channel does without a plan:
+     *     make tests/benchmark-timer-planner
+     *     tests/benchmark-timer-planner [timers] [devices] [transports]
+     */
+    public class TimerPlannerBenchmark {
+
+        private const int DAYS = 14;
+        private const int[] DURATIONS = {30, 45, 60, 90, 120};
+
+        private class SyntheticTimer {
+            public uint32 id;
+            public uint transport;
+            public int64 start;
+            public int64 end;
+        }
+
+        public static int main (string[] args) {
+            int n_timers = (args.length > 1) ? int.parse (args[1]) : 10000;
+            int n_devices = (args.length > 2) ? int.parse (args[2]) : 4;
+            int n_transports = (args.length > 3) ? int.parse (args[3]) : 8;
+            if (n_timers <= 0 || n_devices <= 0 || n_transports <= 0) {
+                stderr.printf ("Usage: %s [timers] [devices] [transports]\n",
+                    args[0]);
+                return 1;
+            }
+
+            Gee.List<SyntheticTimer> timers = create_timers (n_timers,
+                n_transports);
+            stdout.printf ("%d timers of %d transport streams, %d devices\n",
+                n_timers, n_transports, n_devices);
+
+            int64 start = get_monotonic_time ();
+            var planner = new TimerPlanner (n_devices);
+            foreach (SyntheticTimer timer in timers) {
+                planner.add (timer.id, timer.transport, timer.start,
+                    timer.end, false);
+            }
+            Gee.List<uint32> conflicts;
+            planner.plan (out conflicts);
+            int64 duration = get_monotonic_time () - start;
+            stdout.printf ("planned:            %6d conflicts (%.1f ms)\n",
+                conflicts.size, duration / 1000.0);
+
+            start = get_monotonic_time ();
+            int n_conflicts = allocate_at_start (timers, n_devices);
+            duration = get_monotonic_time () - start;
+            stdout.printf ("at recording start: %6d conflicts (%.1f ms)\n",
+                n_conflicts, duration / 1000.0);
+
+            return 0;
+        }
+
+        /**
+         * @returns: Timers with random transports, start times and
+         * durations ordered by id
+         */
+        private static Gee.List<SyntheticTimer> create_timers (int n_timers,
+                int n_transports) {
+            var rand = new Rand.with_seed (0);
+            var timers = new ArrayList<SyntheticTimer> ();
+            for (uint32 id = 1; id <= n_timers; id++) {
+                var timer = new SyntheticTimer ();
+                timer.id = id;
+                timer.transport = (uint)rand.int_range (0, n_transports);
+                timer.start = rand.int_range (0, DAYS * 24 * 60) * 60;
+                timer.end = timer.start + DURATIONS[rand.int_range (0,
+                    DURATIONS.length)] * 60;
+                timers.add (timer);
+            }
+            return timers;
+        }
+
+        /**
+         * Assign devices as each recording starts without taking
+         * devices away from other timers
+         *
+         * @returns: Number of timers that can't be recorded
+         */
+        private static int allocate_at_start (Gee.List<SyntheticTimer> timers,
+                int n_devices) {
+            var sorted = new ArrayList<SyntheticTimer> ();
+            sorted.add_all (timers);
+            sorted.sort ((a, b) => {
+                if (a.start < b.start) return -1;
+                else if (a.start > b.start) return +1;
+                else return 0;
+            });
+
+            // Transport and end of the last timer of each device
+            uint[] transports = new uint[n_devices];
+            int64[] ends = new int64[n_devices];
+            int n_conflicts = 0;
+            foreach (SyntheticTimer timer in sorted) {
+                int device = -1;
+                int free = -1;
+                for (int i = 0; i < n_devices; i++) {
+                    if (ends[i] <= timer.start) {
+                        if (free == -1)
+                            free = i;
+                    } else if (transports[i] == timer.transport) {
+                        device = i;
+                        break;
+                    }
+                }
+                if (device == -1)
+                    device = free;
+                if (device == -1) {
+                    n_conflicts++;
+                    continue;
+                }
+                if (ends[device] <= timer.start)
+                    transports[device] = timer.transport;
+                ends[device] = int64.max (ends[device], timer.end);
+            }
+            return n_conflicts;
+        }
+    }
+
+}
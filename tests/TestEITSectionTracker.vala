@@ -0,0 +1,148 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using GstMpegts;
+
+namespace DVB.Tests {
+
+    public class EITSectionTrackerTest {
+
+        private const uint8 TABLE_ID_SCHEDULE = 0x50;
+        private const uint16 EIT_PID = 0x12;
+        private const uint SID = 1;
+
+        public static void add_tests () {
+            Test.add_func ("/EITSectionTracker/complete",
+                test_complete);
+            Test.add_func ("/EITSectionTracker/skip_committed",
+                test_skip_committed);
+            Test.add_func ("/EITSectionTracker/keep_incomplete",
+                test_keep_incomplete);
+        }
+
+        /**
+         * @returns: EIT section without events
+         */
+        private static Section create_section (uint8 version,
+                uint8 section_number, uint8 last_section_number) {
+            uint8[] data = new uint8[18];
+            // Length of the section after the section_length field
+            uint section_length = data.length - 3;
+            data[0] = TABLE_ID_SCHEDULE;
+            data[1] = (uint8)(0xF0 | (section_length >> 8));
+            data[2] = (uint8)(section_length & 0xFF);
+            data[3] = (uint8)(SID >> 8);
+            data[4] = (uint8)(SID & 0xFF);
+            data[5] = (uint8)(0xC1 | (version << 1));
+            data[6] = section_number;
+            data[7] = last_section_number;
+            // transport_stream_id and original_network_id
+            data[8] = 0;
+            data[9] = 1;
+            data[10] = 0;
+            data[11] = 1;
+            // segment_last_section_number and last_table_id
+            data[12] = last_section_number;
+            data[13] = TABLE_ID_SCHEDULE;
+
+            uint32 crc = crc32 (data[0:data.length - 4]);
+            data[14] = (uint8)(crc >> 24);
+            data[15] = (uint8)(crc >> 16);
+            data[16] = (uint8)(crc >> 8);
+            data[17] = (uint8)crc;
+
+            return new Section (EIT_PID, (owned)data);
+        }
+
+        /**
+         * CRC-32 as used by MPEG-2 sections
+         */
+        private static uint32 crc32 (uint8[] data) {
+            uint32 crc = 0xFFFFFFFF;
+            foreach (uint8 b in data) {
+                crc ^= ((uint32)b) << 24;
+                for (int i = 0; i < 8; i++) {
+                    if ((crc & 0x80000000) != 0)
+                        crc = (crc << 1) ^ 0x04C11DB7;
+                    else
+                        crc <<= 1;
+                }
+            }
+            return crc;
+        }
+
+        private static bool add_section (EITSectionTracker tracker,
+                Section section) {
+            unowned EIT eit = section.get_eit ();
+            assert (eit != null);
+            return tracker.add_section (section, eit);
+        }
+
+        private static EITSectionTracker create_tracker () {
+            var tracker = new EITSectionTracker ();
+            var sids = new Gee.ArrayList<uint> ();
+            sids.add (SID);
+            tracker.begin (sids);
+            return tracker;
+        }
+
+        private static void test_complete () {
+            EITSectionTracker tracker = create_tracker ();
+
+            assert (!tracker.is_complete (true));
+            assert (add_section (tracker, create_section (1, 0, 1)));
+            assert (!tracker.is_complete (true));
+            assert (add_section (tracker, create_section (1, 1, 1)));
+            assert (tracker.is_complete (true));
+        }
+
+        private static void test_skip_committed () {
+            EITSectionTracker tracker = create_tracker ();
+            add_section (tracker, create_section (1, 0, 1));
+            add_section (tracker, create_section (1, 1, 1));
+
+            tracker.commit ();
+
+            // Unchanged subtables don't have to be decoded again
+            assert (!add_section (tracker, create_section (1, 0, 1)));
+            assert (tracker.is_complete (true));
+            // but new versions do
+            assert (add_section (tracker, create_section (2, 0, 1)));
+            assert (!tracker.is_complete (true));
+        }
+
+        private static void test_keep_incomplete () {
+            EITSectionTracker tracker = create_tracker ();
+            add_section (tracker, create_section (1, 0, 1));
+
+            // Events are stored while the subtable is incomplete
+            tracker.commit ();
+
+            assert (!tracker.is_complete (true));
+            assert (add_section (tracker, create_section (1, 1, 1)));
+            assert (tracker.is_complete (true));
+
+            tracker.commit ();
+            assert (!add_section (tracker, create_section (1, 1, 1)));
+        }
+
+    }
+
+}
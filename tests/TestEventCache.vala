@@ -0,0 +1,102 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+
+namespace DVB.Tests {
+
+    public class EventCacheTest {
+
+        private const uint GROUP_ID = 1;
+        private const uint SID = 1;
+        // Estimated size of the events created below
+        private const size_t EVENT_SIZE = 160 + 5 + 5;
+
+        public static void add_tests () {
+            Test.add_func ("/EventCache/lookup", test_lookup);
+            Test.add_func ("/EventCache/evict", test_evict);
+            Test.add_func ("/EventCache/remove", test_remove);
+        }
+
+        /**
+         * @id: Event id below 10
+         */
+        private static Event create_event (uint id) {
+            Event event = new Event ();
+            event.id = id;
+            event.name = "Event";
+            event.extended_description = "Extended description";
+            return event;
+        }
+
+        private static void test_lookup () {
+            var cache = new EventCache (10 * EVENT_SIZE);
+
+            assert (cache.lookup (GROUP_ID, SID, 1) == null);
+            cache.add (GROUP_ID, SID, create_event (1));
+
+            Event? event = cache.lookup (GROUP_ID, SID, 1);
+            assert (event != null);
+            assert (event.id == 1);
+            assert (event.name == "Event");
+            // Only compact copies are stored
+            assert (event.extended_description == null);
+
+            assert (cache.lookup (GROUP_ID, SID + 1, 1) == null);
+            assert (cache.lookup (GROUP_ID + 1, SID, 1) == null);
+        }
+
+        private static void test_evict () {
+            var cache = new EventCache (5 * EVENT_SIZE);
+            for (uint id = 1; id <= 5; id++)
+                cache.add (GROUP_ID, SID, create_event (id));
+            for (uint id = 1; id <= 5; id++)
+                assert (cache.lookup (GROUP_ID, SID, id) != null);
+
+            // Event 1 is used most recently, 2 least recently
+            assert (cache.lookup (GROUP_ID, SID, 1) != null);
+            cache.add (GROUP_ID, SID, create_event (6));
+
+            assert (cache.lookup (GROUP_ID, SID, 2) == null);
+            assert (cache.lookup (GROUP_ID, SID, 1) != null);
+            for (uint id = 3; id <= 6; id++)
+                assert (cache.lookup (GROUP_ID, SID, id) != null);
+
+            // Replacing an event doesn't evict others
+            cache.add (GROUP_ID, SID, create_event (6));
+            for (uint id = 3; id <= 6; id++)
+                assert (cache.lookup (GROUP_ID, SID, id) != null);
+        }
+
+        private static void test_remove () {
+            var cache = new EventCache (10 * EVENT_SIZE);
+            cache.add (GROUP_ID, SID, create_event (1));
+            cache.add (GROUP_ID, SID, create_event (2));
+
+            cache.remove (GROUP_ID, SID, 1);
+            assert (cache.lookup (GROUP_ID, SID, 1) == null);
+            assert (cache.lookup (GROUP_ID, SID, 2) != null);
+
+            cache.clear ();
+            assert (cache.lookup (GROUP_ID, SID, 2) == null);
+        }
+
+    }
+
+}
@@ -0,0 +1,115 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+
+namespace DVB.Tests {
+
+    public class EventIntervalTreeTest {
+
+        public static void add_tests () {
+            Test.add_func ("/EventIntervalTree/overlapping",
+                test_overlapping);
+            Test.add_func ("/EventIntervalTree/remove", test_remove);
+        }
+
+        private static EventElement create_element (uint id, time_t start,
+                uint duration) {
+            EventElement element = new EventElement ();
+            element.id = id;
+            element.starttime = start;
+            element.duration = duration;
+            return element;
+        }
+
+        /**
+         * @returns: Elements of @elements that overlap with
+         * @start and @end found by comparing with each of them
+         */
+        private static Gee.List<EventElement> find_overlapping (
+                Gee.List<EventElement> elements, int64 start, int64 end) {
+            var result = new ArrayList<EventElement> ();
+            foreach (EventElement element in elements) {
+                if (element.starttime < end
+                        && element.starttime + element.duration > start)
+                    result.add (element);
+            }
+            result.sort ((a, b) => {
+                if (a.starttime != b.starttime)
+                    return (a.starttime < b.starttime) ? -1 : +1;
+                if (a.id != b.id)
+                    return (a.id < b.id) ? -1 : +1;
+                return 0;
+            });
+            return result;
+        }
+
+        private static void assert_same (Gee.List<EventElement> a,
+                Gee.List<EventElement> b) {
+            assert (a.size == b.size);
+            for (int i = 0; i < a.size; i++)
+                assert (a.get (i) == b.get (i));
+        }
+
+        private static Gee.List<EventElement> create_elements (
+                EventIntervalTree tree) {
+            var rand = new Rand.with_seed (0);
+            var elements = new ArrayList<EventElement> ();
+            for (uint id = 1; id <= 200; id++) {
+                EventElement element = create_element (id,
+                    (time_t)rand.int_range (0, 10000),
+                    (uint)rand.int_range (0, 1000));
+                elements.add (element);
+                tree.insert (element);
+            }
+            return elements;
+        }
+
+        private static void test_overlapping () {
+            var tree = new EventIntervalTree ();
+            Gee.List<EventElement> elements = create_elements (tree);
+
+            for (int64 start = -500; start < 11000; start += 250) {
+                for (int64 length = 0; length <= 2000; length += 500) {
+                    assert_same (tree.get_overlapping (start, start + length),
+                        find_overlapping (elements, start, start + length));
+                }
+            }
+        }
+
+        private static void test_remove () {
+            var tree = new EventIntervalTree ();
+            Gee.List<EventElement> elements = create_elements (tree);
+
+            for (int i = elements.size - 1; i >= 0; i -= 2) {
+                tree.remove (elements.get (i));
+                elements.remove_at (i);
+            }
+
+            assert_same (tree.get_overlapping (int64.MIN, int64.MAX),
+                find_overlapping (elements, int64.MIN, int64.MAX));
+
+            tree.clear ();
+            assert (tree.get_overlapping (int64.MIN, int64.MAX).size == 0);
+        }
+
+    }
+
+}
@@ -0,0 +1,112 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+
+namespace DVB.Tests {
+
+    public class EventStorageTest {
+
+        public static void add_tests () {
+            Test.add_func ("/EventStorage/remove_range",
+                test_remove_range);
+            Test.add_func ("/EventStorage/remove_range_until_end",
+                test_remove_range_until_end);
+            Test.add_func ("/EventStorage/remove_expired",
+                test_remove_expired);
+        }
+
+        /**
+         * @start: UNIX timestamp the event starts at
+         * @returns: Event with the given id, start and duration
+         */
+        public static Event create_event (uint id, int64 start, uint duration) {
+            Time t = Time.gm ((time_t)start);
+
+            Event event = new Event ();
+            event.id = id;
+            event.year = t.year + 1900;
+            event.month = t.month + 1;
+            event.day = t.day;
+            event.hour = t.hour;
+            event.minute = t.minute;
+            event.second = t.second;
+            event.duration = duration;
+            return event;
+        }
+
+        /**
+         * @returns: Storage with @n consecutive events of 30 minutes,
+         * the first one started @offset seconds from now
+         */
+        private static EventStorage create_storage (int n, int64 offset) {
+            EventStorage storage = new EventStorage ();
+            int64 start = (int64)time_t () + offset;
+            for (int i=0; i<n; i++) {
+                storage.insert (create_event (i + 1, start + i * 1800, 1800));
+            }
+            return storage;
+        }
+
+        private static void test_remove_range () {
+            EventStorage storage = create_storage (5, 0);
+
+            storage.remove_range (0, 3);
+
+            assert (storage.size == 2);
+            assert (!storage.contains_event_with_id (3));
+            assert (storage.get (0).id == 4);
+            assert (storage.get (1).id == 5);
+        }
+
+        private static void test_remove_range_until_end () {
+            EventStorage storage = create_storage (5, 0);
+            EventElement first = storage.get (0);
+
+            storage.remove_range (0, storage.size);
+
+            assert (storage.size == 0);
+            for (uint id=1; id<=5; id++)
+                assert (!storage.contains_event_with_id (id));
+            assert (storage.get_events_in_range (first.starttime,
+                first.starttime + 5 * 1800).size == 0);
+        }
+
+        private static void test_remove_expired () {
+            // Events 1 to 4 ended in the past, 5 is running
+            EventStorage storage = create_storage (5, -4 * 1800 - 60);
+
+            int last_expired = -1;
+            for (int i=0; i<storage.size; i++) {
+                if (!storage.get (i).has_expired ())
+                    break;
+                last_expired = i;
+            }
+            assert (last_expired == 3);
+
+            storage.remove_range (0, last_expired + 1);
+
+            assert (storage.size == 1);
+            assert (storage.get (0).id == 5);
+            assert (!storage.get (0).has_expired ());
+        }
+
+    }
+
+}
@@ -0,0 +1,70 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+
+namespace DVB.Tests {
+
+    private static string tmp_dir;
+
+    /**
+     * @returns: Temporary directory that is used as cache and config
+     * directory while the tests are running
+     */
+    public static unowned string get_tmp_dir () {
+        return tmp_dir;
+    }
+
+    public static int main (string[] args) {
+        try {
+            tmp_dir = DirUtils.make_tmp ("gnome-dvb-daemon-test-XXXXXX");
+        } catch (FileError e) {
+            critical ("%s", e.message);
+            return 1;
+        }
+        // Keep the databases of the tests away from the user's
+        Environment.set_variable ("XDG_CACHE_HOME", tmp_dir, true);
+        Environment.set_variable ("XDG_CONFIG_HOME", tmp_dir, true);
+
+        Test.init (ref args);
+        Gst.init (ref args);
+        GstMpegts.initialize ();
+
+        EITSectionTrackerTest.add_tests ();
+        EventCacheTest.add_tests ();
+        EventIntervalTreeTest.add_tests ();
+        EventStorageTest.add_tests ();
+        RecordingReaderTest.add_tests ();
+        RecordingsIndexTest.add_tests ();
+        TimerIndexTest.add_tests ();
+        TimerPlannerTest.add_tests ();
+        TimerQueueTest.add_tests ();
+
+        int result = Test.run ();
+
+        try {
+            Utils.delete_dir_recursively (File.new_for_path (tmp_dir));
+        } catch (Error e) {
+            warning ("%s", e.message);
+        }
+
+        return result;
+    }
+
+}
@@ -0,0 +1,132 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+using DVB.database;
+using DVB.io;
+
+namespace DVB.Tests {
+
+    public class RecordingReaderTest {
+
+        // Seconds to wait for a check to finish
+        private const uint CHECK_TIMEOUT = 10;
+
+        public static void add_tests () {
+            Test.add_func ("/RecordingReader/check", test_check);
+        }
+
+        /**
+         * Write a recording to @basedir/channel/@name
+         */
+        private static Recording write_recording (File basedir, uint32 id,
+                string name) throws Error {
+            File directory = basedir.get_child ("channel").get_child (name);
+            Utils.mkdirs (directory);
+            Recording rec = RecordingsIndexTest.create_recording (id,
+                directory);
+            FileUtils.set_contents (rec.Location.get_path (), "");
+            new RecordingWriter (rec).write ();
+            return rec;
+        }
+
+        /**
+         * Check @reader and wait until the changes have been applied
+         */
+        private static void run_check (RecordingReader reader) {
+            var loop = new MainLoop ();
+            ulong handler = reader.checked.connect (() => loop.quit ());
+            uint timeout = Timeout.add_seconds (CHECK_TIMEOUT, () => {
+                Test.fail ();
+                loop.quit ();
+                return false;
+            });
+            assert (reader.check ());
+            loop.run ();
+            Source.remove (timeout);
+            reader.disconnect (handler);
+        }
+
+        private static Gee.Map<string, Recording> get_indexed (File basedir,
+                out Gee.Map<string, int64?> mtimes) {
+            try {
+                return new Factory().get_recordings_index ().get_recordings (
+                    basedir, out mtimes);
+            } catch (SqlError e) {
+                error ("%s", e.message);
+            }
+        }
+
+        private static void test_check () {
+            File basedir = File.new_for_path (get_tmp_dir ())
+                .get_child ("recordings");
+            RecordingsStore store = RecordingsStore.get_instance ();
+            Recording rec1;
+            Recording rec2;
+            try {
+                rec1 = write_recording (basedir, 101, "1");
+                rec2 = write_recording (basedir, 102, "2");
+            } catch (Error e) {
+                error ("%s", e.message);
+            }
+            string dir1 = rec1.Location.get_parent ().get_path ();
+            string dir2 = rec2.Location.get_parent ().get_path ();
+
+            var reader = new RecordingReader (basedir, store);
+            run_check (reader);
+
+            Recording? restored1 = store.get_recording_in_directory (dir1);
+            assert (restored1 != null);
+            assert (restored1.Id == 101);
+            assert (store.get_recording_in_directory (dir2) != null);
+
+            Gee.Map<string, int64?> mtimes;
+            Gee.Map<string, Recording> indexed = get_indexed (basedir,
+                out mtimes);
+            assert (indexed.size == 2);
+            assert (indexed.has_key (dir1) && indexed.has_key (dir2));
+
+            // Delete the second recording and add a third one
+            Recording rec3;
+            try {
+                Utils.delete_dir_recursively (File.new_for_path (dir2));
+                rec3 = write_recording (basedir, 103, "3");
+            } catch (Error e) {
+                error ("%s", e.message);
+            }
+            string dir3 = rec3.Location.get_parent ().get_path ();
+            run_check (reader);
+
+            // The first recording didn't change and isn't read again
+            assert (store.get_recording_in_directory (dir1) == restored1);
+            assert (store.get_recording_in_directory (dir2) == null);
+            Recording? restored3 = store.get_recording_in_directory (dir3);
+            assert (restored3 != null);
+            assert (restored3.Id == 103);
+
+            indexed = get_indexed (basedir, out mtimes);
+            assert (indexed.size == 2);
+            assert (indexed.has_key (dir1) && indexed.has_key (dir3));
+            assert (!indexed.has_key (dir2));
+        }
+
+    }
+
+}
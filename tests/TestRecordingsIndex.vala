@@ -0,0 +1,116 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+using DVB.database;
+
+namespace DVB.Tests {
+
+    public class RecordingsIndexTest {
+
+        public static void add_tests () {
+            Test.add_func ("/RecordingsIndex/update_directories",
+                test_update_directories);
+        }
+
+        /**
+         * @returns: Recording in @directory, no files are created
+         */
+        public static Recording create_recording (uint32 id, File directory) {
+            var rec = new Recording ();
+            rec.Id = id;
+            rec.ChannelSid = 1;
+            rec.ChannelName = "Channel";
+            rec.Location = directory.get_child ("001.ts");
+            rec.Name = "Recording %u".printf (id);
+            rec.Description = "Description";
+            rec.StartTime = Time.local (time_t ());
+            rec.Length = 1800;
+            return rec;
+        }
+
+        private static void assert_same_recording (Recording a, Recording b) {
+            assert (a.Id == b.Id);
+            assert (a.ChannelName == b.ChannelName);
+            assert (a.Location.equal (b.Location));
+            assert (a.Name == b.Name);
+            assert (a.Description == b.Description);
+            assert (a.StartTime.mktime () == b.StartTime.mktime ());
+            assert (a.Length == b.Length);
+        }
+
+        private static void test_update_directories () {
+            RecordingsIndex? index = new Factory().get_recordings_index ();
+            assert (index != null);
+
+            File basedir = File.new_for_path (get_tmp_dir ())
+                .get_child ("index");
+            File other_basedir = File.new_for_path (get_tmp_dir ())
+                .get_child ("other-index");
+            string dir1 = basedir.get_child ("1").get_path ();
+            string dir2 = basedir.get_child ("2").get_path ();
+            Recording rec1 = create_recording (1, File.new_for_path (dir1));
+            Recording rec2 = create_recording (2, File.new_for_path (dir2));
+
+            var recordings = new HashMap<string, Recording?> ();
+            var mtimes = new HashMap<string, int64?> ();
+            recordings.set (dir1, rec1);
+            recordings.set (dir2, rec2);
+            mtimes.set (dir1, (int64)1000001);
+            mtimes.set (dir2, (int64)2000002);
+            try {
+                assert (index.update_directories (basedir, recordings, mtimes));
+
+                Gee.Map<string, int64?> indexed_mtimes;
+                Gee.Map<string, Recording> indexed = index.get_recordings (
+                    basedir, out indexed_mtimes);
+                assert (indexed.size == 2);
+                assert_same_recording (indexed.get (dir1), rec1);
+                assert_same_recording (indexed.get (dir2), rec2);
+                assert ((int64)indexed_mtimes.get (dir1) == 1000001);
+                assert ((int64)indexed_mtimes.get (dir2) == 2000002);
+
+                // Recordings of other directories are separate
+                indexed = index.get_recordings (other_basedir,
+                    out indexed_mtimes);
+                assert (indexed.size == 0);
+
+                // Remove the first recording and update the second one
+                recordings.clear ();
+                mtimes.clear ();
+                rec2.Name = "New name";
+                recordings.set (dir1, null);
+                recordings.set (dir2, rec2);
+                mtimes.set (dir2, (int64)3000003);
+                assert (index.update_directories (basedir, recordings, mtimes));
+
+                indexed = index.get_recordings (basedir, out indexed_mtimes);
+                assert (indexed.size == 1);
+                assert (!indexed.has_key (dir1));
+                assert_same_recording (indexed.get (dir2), rec2);
+                assert ((int64)indexed_mtimes.get (dir2) == 3000003);
+            } catch (SqlError e) {
+                error ("%s", e.message);
+            }
+        }
+
+    }
+
+}
@@ -0,0 +1,91 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+
+namespace DVB.Tests {
+
+    public class TimerIndexTest {
+
+        public static void add_tests () {
+            Test.add_func ("/TimerIndex/overlap", test_overlap);
+            Test.add_func ("/TimerIndex/update", test_update);
+        }
+
+        /**
+         * @duration: Duration in minutes
+         * @returns: Timer starting on 2030-01-01 at @hour:@minute local time
+         */
+        private static Timer create_timer (uint32 id, int hour, int minute,
+                uint duration) {
+            return new Timer (id, new Channel.without_schedule (),
+                2030, 1, 1, hour, minute, duration);
+        }
+
+        private static void test_overlap () {
+            var index = new TimerIndex ();
+            assert (index.is_empty);
+
+            Timer t1 = create_timer (1, 10, 0, 60);
+            Timer t2 = create_timer (2, 10, 30, 60);
+            index.add (t1);
+            index.add (t2);
+            assert (!index.is_empty);
+
+            int64 start = t1.get_start_time_timestamp ();
+            int64 minute = 60;
+            // Covered by timer 1
+            assert (index.get_overlap (start, start + 30 * minute)
+                == OverlapType.COMPLETE);
+            // Covered by timer 2 that started later, but ends later
+            assert (index.get_overlap (start + 45 * minute,
+                start + 90 * minute) == OverlapType.COMPLETE);
+            // Timer 2 ends before
+            assert (index.get_overlap (start + 60 * minute,
+                start + 120 * minute) == OverlapType.PARTIAL);
+            // Before and after all timers
+            assert (index.get_overlap (start - 60 * minute, start)
+                == OverlapType.NONE);
+            assert (index.get_overlap (start + 90 * minute,
+                start + 120 * minute) == OverlapType.NONE);
+        }
+
+        private static void test_update () {
+            var index = new TimerIndex ();
+            Timer timer = create_timer (1, 10, 0, 60);
+            index.add (timer);
+
+            int64 start = timer.get_start_time_timestamp ();
+            assert (index.get_overlap (start, start + 3600)
+                == OverlapType.COMPLETE);
+
+            timer.Duration = 30;
+            index.add (timer);
+            assert (index.get_overlap (start, start + 3600)
+                == OverlapType.PARTIAL);
+
+            index.remove (1);
+            assert (index.is_empty);
+            assert (index.get_overlap (start, start + 3600)
+                == OverlapType.NONE);
+        }
+
+    }
+
+}
@@ -0,0 +1,120 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+using Gee;
+
+namespace DVB.Tests {
+
+    public class TimerPlannerTest {
+
+        public static void add_tests () {
+            Test.add_func ("/TimerPlanner/share_transport",
+                test_share_transport);
+            Test.add_func ("/TimerPlanner/conflict",
+                test_conflict);
+            Test.add_func ("/TimerPlanner/evict",
+                test_evict);
+            Test.add_func ("/TimerPlanner/keep_active",
+                test_keep_active);
+            Test.add_func ("/TimerPlanner/free_device",
+                test_free_device);
+        }
+
+        private static void test_share_transport () {
+            var planner = new TimerPlanner (1);
+            planner.add (1, 100, 0, 100, false);
+            planner.add (2, 100, 50, 150, false);
+            planner.add (3, 100, 120, 200, false);
+
+            Gee.List<uint32> conflicts;
+            HashMap<uint32, int> plan = planner.plan (out conflicts);
+
+            assert (conflicts.size == 0);
+            assert (plan.get (1) == 0);
+            assert (plan.get (2) == 0);
+            assert (plan.get (3) == 0);
+        }
+
+        private static void test_conflict () {
+            var planner = new TimerPlanner (1);
+            planner.add (1, 100, 0, 100, false);
+            planner.add (2, 200, 50, 150, false);
+
+            Gee.List<uint32> conflicts;
+            HashMap<uint32, int> plan = planner.plan (out conflicts);
+
+            // Both timers have no sharers, the one ending first is kept
+            assert (conflicts.size == 1);
+            assert (conflicts.get (0) == 2);
+            assert (plan.get (1) == 0);
+            assert (plan.get (2) == -1);
+        }
+
+        private static void test_evict () {
+            var planner = new TimerPlanner (1);
+            planner.add (1, 100, 0, 300, false);
+            planner.add (2, 200, 100, 200, false);
+            planner.add (3, 200, 150, 250, false);
+
+            Gee.List<uint32> conflicts;
+            HashMap<uint32, int> plan = planner.plan (out conflicts);
+
+            // Timers 2 and 3 can share the device
+            assert (conflicts.size == 1);
+            assert (conflicts.get (0) == 1);
+            assert (plan.get (1) == -1);
+            assert (plan.get (2) == 0);
+            assert (plan.get (3) == 0);
+        }
+
+        private static void test_keep_active () {
+            var planner = new TimerPlanner (1);
+            planner.add (1, 100, 0, 300, true);
+            planner.add (2, 200, 100, 200, false);
+            planner.add (3, 200, 150, 250, false);
+
+            Gee.List<uint32> conflicts;
+            HashMap<uint32, int> plan = planner.plan (out conflicts);
+
+            assert (conflicts.size == 2);
+            assert (plan.get (1) == 0);
+            assert (plan.get (2) == -1);
+            assert (plan.get (3) == -1);
+        }
+
+        private static void test_free_device () {
+            var planner = new TimerPlanner (2);
+            planner.add (1, 100, 0, 100, false);
+            planner.add (2, 200, 50, 150, false);
+            // Starts when timer 1 ended
+            planner.add (3, 300, 100, 200, false);
+
+            Gee.List<uint32> conflicts;
+            HashMap<uint32, int> plan = planner.plan (out conflicts);
+
+            assert (conflicts.size == 0);
+            assert (plan.get (1) == 0);
+            assert (plan.get (2) == 1);
+            assert (plan.get (3) == 0);
+        }
+
+    }
+
+}
@@ -0,0 +1,102 @@
+/*
+ * Copyright (C) 2008,2009 Sebastian Pölsterl
+ *
+ * This file is part of GNOME DVB Daemon.
+ *
+ * GNOME DVB Daemon is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * GNOME DVB Daemon is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with GNOME DVB Daemon.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+using GLib;
+
+namespace DVB.Tests {
+
+    public class TimerQueueTest {
+
+        public static void add_tests () {
+            Test.add_func ("/TimerQueue/order", test_order);
+            Test.add_func ("/TimerQueue/reschedule", test_reschedule);
+            Test.add_func ("/TimerQueue/unschedule", test_unschedule);
+        }
+
+        /**
+         * @returns: Ids of all timers in the order they are due
+         */
+        private static uint32[] drain (TimerQueue queue) {
+            uint32[] ids = {};
+            uint32 timer_id;
+            int64 deadline;
+            int64 last_deadline = int64.MIN;
+            while (queue.peek (out timer_id, out deadline)) {
+                assert (deadline >= last_deadline);
+                last_deadline = deadline;
+                ids += timer_id;
+                assert (queue.unschedule (timer_id));
+            }
+            assert (queue.size == 0);
+            return ids;
+        }
+
+        private static void test_order () {
+            var queue = new TimerQueue ();
+            int64[] deadlines = {50, 10, 40, 20, 30, 60, 0};
+            for (int i = 0; i < deadlines.length; i++)
+                queue.schedule (i + 1, deadlines[i]);
+
+            assert (queue.size == deadlines.length);
+            uint32[] ids = drain (queue);
+            uint32[] expected = {7, 2, 4, 5, 3, 1, 6};
+            assert (ids.length == expected.length);
+            for (int i = 0; i < ids.length; i++)
+                assert (ids[i] == expected[i]);
+        }
+
+        private static void test_reschedule () {
+            var queue = new TimerQueue ();
+            queue.schedule (1, 10);
+            queue.schedule (2, 20);
+            queue.schedule (3, 30);
+
+            queue.schedule (1, 40);
+            queue.schedule (3, 5);
+
+            assert (queue.size == 3);
+            uint32[] ids = drain (queue);
+            assert (ids[0] == 3 && ids[1] == 2 && ids[2] == 1);
+        }
+
+        private static void test_unschedule () {
+            var queue = new TimerQueue ();
+            for (uint32 i = 1; i <= 5; i++)
+                queue.schedule (i, i * 10);
+
+            assert (queue.unschedule (3));
+            assert (!queue.unschedule (3));
+            assert (!queue.contains (3));
+            assert (queue.unschedule (1));
+
+            uint32[] ids = drain (queue);
+            assert (ids.length == 3);
+            assert (ids[0] == 2 && ids[1] == 4 && ids[2] == 5);
+
+            queue.schedule (1, 10);
+            queue.clear ();
+            assert (!queue.contains (1));
+            uint32 timer_id;
+            int64 deadline;
+            assert (!queue.peek (out timer_id, out deadline));
+        }
+
+    }
+
+}
@@ -0,0 +1,140 @@
+"""
+Compare the throughput of writing EPG events to the events database
+event by event with the old statements against the bulk upsert.
+
+The schemas and statements are the ones used by version 2 and 3 of
+SqliteEPGStore's database.
+
+Usage: benchmark-epg-store.py [number of events] [number of passes]
+"""
+from __future__ import print_function
+
+import calendar
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+CREATE_EVENTS_TABLE_V2_STATEMENT = """CREATE TABLE events (group_id INTEGER,
+    sid INTEGER,
+    event_id INTEGER,
+    starttime JULIAN,
+    duration INTEGER,
+    running_status INTEGER(2),
+    free_ca_mode INTEGER(1),
+    name VARCHAR(255),
+    description VARCHAR(255),
+    extended_description TEXT,
+    PRIMARY KEY (group_id, sid, event_id))"""
+
+CREATE_EVENTS_TABLE_STATEMENT = \
+    CREATE_EVENTS_TABLE_V2_STATEMENT.replace("JULIAN", "INTEGER")
+
+CREATE_STARTTIME_INDEX_STATEMENT = """CREATE INDEX events_starttime ON events
+    (group_id, sid, starttime, duration, event_id)"""
+
+TO_JULIAN_SQL = "SELECT julianday(?)"
+
+HAS_EVENT_STATEMENT = \
+    "SELECT 1 FROM events WHERE group_id=? AND sid=? AND event_id=? LIMIT 1"
+
+INSERT_EVENT_SQL = "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+UPDATE_EVENT_SQL = """UPDATE events SET starttime=?, duration=?,
+    running_status=?, free_ca_mode=?, name=?, description=?,
+    extended_description=? WHERE group_id=? AND sid=? AND event_id=?"""
+
+UPSERT_EVENT_SQL = """INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (group_id, sid, event_id) DO UPDATE SET
+    starttime=excluded.starttime, duration=excluded.duration,
+    running_status=excluded.running_status,
+    free_ca_mode=excluded.free_ca_mode, name=excluded.name,
+    description=excluded.description,
+    extended_description=excluded.extended_description"""
+
+EVENTS_PER_CHANNEL = 500
+
+
+def create_events(n):
+    events = []
+    for i in range(n):
+        sid = i // EVENTS_PER_CHANNEL
+        start = (2030, random.randint(1, 12), random.randint(1, 28),
+            random.randint(0, 23), random.randint(0, 59), 0)
+        events.append((sid, i, start, random.randint(300, 7200),
+            "Event %d" % i, "Short description " * 5,
+            "Extended description " * 40))
+    return events
+
+
+def write_old(db, events):
+    """add_or_update_event for each event in one transaction"""
+    cur = db.cursor()
+    cur.execute("BEGIN")
+    for sid, event_id, start, duration, name, desc, ext_desc in events:
+        julian = cur.execute(TO_JULIAN_SQL,
+            ("%04d-%02d-%02d %02d:%02d:%02d" % start,)).fetchone()[0]
+        exists = cur.execute(HAS_EVENT_STATEMENT,
+            (1, sid, event_id)).fetchone()
+        if exists:
+            cur.execute(UPDATE_EVENT_SQL, (julian, duration, 0, 1, name,
+                desc, ext_desc, 1, sid, event_id))
+        else:
+            cur.execute(INSERT_EVENT_SQL, (1, sid, event_id, julian,
+                duration, 0, 1, name, desc, ext_desc))
+    cur.execute("END")
+
+
+def write_bulk(db, events):
+    """replace_events with one transaction per channel"""
+    cur = db.cursor()
+    for first in range(0, len(events), EVENTS_PER_CHANNEL):
+        cur.execute("BEGIN")
+        cur.executemany(UPSERT_EVENT_SQL,
+            ((1, sid, event_id, calendar.timegm(start), duration, 0, 1, name,
+                desc, ext_desc)
+            for sid, event_id, start, duration, name, desc, ext_desc
+            in events[first:first + EVENTS_PER_CHANNEL]))
+        cur.execute("END")
+
+
+def run(write_func, create_statements, events, passes):
+    fd, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    try:
+        db = sqlite3.connect(path, isolation_level=None)
+        for sql in create_statements:
+            db.execute(sql)
+        db.execute("PRAGMA synchronous=OFF")
+        db.execute("PRAGMA journal_mode=TRUNCATE")
+        start = time.time()
+        # The first pass inserts, all others update
+        for i in range(passes):
+            write_func(db, events)
+        duration = time.time() - start
+        db.close()
+    finally:
+        os.remove(path)
+    return len(events) * passes / duration
+
+
+def main(argv):
+    n_events = int(argv[1]) if len(argv) > 1 else 100000
+    passes = int(argv[2]) if len(argv) > 2 else 2
+
+    random.seed(0)
+    events = create_events(n_events)
+
+    print("Writing %d events %d times (SQLite %s)" % (n_events, passes,
+        sqlite3.sqlite_version))
+    old = run(write_old, (CREATE_EVENTS_TABLE_V2_STATEMENT,), events, passes)
+    print("event by event: %10.0f events/s" % old)
+    bulk = run(write_bulk, (CREATE_EVENTS_TABLE_STATEMENT,
+        CREATE_STARTTIME_INDEX_STATEMENT), events, passes)
+    print("bulk upsert:    %10.0f events/s (%.1fx)" % (bulk, bulk / old))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
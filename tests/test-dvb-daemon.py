@@ -1,4 +1,5 @@
 import gnomedvb
+import gnomedvb.aio as aio
 import unittest
 import sys
 import random
@@ -6,6 +7,8 @@ import datetime
 import time
 import re
 from gi.repository import GLib
+from gi.repository import Gtk
+from gnomedvb.ui.widgets.IndexedStore import IndexedListStore
 
 class DVBTestCase(unittest.TestCase):
 
@@ -20,8 +23,8 @@ class DVBTestCase(unittest.TestCase):
             
     def assertType(self, obj, objtype):
         if not isinstance(obj, objtype):
-            raise self.failureException, \
-                "%r is not %r" % (obj, objtype)
+            raise self.failureException(
+                "%r is not %r" % (obj, objtype))
 
 
 class TestManager(DVBTestCase):
@@ -57,6 +60,18 @@ class TestManager(DVBTestCase):
             adapter, frontend,
             "channels.conf", "Recordings", "Test Group"))
 
+    def testProxyIsShared(self):
+        other = gnomedvb.DVBManagerClient()
+        self.assertTrue(self.manager.manager is other.manager)
+
+    def testGetAllAdapterInfos(self):
+        infos = self.manager.get_all_adapter_infos()
+        self.assertEqual(len(infos), len(self.manager.get_devices()))
+        for adapter, frontend, name, type_t, type_s, type_c in infos:
+            info, success = self.manager.get_adapter_info(adapter, frontend)
+            self.assertTrue(success)
+            self.assertEqual((name, type_t, type_s, type_c), info)
+
 
 class DeviceGroupTestCase(DVBTestCase):
 
@@ -89,6 +104,16 @@ class TestDeviceGroup(DeviceGroupTestCase):
         for dg in self.devgroups:
             self.assertType(dg.get_recordings_directory(), str)
 
+    def testGetInformationsBulk(self):
+        for dg in self.devgroups:
+            sids = dg.get_channel_list().get_channels()
+            infos = dg.get_informations_bulk(sids)
+            self.assertEqual(len(infos), len(sids))
+            for info in infos:
+                self.assert_(info[0] in sids)
+                self.assertType(info[2], str)
+                self.assertType(info[5], str)
+
 class TestScanner(DeviceGroupTestCase):
 
     def setUp(self):
@@ -297,6 +322,27 @@ class TestRecorder(DeviceGroupTestCase):
             self.assertFalse(rec.has_timer(now.year, now.month, now.day,
                 now.hour, now.minute, self.DURATION))
             
+    def testHasTimersForEvents(self):
+        for i, rec in enumerate(self.recorder):
+            sid = self.channels[i]
+            sched = self.devgroups[i].get_schedule(sid)
+            event_ids = sched.get_all_events()
+            overlaps = rec.has_timers_for_events(sid, event_ids + [1])
+            self.assertEqual(len(overlaps), len(event_ids) + 1)
+            for eid, overlap in zip(event_ids, overlaps):
+                self.assertEqual(overlap, rec.has_timer_for_event(eid, sid))
+            # Event doesn't exist
+            self.assertEqual(overlaps[-1], 0)
+
+    def testGetTimerPlan(self):
+        for rec in self.recorder:
+            timers = rec.get_timers()
+            plan = rec.get_timer_plan()
+            self.assertEqual(sorted(p[0] for p in plan), sorted(timers))
+            conflicts = rec.get_conflicting_timers()
+            self.assertEqual(sorted(conflicts),
+                sorted(p[0] for p in plan if p[1]))
+
     def testTimerNotExists(self):
         rec_id = 1000
         for rec in self.recorder:
@@ -365,6 +411,51 @@ class TestSchedule(DeviceGroupTestCase):
                 eid = sched.next(eid)
                 self.assertType(eid, long)
                 
+    def testGetAllEventInfos(self):
+        for sched in self.schedules:
+            for eid, next, name, duration, desc in sched.get_all_event_infos():
+                self.assertType(name, str)
+                self.assertType(desc, str)
+
+    def testGetExtendedDescriptions(self):
+        for sched in self.schedules:
+            eids = sched.get_all_events()[:20]
+            # Event ids of EIT have 16 bits
+            descriptions = sched.get_extended_descriptions(eids + [100000])
+            self.assertEqual(len(descriptions), len(eids) + 1)
+            for eid, desc in zip(eids, descriptions):
+                self.assertEqual(desc, sched.get_extended_description(eid)[0])
+            self.assertEqual(descriptions[-1], "")
+
+    def testGetAllTimedEventInfos(self):
+        for sched in self.schedules:
+            prev_ts = 0
+            for eid, next, name, duration, desc, ts, rec in sched.get_all_timed_event_infos():
+                self.assertType(name, str)
+                self.assertType(desc, str)
+                self.assertTrue(ts >= prev_ts)
+                self.assert_(rec in (0, 1, 2, 3))
+                prev_ts = ts
+
+    def testGetEventsInRange(self):
+        start = int(time.time())
+        end = start + 6 * 3600
+        for sched in self.schedules:
+            infos = sched.get_events_in_range(start, end)
+            self.assertType(infos, list)
+            for eid, next, name, duration, desc, ts, rec in infos:
+                self.assertType(name, str)
+                self.assertType(desc, str)
+                self.assertTrue(ts < end)
+                self.assertTrue(ts + duration > start)
+
+    def testGetLocalStartTimestamps(self):
+        for sched in self.schedules:
+            timestamps = sched.get_local_start_timestamps()
+            infos = sched.get_all_event_infos()
+            self.assertEqual(len(timestamps), len(infos))
+            self.assertEqual(timestamps, sorted(timestamps))
+
     def testEventNotExists(self):
         eid = 1
         for sched in self.schedules:
@@ -432,6 +523,13 @@ class TestRecordingsStore(DVBTestCase):
             self.assertType(chan, str)
             self.assertType(loc, str)
             
+    def testGetAllRecordingInfos(self):
+        rec_ids = self.recstore.get_recordings()
+        infos = self.recstore.get_all_recording_infos()
+        self.assertEqual(len(infos), len(rec_ids))
+        for info in infos:
+            self.assertEqual(info, self.recstore.get_all_informations(info[0])[0])
+
     def testGetAllInformationsNotExists(self):
         rid = 1000
         data = self.recstore.get_all_informations(rid)
@@ -439,6 +537,122 @@ class TestRecordingsStore(DVBTestCase):
         self.assertFalse(data[1])
 
 
+class TestAio(DVBTestCase):
+
+    def setUp(self):
+        self.manager = aio.run_until_complete(aio.get_manager_client())
+        self.recstore = aio.run_until_complete(
+            aio.get_recordings_store_client())
+
+    def testGatherCalls(self):
+        groups, rec_ids, infos = aio.run_until_complete(aio.gather(
+            self.manager.get_channel_groups(),
+            self.recstore.get_recordings(),
+            self.recstore.get_all_recording_infos()))
+        self.assertEqual(groups,
+            gnomedvb.DVBManagerClient().get_channel_groups())
+        self.assertEqual(rec_ids,
+            gnomedvb.DVBRecordingsStoreClient().get_recordings())
+        self.assertEqual(len(infos), len(rec_ids))
+
+    def testGatherDeviceGroups(self):
+        devgroups = aio.run_until_complete(
+            self.manager.get_registered_device_groups())
+        sync_devgroups = gnomedvb.DVBManagerClient().get_registered_device_groups()
+        self.assertEqual(len(devgroups), len(sync_devgroups))
+        names = aio.run_until_complete(aio.gather(
+            *[dg.get_name() for dg in devgroups]))
+        self.assertEqual(names, [dg.get_name() for dg in sync_devgroups])
+
+    def testGatherException(self):
+        channels = aio.run_until_complete(aio.get_channel_list_client(
+            "/org/gnome/DVB/DeviceGroup/1000/ChannelList"))
+        gathered = aio.gather(self.recstore.get_recordings(),
+            channels.get_channels())
+        self.assertRaises(GLib.Error, aio.run_until_complete, gathered)
+        self.assertTrue(gathered.done())
+        self.assertType(gathered.exception(), GLib.Error)
+
+    def testGatherExceptionOfFuture(self):
+        failed = aio.Future()
+        failed.set_exception(ValueError("failed"))
+        self.assertRaises(ValueError, aio.run_until_complete,
+            aio.gather(self.recstore.get_recordings(), failed))
+
+    def testProxyIsShared(self):
+        self.assertTrue(self.manager.manager
+            is gnomedvb.DVBManagerClient().manager)
+        self.assertTrue(self.recstore.recstore
+            is gnomedvb.DVBRecordingsStoreClient().recstore)
+        other = aio.run_until_complete(aio.get_manager_client())
+        self.assertTrue(self.manager.manager is other.manager)
+
+
+class TestIndexedStore(DVBTestCase):
+
+    def setUp(self):
+        self.store = IndexedListStore(0, int, str)
+
+    def _assertIndexed(self, row_ids):
+        for row_id in row_ids:
+            aiter = self.store.get_iter_for_id(row_id)
+            self.assertNotEqual(aiter, None)
+            self.assertEqual(self.store[aiter][0], row_id)
+            self.assertEqual(self.store[aiter][1], str(row_id))
+        self.assertEqual(len(self.store), len(row_ids))
+
+    def _append(self, row_ids):
+        for row_id in row_ids:
+            self.store.append([row_id, str(row_id)])
+
+    def testSortInsertRemove(self):
+        row_ids = list(range(20))
+        random.shuffle(row_ids)
+        self._append(row_ids)
+        self.store.set_sort_column_id(0, Gtk.SortType.DESCENDING)
+        self._assertIndexed(row_ids)
+
+        self._append([100, -1])
+        row_ids += [100, -1]
+        self._assertIndexed(row_ids)
+
+        self.assertTrue(self.store.remove_id(5))
+        self.assertFalse(self.store.remove_id(5))
+        row_ids.remove(5)
+        self.assertEqual(self.store.get_iter_for_id(5), None)
+        self._assertIndexed(row_ids)
+
+        self.store.set_sort_column_id(0, Gtk.SortType.ASCENDING)
+        self._assertIndexed(row_ids)
+
+    def testRemoveIds(self):
+        self._append(range(50))
+        self.assertEqual(self.store.remove_ids([1, 2, 3, 1000]), 3)
+        self.assertEqual(self.store.get_iter_for_id(2), None)
+        self._assertIndexed([0] + list(range(4, 50)))
+
+    def testRemoveIdsRebuild(self):
+        n_rows = 4 * IndexedListStore.REBUILD_THRESHOLD
+        row_ids = list(range(n_rows))
+        random.shuffle(row_ids)
+        self._append(row_ids)
+        self.store.set_sort_column_id(0, Gtk.SortType.ASCENDING)
+
+        deleted = list(range(0, n_rows, 2))
+        self.assertEqual(self.store.remove_ids(deleted), len(deleted))
+        for row_id in deleted:
+            self.assertEqual(self.store.get_iter_for_id(row_id), None)
+        kept = list(range(1, n_rows, 2))
+        self._assertIndexed(kept)
+        # Rows are still sorted
+        self.assertEqual([row[0] for row in self.store], kept)
+
+        # Rows inserted afterwards are indexed again
+        self._append([-1])
+        self._assertIndexed(kept + [-1])
+        self.assertEqual(self.store[0][0], -1)
+
+
 if __name__ == '__main__':
     loop = GLib.MainLoop()
     